@@ -0,0 +1,79 @@
+"""
+Benchmark compression of JsonField values.
+
+Compares the stored size and the time to compress and decompress typical
+documents (about 50 KB and 500 KB of JSON) with each available compression
+algorithm against uncompressed storage.
+
+Usage::
+
+    python benchmarks/json_compression.py [repeat]
+
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import django  # noqa
+from django.conf import settings  # noqa
+
+settings.configure()
+if hasattr(django, 'setup'):
+    django.setup()
+
+from django.core.exceptions import ImproperlyConfigured  # noqa
+from django_extras.db.models.fields.jsonfield import COMPRESSION_TAGS, compress, decompress, dumps, \
+    get_compressor  # noqa
+
+
+def records(count):
+    # Records similar to an API response or event log
+    rnd = random.Random(count)
+    words = ['alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel']
+    return {'count': count, 'results': [{
+        'id': i,
+        'uuid': '%032x' % rnd.getrandbits(128),
+        'name': ' '.join(rnd.choice(words) for _ in range(3)),
+        'price': '%d.%02d' % (rnd.randint(0, 999), rnd.randint(0, 99)),
+        'active': rnd.random() > 0.5,
+        'tags': rnd.sample(words, 3),
+        'position': {'lat': rnd.uniform(-90, 90), 'lng': rnd.uniform(-180, 180)},
+    } for i in range(count)]}
+
+
+def timed(func, repeat):
+    start = time.time()
+    for _ in range(repeat):
+        result = func()
+    return (time.time() - start) * 1000 / repeat, result
+
+
+def main(repeat=20):
+    documents = [('50 KB', dumps(records(200))), ('500 KB', dumps(records(2000)))]
+    algorithms = []
+    for algorithm in sorted(COMPRESSION_TAGS):
+        try:
+            get_compressor(algorithm)
+        except ImproperlyConfigured:
+            print('%s is not available' % algorithm)
+        else:
+            algorithms.append(algorithm)
+
+    print('%-8s %-8s %10s %8s %14s %14s' % ('document', 'storage', 'bytes', 'ratio', 'compress', 'decompress'))
+    for name, text in documents:
+        size = len(text.encode('utf8'))
+        elapsed, data = timed(lambda: text.encode('utf8'), repeat)
+        print('%-8s %-8s %10d %8.2f %11.2f ms %11.2f ms' % (
+            name, 'text', size, 1, elapsed, timed(lambda: decompress(data), repeat)[0]))
+        for algorithm in algorithms:
+            elapsed, data = timed(lambda: compress(text, algorithm, threshold=0), repeat)
+            print('%-8s %-8s %10d %8.2f %11.2f ms %11.2f ms' % (
+                name, algorithm, len(data), size / float(len(data)), elapsed,
+                timed(lambda: decompress(data), repeat)[0]))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,69 @@
+"""
+Micro-benchmarks for Money arithmetic operators and accumulation.
+
+Each benchmark reports the time per operation, raw Decimal arithmetic is
+included as a baseline.
+
+Usage::
+
+    python benchmarks/money_arithmetic.py [repeat]
+
+"""
+import decimal
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from django_extras.core import types  # noqa
+
+NUMBER = 100000
+
+SETUP = '''
+import decimal
+from django_extras.core import types
+AUD = types.Currency('AUD', 36, 'Australian Dollar', '$')
+a = types.Money('123.4567', AUD)
+b = types.Money('76.5433', AUD)
+da = decimal.Decimal('123.4567')
+db = decimal.Decimal('76.5433')
+values = [types.Money(decimal.Decimal(i).scaleb(-2), AUD) for i in range(1000)]
+'''
+
+BENCHMARKS = (
+    ('Decimal a + b', 'da + db'),
+    ('Money a + b', 'a + b'),
+    ('Money a + 1', 'a + 1'),
+    ('Money a - b', 'a - b'),
+    ('Money -a', '-a'),
+    ('Money abs(a)', 'abs(a)'),
+    ('Money a * 3', 'a * 3'),
+    ('Money 10 % a', '10 % a'),
+    ('Money(Decimal)', 'types.Money(da, AUD)'),
+)
+
+ACCUMULATE_BENCHMARKS = (
+    ('Decimal sum() x1000', 'sum(v._amount for v in values)'),
+    ('Money sum() x1000', 'sum(values)'),
+    ('MoneyAccumulator x1000', 'types.MoneyAccumulator().extend(values)'),
+)
+
+
+def run(benchmarks, number, repeat):
+    for name, stmt in benchmarks:
+        try:
+            best = min(timeit.repeat(stmt, SETUP, number=number, repeat=repeat))
+        except (AttributeError, TypeError, decimal.InvalidOperation) as ex:
+            print('%-26s not available (%s)' % (name, ex))
+            continue
+        print('%-26s %10.1f ns/op' % (name, best / number * 1e9))
+
+
+def main(repeat=5):
+    run(BENCHMARKS, NUMBER, repeat)
+    run(ACCUMULATE_BENCHMARKS, NUMBER // 1000, repeat)
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,77 @@
+"""
+Benchmark Money.format() against the previous digit by digit implementation.
+
+Usage::
+
+    python benchmarks/money_format.py [iterations]
+
+"""
+import decimal
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from django_extras.core.types import Money, get_money_formatter  # noqa
+
+
+def legacy_format(amount, places=2, currency_symbol='', separator=',', decimal_place='.', positive_sign='',
+                  negative_sign='-', trailing_negative=''):
+    """
+    Money.format() implementation prior to the introduction of MoneyFormatter.
+    """
+    q = decimal.Decimal(10) ** -places
+    sign, digits, exp = amount.quantize(q).as_tuple()
+
+    results = []
+    digits = [str(d) for d in digits]
+    if len(digits) < places:
+        digits[:0] = ['0'] * (places - len(digits))
+    build, next_ = results.append, digits.pop
+
+    if sign:
+        build(trailing_negative)
+    if places:
+        for i in range(places):
+            build(next_())
+        build(decimal_place)
+    if not digits:
+        build('0')
+    else:
+        idx = 0
+        while digits:
+            build(next_())
+            idx += 1
+            if not idx % 3 and digits:
+                build(str(separator))
+
+    build(str(currency_symbol))
+    build(str(negative_sign if sign else positive_sign))
+    return ''.join(reversed(results))
+
+
+def main(iterations=5):
+    random.seed(42)
+    values = [Money(decimal.Decimal(random.randint(-10 ** 10, 10 ** 10)).scaleb(-4)) for _ in range(100000)]
+    options = {'currency_symbol': '$', 'separator': '.', 'decimal_place': ','}
+
+    for value in values[:1000]:
+        assert value.format(**options) == legacy_format(value._amount, **options)
+
+    formatter = get_money_formatter(**options)
+    timings = (
+        ('legacy format', lambda: [legacy_format(v._amount, **options) for v in values]),
+        ('Money.format', lambda: [v.format(**options) for v in values]),
+        ('format_many', lambda: formatter.format_many(values)),
+    )
+    baseline = None
+    for name, func in timings:
+        best = min(timeit.repeat(func, number=1, repeat=iterations))
+        baseline = baseline or best
+        print('%-15s %8.1f ms  %5.1fx' % (name, best * 1000, baseline / best))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
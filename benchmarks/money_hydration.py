@@ -0,0 +1,107 @@
+"""
+Benchmark eager versus lazy Money hydration of MoneyField values.
+
+Loads a queryset from an in-memory SQLite database and compares iteration
+time and peak memory (Python 3.4+ for tracemalloc) of MoneyField() and
+MoneyField(lazy=True).
+
+Usage::
+
+    python benchmarks/money_hydration.py [rows]
+
+"""
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import django  # noqa
+from django.conf import settings  # noqa
+
+settings.configure(
+    DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+    INSTALLED_APPS=('django.contrib.contenttypes', ),
+)
+if hasattr(django, 'setup'):
+    django.setup()
+
+from django.db import connection, models  # noqa
+from django_extras.db.models import MoneyField  # noqa
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+class EagerLedger(models.Model):
+    amount = MoneyField()
+
+    class Meta:
+        app_label = 'benchmarks'
+        db_table = 'ledger'
+
+
+class LazyLedger(models.Model):
+    amount = MoneyField(lazy=True)
+
+    class Meta:
+        app_label = 'benchmarks'
+        db_table = 'ledger'
+        managed = False
+
+
+def populate(rows):
+    with connection.schema_editor() as editor:
+        editor.create_model(EagerLedger)
+    batch = 300
+    for start in range(0, rows, batch):
+        EagerLedger.objects.bulk_create(
+            EagerLedger(amount='%d.%04d' % (i, i % 10000)) for i in range(start, min(start + batch, rows)))
+
+
+def measure(name, func, memory=False):
+    gc.collect()
+    start = time.time()
+    func()
+    elapsed = time.time() - start
+
+    peak = 0
+    if memory and tracemalloc:
+        # Memory is measured separately as tracing significantly slows execution
+        gc.collect()
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    print('%-32s %8.0f ms  %8.1f MB' % (name, elapsed * 1000, peak / 1048576.0))
+
+
+def iterate(model, touch_every=None):
+    def func():
+        for idx, obj in enumerate(model.objects.iterator()):
+            if touch_every and not idx % touch_every:
+                obj.amount.format()
+    return func
+
+
+def load(model):
+    def func():
+        func.result = list(model.objects.all())
+        del func.result
+    return func
+
+
+def main(rows=1000000):
+    print('Populating %d rows...' % rows)
+    populate(rows)
+    for name, model in (('eager', EagerLedger), ('lazy', LazyLedger)):
+        measure('%s iterate' % name, iterate(model))
+        measure('%s iterate, access 10%%' % name, iterate(model, 10))
+        measure('%s list()' % name, load(model), memory=True)
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
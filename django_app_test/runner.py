@@ -3,6 +3,7 @@
 import os
 import sys
 
+from importlib import import_module
 from optparse import OptionParser
 
 import django
@@ -69,16 +70,23 @@ def main():
             # "django.contrib.sites",
             app_name,
         ),
-
-        # Force test runner to be the pre django 1.6 test runner. This tool does not work with then new default in 1.6.
-        "TEST_RUNNER": "django.test.simple.DjangoTestSuiteRunner"
     })
 
+    # Force test runner to be the pre django 1.6 test runner. This tool does not work with then new default in 1.6,
+    # the old runner was removed in Django 1.8.
+    try:
+        import_module("django.test.simple")
+    except ImportError:
+        pass
+    else:
+        settings.TEST_RUNNER = "django.test.simple.DjangoTestSuiteRunner"
+
     # This is to ensure that Django 1.7's app registry is populated prior to calling a command.
     if hasattr(django, 'setup'):
         django.setup()
 
     call_command("test", app_name)
 
+
 if __name__ == "__main__":
     main()
@@ -1,3 +1,8 @@
 # -*- coding: utf-8 -*-
-from django.conf.urls import patterns
-urlpatterns = patterns('')
+try:
+    from django.conf.urls import patterns
+except ImportError:
+    # Django 1.10+
+    urlpatterns = []
+else:
+    urlpatterns = patterns('')
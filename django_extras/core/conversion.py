@@ -0,0 +1,240 @@
+# -*- coding: UTF-8 -*-
+"""
+Currency conversion using exchange rates loaded from a pluggable source.
+
+Rates are expressed relative to a common base currency (the base currency
+having a rate of 1), eg::
+
+    converter = CurrencyConverter(DictRateSource({'USD': 1, 'AUD': '1.52', 'EUR': '0.92'}))
+    converter.convert(Money(10, get_currency('USD')), 'AUD')
+
+"""
+import io
+import json
+import os
+import threading
+import time
+from django_extras.core.types import Currency, Money, MoneyArray, currency_places, decimal_value, get_currency
+
+
+class RateSource(object):
+    """
+    Source of exchange rates.
+    """
+    def load(self):
+        """
+        Load rates.
+
+        :return: dict of currency code to rate relative to a common base currency.
+        """
+        raise NotImplementedError()
+
+    def version(self):
+        """
+        Identifier that changes when rates change, or None if it is not known.
+
+        When a cached rate table expires it is only reloaded if the version
+        has changed (or is not known).
+        """
+        return None
+
+
+class DictRateSource(RateSource):
+    """
+    Rates defined in a dictionary (eg for testing).
+    """
+    def __init__(self, rates):
+        self.rates = rates
+
+    def load(self):
+        return dict(self.rates)
+
+
+class JsonFileRateSource(RateSource):
+    """
+    Rates loaded from a JSON file, either a mapping of currency code to rate or
+    an object with a ``rates`` key containing that mapping.
+
+    Rates should be supplied as strings to avoid floating point rounding.
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        with io.open(self.path, encoding='utf8') as f:
+            data = json.load(f)
+        return data.get('rates', data)
+
+    def version(self):
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+
+class ModelRateSource(RateSource):
+    """
+    Rates loaded from a Django model.
+
+    :param model: Model (or queryset) that contains rates.
+    :param code_field: Name of the field containing the currency code.
+    :param rate_field: Name of the field containing the rate.
+    """
+    def __init__(self, model, code_field='code', rate_field='rate'):
+        self.model = model
+        self.code_field = code_field
+        self.rate_field = rate_field
+
+    def get_queryset(self):
+        if hasattr(self.model, '_default_manager'):
+            return self.model._default_manager.all()
+        return self.model.all()
+
+    def load(self):
+        return dict(self.get_queryset().values_list(self.code_field, self.rate_field))
+
+
+class RateTable(object):
+    """
+    Snapshot of exchange rates loaded from a source.
+    """
+    __slots__ = ('rates', 'version', 'expires', '_factors')
+
+    def __init__(self, rates, version=None, expires=None):
+        self.rates = dict((code.upper(), decimal_value(rate)) for code, rate in rates.items())
+        self.version = version
+        self.expires = expires
+        self._factors = {}
+
+    def factor(self, from_code, to_code):
+        """
+        Factor to multiply an amount by to convert between currencies.
+
+        @raises ValueError if a rate for either currency is not available.
+        """
+        key = (from_code, to_code)
+        try:
+            return self._factors[key]
+        except KeyError:
+            try:
+                factor = self.rates[to_code] / self.rates[from_code]
+            except KeyError:
+                raise ValueError('No exchange rate available to convert %s to %s.' % key)
+            self._factors[key] = factor
+            return factor
+
+
+class CurrencyConverter(object):
+    """
+    Converts :class:`Money` values between currencies.
+
+    Rates are cached in process for ``ttl`` seconds, when the cache expires
+    rates are only reloaded if the version of the source has changed. Use
+    :meth:`invalidate` to force rates to be reloaded.
+    """
+    def __init__(self, source, ttl=3600, timer=time.time):
+        self.source = source
+        self.ttl = ttl
+        self.timer = timer
+        self._table = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """
+        Discard cached rates, rates are reloaded on next use.
+        """
+        self._table = None
+
+    def get_table(self):
+        """
+        Get the current :class:`RateTable`, loading rates if required.
+        """
+        table = self._table
+        if table is None or self.timer() >= table.expires:
+            with self._lock:
+                table = self._table
+                now = self.timer()
+                if table is None or now >= table.expires:
+                    version = self.source.version()
+                    if table is None or version is None or version != table.version:
+                        table = RateTable(self.source.load(), version)
+                    table.expires = now + self.ttl
+                    self._table = table
+        return table
+
+    def convert(self, value, currency):
+        """
+        Convert a :class:`Money` value into a currency.
+
+        :param value: Money value to convert.
+        :param currency: Currency (or currency code) to convert into.
+        """
+        currency = _resolve_currency(currency)
+        if value.currency == currency:
+            return value
+        factor = self.get_table().factor(value.currency.code, currency.code)
+        return Money._make(value._amount * factor, currency)
+
+    def convert_many(self, values, currency):
+        """
+        Convert a batch of values into a currency.
+
+        :param values: Iterable of :class:`Money` values or a :class:`MoneyArray`.
+        :param currency: Currency (or currency code) to convert into.
+        :return: list of :class:`Money` values, or a :class:`MoneyArray` if a MoneyArray is supplied.
+        """
+        currency = _resolve_currency(currency)
+        table = self.get_table()
+
+        if isinstance(values, MoneyArray):
+            places = currency_places(currency)
+            factor = table.factor(values.currency.code, currency.code).scaleb(places - values.places)
+            result = values * factor
+            result.currency = currency
+            result.places = places
+            return result
+
+        to_code = currency.code
+        factors = {}
+        results = []
+        append = results.append
+        make = Money._make
+        for value in values:
+            from_currency = value.currency
+            if from_currency == currency:
+                append(value)
+                continue
+            try:
+                factor = factors[from_currency]
+            except KeyError:
+                factor = factors[from_currency] = table.factor(from_currency.code, to_code)
+            append(make(value._amount * factor, currency))
+        return results
+
+    def sum(self, values, currency):
+        """
+        Total a batch of values that may be in different currencies.
+
+        :param values: Iterable of :class:`Money` values.
+        :param currency: Currency (or currency code) of the result.
+        """
+        currency = _resolve_currency(currency)
+        table = self.get_table()
+
+        # Sum amounts by currency before converting each total once.
+        totals = {}
+        for value in values:
+            from_currency = value.currency
+            totals[from_currency] = totals.get(from_currency, 0) + value._amount
+        total = decimal_value(0)
+        for from_currency, amount in totals.items():
+            if from_currency != currency:
+                amount *= table.factor(from_currency.code, currency.code)
+            total += amount
+        return Money._make(total, currency)
+
+
+def _resolve_currency(currency):
+    if isinstance(currency, Currency):
+        return currency
+    return get_currency(currency)
@@ -0,0 +1,192 @@
+# -*- coding: UTF-8 -*-
+"""
+ISO 4217 currency definitions.
+
+Each entry is (code, number, name, symbol, decimal_digits), decimal_digits is
+None where ISO 4217 does not define a minor unit (eg precious metals). The
+XXX (no currency) code is not included as it is provided by
+:data:`django_extras.core.types.NoCurrency`.
+
+This module is loaded on demand by the currency registry in
+:mod:`django_extras.core.types`.
+"""
+
+CURRENCIES = (
+    ('AED', 784, 'UAE Dirham', u'', 2),
+    ('AFN', 971, 'Afghani', u'', 2),
+    ('ALL', 8, 'Lek', u'', 2),
+    ('AMD', 51, 'Armenian Dram', u'', 2),
+    ('AOA', 973, 'Kwanza', u'', 2),
+    ('ARS', 32, 'Argentine Peso', u'$', 2),
+    ('AUD', 36, 'Australian Dollar', u'$', 2),
+    ('AWG', 533, 'Aruban Florin', u'', 2),
+    ('AZN', 944, 'Azerbaijan Manat', u'', 2),
+    ('BAM', 977, 'Convertible Mark', u'', 2),
+    ('BBD', 52, 'Barbados Dollar', u'$', 2),
+    ('BDT', 50, 'Taka', u'', 2),
+    ('BGN', 975, 'Bulgarian Lev', u'', 2),
+    ('BHD', 48, 'Bahraini Dinar', u'', 3),
+    ('BIF', 108, 'Burundi Franc', u'', 0),
+    ('BMD', 60, 'Bermudian Dollar', u'$', 2),
+    ('BND', 96, 'Brunei Dollar', u'$', 2),
+    ('BOB', 68, 'Boliviano', u'', 2),
+    ('BOV', 984, 'Mvdol', u'', 2),
+    ('BRL', 986, 'Brazilian Real', u'R$', 2),
+    ('BSD', 44, 'Bahamian Dollar', u'$', 2),
+    ('BTN', 64, 'Ngultrum', u'', 2),
+    ('BWP', 72, 'Pula', u'', 2),
+    ('BYN', 933, 'Belarusian Ruble', u'', 2),
+    ('BZD', 84, 'Belize Dollar', u'$', 2),
+    ('CAD', 124, 'Canadian Dollar', u'$', 2),
+    ('CDF', 976, 'Congolese Franc', u'', 2),
+    ('CHE', 947, 'WIR Euro', u'', 2),
+    ('CHF', 756, 'Swiss Franc', u'', 2),
+    ('CHW', 948, 'WIR Franc', u'', 2),
+    ('CLF', 990, 'Unidad de Fomento', u'', 4),
+    ('CLP', 152, 'Chilean Peso', u'$', 0),
+    ('CNY', 156, 'Yuan Renminbi', u'¥', 2),
+    ('COP', 170, 'Colombian Peso', u'$', 2),
+    ('COU', 970, 'Unidad de Valor Real', u'', 2),
+    ('CRC', 188, 'Costa Rican Colon', u'₡', 2),
+    ('CUP', 192, 'Cuban Peso', u'$', 2),
+    ('CVE', 132, 'Cabo Verde Escudo', u'', 2),
+    ('CZK', 203, 'Czech Koruna', u'', 2),
+    ('DJF', 262, 'Djibouti Franc', u'', 0),
+    ('DKK', 208, 'Danish Krone', u'', 2),
+    ('DOP', 214, 'Dominican Peso', u'$', 2),
+    ('DZD', 12, 'Algerian Dinar', u'', 2),
+    ('EGP', 818, 'Egyptian Pound', u'£', 2),
+    ('ERN', 232, 'Nakfa', u'', 2),
+    ('ETB', 230, 'Ethiopian Birr', u'', 2),
+    ('EUR', 978, 'Euro', u'€', 2),
+    ('FJD', 242, 'Fiji Dollar', u'$', 2),
+    ('FKP', 238, 'Falkland Islands Pound', u'£', 2),
+    ('GBP', 826, 'Pound Sterling', u'£', 2),
+    ('GEL', 981, 'Lari', u'', 2),
+    ('GHS', 936, 'Ghana Cedi', u'', 2),
+    ('GIP', 292, 'Gibraltar Pound', u'£', 2),
+    ('GMD', 270, 'Dalasi', u'', 2),
+    ('GNF', 324, 'Guinean Franc', u'', 0),
+    ('GTQ', 320, 'Quetzal', u'', 2),
+    ('GYD', 328, 'Guyana Dollar', u'$', 2),
+    ('HKD', 344, 'Hong Kong Dollar', u'$', 2),
+    ('HNL', 340, 'Lempira', u'', 2),
+    ('HTG', 332, 'Gourde', u'', 2),
+    ('HUF', 348, 'Forint', u'', 2),
+    ('IDR', 360, 'Rupiah', u'', 2),
+    ('ILS', 376, 'New Israeli Sheqel', u'₪', 2),
+    ('INR', 356, 'Indian Rupee', u'₹', 2),
+    ('IQD', 368, 'Iraqi Dinar', u'', 3),
+    ('IRR', 364, 'Iranian Rial', u'', 2),
+    ('ISK', 352, 'Iceland Krona', u'', 0),
+    ('JMD', 388, 'Jamaican Dollar', u'$', 2),
+    ('JOD', 400, 'Jordanian Dinar', u'', 3),
+    ('JPY', 392, 'Yen', u'¥', 0),
+    ('KES', 404, 'Kenyan Shilling', u'', 2),
+    ('KGS', 417, 'Som', u'', 2),
+    ('KHR', 116, 'Riel', u'', 2),
+    ('KMF', 174, 'Comorian Franc', u'', 0),
+    ('KPW', 408, 'North Korean Won', u'₩', 2),
+    ('KRW', 410, 'Won', u'₩', 0),
+    ('KWD', 414, 'Kuwaiti Dinar', u'', 3),
+    ('KYD', 136, 'Cayman Islands Dollar', u'$', 2),
+    ('KZT', 398, 'Tenge', u'', 2),
+    ('LAK', 418, 'Lao Kip', u'', 2),
+    ('LBP', 422, 'Lebanese Pound', u'', 2),
+    ('LKR', 144, 'Sri Lanka Rupee', u'', 2),
+    ('LRD', 430, 'Liberian Dollar', u'$', 2),
+    ('LSL', 426, 'Loti', u'', 2),
+    ('LYD', 434, 'Libyan Dinar', u'', 3),
+    ('MAD', 504, 'Moroccan Dirham', u'', 2),
+    ('MDL', 498, 'Moldovan Leu', u'', 2),
+    ('MGA', 969, 'Malagasy Ariary', u'', 2),
+    ('MKD', 807, 'Denar', u'', 2),
+    ('MMK', 104, 'Kyat', u'', 2),
+    ('MNT', 496, 'Tugrik', u'', 2),
+    ('MOP', 446, 'Pataca', u'', 2),
+    ('MRU', 929, 'Ouguiya', u'', 2),
+    ('MUR', 480, 'Mauritius Rupee', u'', 2),
+    ('MVR', 462, 'Rufiyaa', u'', 2),
+    ('MWK', 454, 'Malawi Kwacha', u'', 2),
+    ('MXN', 484, 'Mexican Peso', u'$', 2),
+    ('MXV', 979, 'Mexican Unidad de Inversion (UDI)', u'', 2),
+    ('MYR', 458, 'Malaysian Ringgit', u'', 2),
+    ('MZN', 943, 'Mozambique Metical', u'', 2),
+    ('NAD', 516, 'Namibia Dollar', u'$', 2),
+    ('NGN', 566, 'Naira', u'₦', 2),
+    ('NIO', 558, 'Cordoba Oro', u'', 2),
+    ('NOK', 578, 'Norwegian Krone', u'', 2),
+    ('NPR', 524, 'Nepalese Rupee', u'', 2),
+    ('NZD', 554, 'New Zealand Dollar', u'$', 2),
+    ('OMR', 512, 'Rial Omani', u'', 3),
+    ('PAB', 590, 'Balboa', u'', 2),
+    ('PEN', 604, 'Sol', u'', 2),
+    ('PGK', 598, 'Kina', u'', 2),
+    ('PHP', 608, 'Philippine Peso', u'₱', 2),
+    ('PKR', 586, 'Pakistan Rupee', u'', 2),
+    ('PLN', 985, 'Zloty', u'', 2),
+    ('PYG', 600, 'Guarani', u'', 0),
+    ('QAR', 634, 'Qatari Rial', u'', 2),
+    ('RON', 946, 'Romanian Leu', u'', 2),
+    ('RSD', 941, 'Serbian Dinar', u'', 2),
+    ('RUB', 643, 'Russian Ruble', u'₽', 2),
+    ('RWF', 646, 'Rwanda Franc', u'', 0),
+    ('SAR', 682, 'Saudi Riyal', u'', 2),
+    ('SBD', 90, 'Solomon Islands Dollar', u'$', 2),
+    ('SCR', 690, 'Seychelles Rupee', u'', 2),
+    ('SDG', 938, 'Sudanese Pound', u'', 2),
+    ('SEK', 752, 'Swedish Krona', u'', 2),
+    ('SGD', 702, 'Singapore Dollar', u'$', 2),
+    ('SHP', 654, 'Saint Helena Pound', u'£', 2),
+    ('SLE', 925, 'Leone', u'', 2),
+    ('SOS', 706, 'Somali Shilling', u'', 2),
+    ('SRD', 968, 'Surinam Dollar', u'$', 2),
+    ('SSP', 728, 'South Sudanese Pound', u'£', 2),
+    ('STN', 930, 'Dobra', u'', 2),
+    ('SVC', 222, 'El Salvador Colon', u'', 2),
+    ('SYP', 760, 'Syrian Pound', u'£', 2),
+    ('SZL', 748, 'Lilangeni', u'', 2),
+    ('THB', 764, 'Baht', u'฿', 2),
+    ('TJS', 972, 'Somoni', u'', 2),
+    ('TMT', 934, 'Turkmenistan New Manat', u'', 2),
+    ('TND', 788, 'Tunisian Dinar', u'', 3),
+    ('TOP', 776, 'Pa\'anga', u'', 2),
+    ('TRY', 949, 'Turkish Lira', u'₺', 2),
+    ('TTD', 780, 'Trinidad and Tobago Dollar', u'$', 2),
+    ('TWD', 901, 'New Taiwan Dollar', u'$', 2),
+    ('TZS', 834, 'Tanzanian Shilling', u'', 2),
+    ('UAH', 980, 'Hryvnia', u'₴', 2),
+    ('UGX', 800, 'Uganda Shilling', u'', 0),
+    ('USD', 840, 'US Dollar', u'$', 2),
+    ('USN', 997, 'US Dollar (Next day)', u'$', 2),
+    ('UYI', 940, 'Uruguay Peso en Unidades Indexadas (UI)', u'', 0),
+    ('UYU', 858, 'Peso Uruguayo', u'$', 2),
+    ('UYW', 927, 'Unidad Previsional', u'', 4),
+    ('UZS', 860, 'Uzbekistan Sum', u'', 2),
+    ('VED', 926, 'Bolivar Soberano', u'', 2),
+    ('VES', 928, 'Bolivar Soberano', u'', 2),
+    ('VND', 704, 'Dong', u'₫', 0),
+    ('VUV', 548, 'Vatu', u'', 0),
+    ('WST', 882, 'Tala', u'', 2),
+    ('XAF', 950, 'CFA Franc BEAC', u'', 0),
+    ('XAG', 961, 'Silver', u'', None),
+    ('XAU', 959, 'Gold', u'', None),
+    ('XBA', 955, 'Bond Markets Unit European Composite Unit (EURCO)', u'', None),
+    ('XBB', 956, 'Bond Markets Unit European Monetary Unit (E.M.U.-6)', u'', None),
+    ('XBC', 957, 'Bond Markets Unit European Unit of Account 9 (E.U.A.-9)', u'', None),
+    ('XBD', 958, 'Bond Markets Unit European Unit of Account 17 (E.U.A.-17)', u'', None),
+    ('XCD', 951, 'East Caribbean Dollar', u'$', 2),
+    ('XCG', 532, 'Caribbean Guilder', u'', 2),
+    ('XDR', 960, 'SDR (Special Drawing Right)', u'', None),
+    ('XOF', 952, 'CFA Franc BCEAO', u'', 0),
+    ('XPD', 964, 'Palladium', u'', None),
+    ('XPF', 953, 'CFP Franc', u'', 0),
+    ('XPT', 962, 'Platinum', u'', None),
+    ('XSU', 994, 'Sucre', u'', None),
+    ('XTS', 963, 'Codes specifically reserved for testing purposes', u'', None),
+    ('XUA', 965, 'ADB Unit of Account', u'', None),
+    ('YER', 886, 'Yemeni Rial', u'', 2),
+    ('ZAR', 710, 'Rand', u'R', 2),
+    ('ZMW', 967, 'Zambian Kwacha', u'', 2),
+    ('ZWG', 924, 'Zimbabwe Gold', u'', 2),
+)
@@ -1,6 +1,9 @@
 # -*- coding: UTF-8 -*-
+import array
 import decimal
 import math
+import operator
+import six
 
 
 NO_CURRENCY_CODE = 'XXX'
@@ -23,8 +26,13 @@ class Currency(object):
         self.symbol = symbol
         self.decimal_digits = decimal_digits
 
+    def __repr__(self):
+        return 'Currency(%r)' % self.code
+
     # Comparison operators
     def __eq__(self, other):
+        if self is other:
+            return True
         if other is None:
             return False
         if isinstance(other, Currency):
@@ -34,6 +42,13 @@ class Currency(object):
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    def __hash__(self):
+        return hash(self.code)
+
+    # Pickle support
+    def __reduce__(self):
+        return _intern_currency, (self.code, self.number, self.name, self.symbol, self.decimal_digits)
+
     @property
     def is_no_currency(self):
         return self.code == NO_CURRENCY_CODE
@@ -41,6 +56,60 @@ class Currency(object):
 NoCurrency = Currency(NO_CURRENCY_CODE, NO_CURRENCY_NUMBER, 'No Currency')
 
 
+# Registry of currencies, populated from django_extras.core.iso4217 on first use.
+_currencies_by_code = {}
+_currencies_by_number = {}
+
+
+def _load_currencies():
+    from django_extras.core.iso4217 import CURRENCIES
+    for entry in CURRENCIES:
+        currency = Currency(entry[0], entry[1], entry[2], entry[3], entry[4])
+        _currencies_by_code.setdefault(currency.code, currency)
+        _currencies_by_number.setdefault(currency.number, currency)
+    _currencies_by_code.setdefault(NO_CURRENCY_CODE, NoCurrency)
+    _currencies_by_number.setdefault(NO_CURRENCY_NUMBER, NoCurrency)
+
+
+def get_currency(code):
+    """
+    Get the registered :class:`Currency` for an ISO 4217 code (eg 'AUD') or number (eg 36).
+
+    Registered currencies are singletons so they can be compared by identity.
+
+    @raises KeyError if the currency is not registered.
+    """
+    if not _currencies_by_code:
+        _load_currencies()
+    if isinstance(code, int):
+        return _currencies_by_number[code]
+    return _currencies_by_code[code.upper()]
+
+
+def register_currency(currency):
+    """
+    Register a currency (eg a currency not defined by ISO 4217).
+
+    If a currency with the same code is already registered the existing
+    instance is returned.
+    """
+    if not _currencies_by_code:
+        _load_currencies()
+    currency = _currencies_by_code.setdefault(currency.code, currency)
+    _currencies_by_number.setdefault(currency.number, currency)
+    return currency
+
+
+def _intern_currency(code, number, name, symbol='', decimal_digits=2):
+    """
+    Resolve a currency to the registered instance when unpickling.
+    """
+    try:
+        return get_currency(code)
+    except KeyError:
+        return Currency(code, number, name, symbol, decimal_digits)
+
+
 def decimal_value(value):
     """
     Convert a value into a decimal and handle any conversion required.
@@ -49,6 +118,8 @@ def decimal_value(value):
     """
     if value is None:
         raise ValueError('None is not a valid money value.')
+    if isinstance(value, six.integer_types):
+        return decimal.Decimal(value)
     if not isinstance(value, decimal.Decimal):
         try:
             return decimal.Decimal(str(value))
@@ -57,6 +128,9 @@ def decimal_value(value):
     return value
 
 
+_new_object = object.__new__
+
+
 class Money(object):
     """
     Represents a monetary quantity.
@@ -74,38 +148,65 @@ class Money(object):
         return self.format()
 
     def __hash__(self):
-        return self.__repr__()
+        # Consistent with __eq__ which compares non Money values with the amount.
+        return hash(self._amount)
+
+    @classmethod
+    def _make(cls, amount, currency=NoCurrency):
+        """
+        Create a value from a decimal amount without validating the amount.
+        """
+        self = _new_object(cls)
+        self._amount = amount
+        self.currency = currency
+        return self
+
+    def _other_amount(self, other):
+        """
+        Amount of the other operand of an arithmetic operator.
+
+        @raises ValueError if currencies do not match.
+        """
+        if isinstance(other, Money):
+            if self.currency is not other.currency and self.currency != other.currency:
+                raise ValueError('Currencies do not match')
+            return other._amount
+        return decimal_value(other)
 
     # Math operators
     def __pos__(self):
-        return Money(amount=self._amount)
+        return self._make(self._amount, self.currency)
 
     def __neg__(self):
-        return Money(amount=-self._amount)
+        return self._make(-self._amount, self.currency)
 
     def __add__(self, other):
-        if self._can_compare(other):
-            return Money(amount=self._amount + other._amount)
+        # Inlined as addition is the most common operation (eg sum())
+        result = _new_object(Money)
+        if isinstance(other, Money):
+            if self.currency is not other.currency and self.currency != other.currency:
+                raise ValueError('Currencies do not match')
+            result._amount = self._amount + other._amount
         else:
-            return Money(amount=self._amount + decimal_value(other))
+            result._amount = self._amount + decimal_value(other)
+        result.currency = self.currency
+        return result
 
     def __sub__(self, other):
-        if self._can_compare(other):
-            return Money(amount=self._amount - other._amount)
-        else:
-            return Money(amount=self._amount - decimal_value(other))
+        return self._make(self._amount - self._other_amount(other), self.currency)
+
+    def __rsub__(self, other):
+        return self._make(self._other_amount(other) - self._amount, self.currency)
 
     def __mul__(self, other):
-        if self._can_compare(other):
+        if isinstance(other, Money):
             raise TypeError('Can not multiply by a monetary quantity.')
-        else:
-            return Money(amount=self._amount * decimal_value(other))
+        return self._make(self._amount * decimal_value(other), self.currency)
 
-    def __div__(self, other):
-        if self._can_compare(other):
+    def __truediv__(self, other):
+        if isinstance(other, Money):
             raise TypeError('Can not divide by a monetary quantity.')
-        else:
-            return Money(amount=self._amount * decimal_value(other))
+        return self._make(self._amount / decimal_value(other), self.currency)
 
     def __rmod__(self, other):
         """
@@ -116,23 +217,20 @@ class Money(object):
         """
         if isinstance(other, Money):
             raise TypeError('Can not use a monetary quantity as a percentage.')
-        else:
-            # noinspection PyTypeChecker
-            percentage = decimal_value(other) * self._amount / 100
-            return Money(amount=percentage)
+        # noinspection PyTypeChecker
+        return self._make(decimal_value(other) * self._amount / 100, self.currency)
 
     def __abs__(self):
-        return Money(abs(self._amount))
+        return self._make(abs(self._amount), self.currency)
 
     __radd__ = __add__
-    __rsub__ = __sub__
     __rmul__ = __mul__
-    __rdiv__ = __div__
+    __div__ = __truediv__
 
     # Comparison operators
     def __eq__(self, other):
         if isinstance(other, Money):
-            if self.currency != other.currency:
+            if self.currency is not other.currency and self.currency != other.currency:
                 return False
             return self._amount == other._amount
         # For non Money types assume the that the amount is being compared.
@@ -145,19 +243,13 @@ class Money(object):
         return not self.__eq__(other)
 
     def __lt__(self, other):
-        if self._can_compare(other):
-            return self._amount < other._amount
-        else:
-            return self._amount < decimal.Decimal(str(other))
+        return self._amount < self._other_amount(other)
 
     def __le__(self, other):
         return self < other or self == other
 
     def __gt__(self, other):
-        if self._can_compare(other):
-            return self._amount > other._amount
-        else:
-            return self._amount > decimal.Decimal(str(other))
+        return self._amount > self._other_amount(other)
 
     def __ge__(self, other):
         return self > other or self == other
@@ -178,6 +270,10 @@ class Money(object):
 
     def __setstate__(self, state):
         self._amount = decimal_value(state.get('amount', '0.0'))
+        try:
+            self.currency = get_currency(state.get('currency', NO_CURRENCY_CODE))
+        except KeyError:
+            self.currency = NoCurrency
 
     def _can_compare(self, right):
         """
@@ -186,7 +282,7 @@ class Money(object):
         @raises Value Error if currencies do not match.
         """
         if isinstance(right, Money):
-            if self.currency == right.currency:
+            if self.currency is right.currency or self.currency == right.currency:
                 return True
             else:
                 raise ValueError('Currencies do not match')
@@ -198,40 +294,541 @@ class Money(object):
         """
         Format money value to a string
         """
-        # Round and split number
-        q = decimal.Decimal(10) ** -places
-        sign, digits, exp = self._amount.quantize(q).as_tuple()
+        return get_money_formatter(places, currency_symbol, separator, decimal_place, positive_sign,
+                                   negative_sign, trailing_negative).format(self._amount)
+
+
+class MoneyAccumulator(object):
+    """
+    Running total of monetary quantities.
+
+    Amounts are summed as decimals and a single :class:`Money` value is only
+    created when the total is requested. If a currency is not supplied the
+    currency of the first :class:`Money` value added is used.
+
+    >>> MoneyAccumulator().extend([Money('1.50'), Money('2.25')]).total()
+    3.7500
+    """
+    __slots__ = ('currency', '_total')
 
-        # Convert digits to string
-        results = []
-        digits = [str(d) for d in digits]
-        build, next_ = results.append, digits.pop
+    def __init__(self, currency=None, start=0):
+        self.currency = currency
+        self._total = decimal_value(start)
 
-        # Append trailing negative sign
-        if sign:
-            build(trailing_negative)
+    def _check_currency(self, currency):
+        if self.currency is None:
+            self.currency = currency
+        elif currency is not self.currency and currency != self.currency:
+            raise ValueError('Currencies do not match')
 
-        # Cut off decimal digits
-        if places:
-            for i in range(places):
-                build(next_())
-            build(decimal_place)
+    def add(self, value):
+        """
+        Add a value to the total.
 
-        # Append digits
-        if not digits:
-            build('0')
+        @raises ValueError if the currency of value does not match.
+        """
+        if isinstance(value, Money):
+            if value.currency is not self.currency:
+                self._check_currency(value.currency)
+            self._total += value._amount
         else:
-            idx = 0
-            while digits:
-                build(next_())
-                idx += 1
-                if not idx % 3 and digits:
-                    build(str(separator))
-
-        # Append currency symbol and sign before returning result
-        build(str(currency_symbol))
-        build(str(negative_sign if sign else positive_sign))
-        return ''.join(reversed(results))
+            self._total += decimal_value(value)
+        return self
+
+    __iadd__ = add
+
+    def extend(self, values):
+        """
+        Add an iterable of values to the total.
+
+        @raises ValueError if the currency of a value does not match.
+        """
+        total = self._total
+        currency = self.currency
+        try:
+            for value in values:
+                if isinstance(value, Money):
+                    if value.currency is not currency:
+                        self._check_currency(value.currency)
+                        currency = self.currency
+                    total += value._amount
+                else:
+                    total += decimal_value(value)
+        finally:
+            self._total = total
+        return self
+
+    def total(self):
+        """
+        Total as a :class:`Money` value.
+        """
+        return Money._make(self._total, NoCurrency if self.currency is None else self.currency)
+
+
+class MoneyFormatter(object):
+    """
+    Formats monetary amounts into strings.
+
+    Formatting options are resolved once when the formatter is created so
+    formatting a value is a single string format of the decimal amount. Use
+    :func:`get_money_formatter` to obtain a shared formatter for a set of
+    options.
+
+    >>> MoneyFormatter(currency_symbol='$').format_many([Money('1234.5'), Money('-2')])
+    ['$1,234.50', '-$2.00']
+    """
+    __slots__ = ('places', '_spec', '_separator', '_decimal_place', '_positive', '_negative', '_trailing_negative')
+
+    def __init__(self, places=2, currency_symbol='', separator=',', decimal_place='.', positive_sign='',
+                 negative_sign='-', trailing_negative=''):
+        self.places = places
+        # Rounding of the format spec matches Decimal.quantize (round half even)
+        self._spec = ',.%df' % places
+        self._separator = None if separator == ',' else str(separator)
+        self._decimal_place = None if decimal_place == '.' else decimal_place
+        self._positive = str(positive_sign) + str(currency_symbol)
+        self._negative = str(negative_sign) + str(currency_symbol)
+        self._trailing_negative = trailing_negative
+
+    def __call__(self, value):
+        return self.format(value)
+
+    def format(self, value):
+        """
+        Format a :class:`Money` or decimal value.
+        """
+        if isinstance(value, Money):
+            value = value._amount
+        text = format(value, self._spec)
+        if self._separator is not None or self._decimal_place is not None:
+            text = self._translate(text)
+        if text[0] == '-':
+            return self._negative + text[1:] + self._trailing_negative
+        return self._positive + text
+
+    def format_many(self, values):
+        """
+        Format an iterable of :class:`Money` or decimal values.
+        """
+        format_ = self.format
+        return [format_(value) for value in values]
+
+    def _translate(self, text):
+        integral, _, fraction = text.partition('.')
+        if self._separator is not None:
+            integral = integral.replace(',', self._separator)
+        if fraction:
+            return integral + (self._decimal_place or '.') + fraction
+        return integral
+
+
+_money_formatters = {}
+MONEY_FORMATTER_CACHE_SIZE = 128
+
+
+def get_money_formatter(places=2, currency_symbol='', separator=',', decimal_place='.', positive_sign='',
+                        negative_sign='-', trailing_negative=''):
+    """
+    Get a cached :class:`MoneyFormatter` for a set of formatting options.
+    """
+    key = (places, currency_symbol, separator, decimal_place, positive_sign, negative_sign, trailing_negative)
+    try:
+        return _money_formatters[key]
+    except KeyError:
+        if len(_money_formatters) >= MONEY_FORMATTER_CACHE_SIZE:
+            _money_formatters.clear()
+        formatter = _money_formatters[key] = MoneyFormatter(*key)
+        return formatter
+
+
+_numpy_module = False
+
+
+def _numpy():
+    """
+    Obtain the numpy module if it is installed.
+
+    Import is deferred until first use as numpy is expensive to import and is
+    only required for large batches of values.
+    """
+    global _numpy_module
+    if _numpy_module is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy_module = numpy
+    return _numpy_module
+
+
+try:
+    array.array('q')
+    ARRAY_TYPECODE = 'q'
+except ValueError:
+    # Python 2 does not support long long arrays.
+    ARRAY_TYPECODE = 'l'
+INT64_MAX = 2 ** 63 - 1
+
+
+def currency_places(currency, places=None):
+    """
+    Number of decimal places used to store minor units of a currency.
+
+    @raises ValueError if the currency does not define minor units and places have not been provided.
+    """
+    if places is None:
+        places = currency.decimal_digits
+        if places is None:
+            raise ValueError('Currency %s does not define minor units, places must be provided.' % currency.code)
+    return places
+
+
+def to_minor_units(value, places):
+    """
+    Convert a decimal amount into an integer of minor units (eg cents), rounding half even.
+    """
+    return int(decimal_value(value).scaleb(places).to_integral_value())
+
+
+def from_minor_units(value, places):
+    """
+    Convert an integer of minor units into a decimal amount.
+    """
+    return decimal.Decimal(value).scaleb(-places)
+
+
+def _ratio(value):
+    """
+    Split a decimal into an integer numerator and denominator.
+    """
+    sign, digits, exp = decimal_value(value).as_tuple()
+    numerator = int(''.join(map(str, digits)) or '0')
+    if sign:
+        numerator = -numerator
+    if exp >= 0:
+        return numerator * 10 ** exp, 1
+    return numerator, 10 ** -exp
+
+
+def _largest(values):
+    """
+    Largest absolute value in a numpy array (abs() overflows for the minimum int64).
+    """
+    return max(int(values.max()), -int(values.min()))
+
+
+def _check_negatable(values):
+    """
+    @raises OverflowError if a numpy array contains the minimum int64 (which numpy negates to itself).
+    """
+    if len(values) and int(values.min()) == -INT64_MAX - 1:
+        raise OverflowError('Result does not fit in 64 bits')
+
+
+def _rsub(a, b):
+    return b - a
+
+
+def _divide_half_even(value, denominator):
+    """
+    Integer division of value by denominator rounding half even (the default
+    rounding used by the decimal module).
+    """
+    quotient, remainder = divmod(value, denominator)
+    remainder *= 2
+    if remainder > denominator or (remainder == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+class MoneyArray(object):
+    """
+    Represents a batch of monetary quantities that share a single currency.
+
+    Values are stored as integers of minor units (eg cents) in a numpy array if
+    numpy is installed or an ``array.array`` otherwise. This allows arithmetic
+    to be applied to the entire batch without creating a :class:`Money` object
+    for every value.
+
+    >>> MoneyArray.from_money([Money('1.50'), Money('2.25')]).sum()
+    3.7500
+    """
+    __slots__ = ('_values', 'currency', 'places', )
+
+    def __init__(self, values=(), currency=NoCurrency, places=None):
+        """
+        @param values Iterable of integer minor unit values.
+        @param currency Currency shared by all values.
+        @param places Number of decimal places in a minor unit, defaults to the currency decimal digits.
+        """
+        self.currency = currency
+        self.places = currency_places(currency, places)
+        numpy = _numpy()
+        if numpy:
+            self._values = numpy.array(values, dtype=numpy.int64)
+        else:
+            self._values = array.array(ARRAY_TYPECODE, values)
+
+    @classmethod
+    def from_money(cls, values, currency=None, places=None):
+        """
+        Create an array from an iterable of :class:`Money` values.
+
+        @param currency Currency of the array, defaults to the currency of the first value.
+        @raises ValueError if currencies do not match.
+        """
+        values = list(values)
+        if currency is None:
+            currency = values[0].currency if values else NoCurrency
+        places = currency_places(currency, places)
+        units = []
+        append = units.append
+        for value in values:
+            if value.currency is not currency and value.currency != currency:
+                raise ValueError('Currencies do not match')
+            append(int(value._amount.scaleb(places).to_integral_value()))
+        return cls(units, currency, places)
+
+    def _new(self, values):
+        result = MoneyArray.__new__(MoneyArray)
+        result._values = values
+        result.currency = self.currency
+        result.places = self.places
+        return result
+
+    def _scalar(self, other):
+        """
+        Resolve a scalar operand into a decimal of (possibly fractional) minor units.
+
+        @raises ValueError if currencies do not match.
+        """
+        if isinstance(other, Money):
+            if self.currency != other.currency:
+                raise ValueError('Currencies do not match')
+            other = other._amount
+        return decimal_value(other).scaleb(self.places)
+
+    def _operand(self, other):
+        """
+        Resolve the minor units of a right hand operand.
+
+        @raises ValueError if currencies or minor units do not match or if a
+            value can not be represented exactly in minor units.
+        """
+        if isinstance(other, MoneyArray):
+            if self.currency != other.currency or self.places != other.places:
+                raise ValueError('Currencies do not match')
+            if len(self._values) != len(other._values):
+                raise ValueError('Arrays are not the same length')
+            return other._values, True
+        units = self._scalar(other)
+        if units != units.to_integral_value():
+            raise ValueError('Value %s can not be represented in minor units' % other)
+        return int(units), False
+
+    def _apply(self, op, other, is_array):
+        values = self._values
+        if _numpy():
+            return op(values, other)
+        if is_array:
+            return [op(a, b) for a, b in zip(values, other)]
+        return [op(a, other) for a in values]
+
+    def _additive(self, op, other):
+        """
+        Add or subtract an operand from every value.
+
+        @raises OverflowError if a result does not fit in 64 bits.
+        """
+        other, is_array = self._operand(other)
+        numpy = _numpy()
+        if not numpy:
+            # Storing the result in an array.array raises an OverflowError.
+            return self._result(self._apply(op, other, is_array))
+        if not is_array:
+            if not -INT64_MAX - 1 <= other <= INT64_MAX:
+                raise OverflowError('Value %s does not fit in 64 bits' % other)
+            other = numpy.int64(other)
+        values = self._values
+        with numpy.errstate(over='ignore'):
+            result = op(values, other)
+        # numpy wraps silently, a + b = r overflowed if r differs in sign from
+        # both a and b. Subtraction a - b = r is checked as r + b = a.
+        if op is operator.add:
+            overflow = (values ^ result) & (other ^ result)
+        elif op is operator.sub:
+            overflow = (result ^ values) & (other ^ values)
+        else:
+            overflow = (result ^ other) & (values ^ other)
+        if (overflow < 0).any():
+            raise OverflowError('Result does not fit in 64 bits')
+        return self._new(result)
+
+    def _compare(self, op, other):
+        """
+        Compare every value with an operand.
+
+        Scalar operands are compared exactly, a value that falls between two
+        minor units is never equal to any value in the array.
+        """
+        if isinstance(other, MoneyArray):
+            return self._apply(op, *self._operand(other))
+        units = self._scalar(other)
+        floor = int(units.to_integral_value(decimal.ROUND_FLOOR))
+        if units != floor:
+            if op is operator.eq or op is operator.ne:
+                result = op is operator.ne
+                numpy = _numpy()
+                if numpy:
+                    return numpy.full(len(self._values), result, dtype=bool)
+                return [result] * len(self._values)
+            # With integer values x < units is equivalent to x <= floor(units).
+            op = operator.le if op in (operator.lt, operator.le) else operator.gt
+        return self._apply(op, floor, False)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self.to_money())
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self._new(self._values[item])
+        return Money._make(from_minor_units(int(self._values[item]), self.places), self.currency)
+
+    def __repr__(self):
+        return 'MoneyArray([%s])' % ', '.join(repr(m) for m in self)
+
+    @property
+    def units(self):
+        """
+        List of integer minor unit values.
+        """
+        return [int(v) for v in self._values]
+
+    def to_money(self):
+        """
+        Convert array into a list of :class:`Money` values.
+        """
+        places = self.places
+        currency = self.currency
+        make = Money._make
+        return [make(from_minor_units(int(v), places), currency) for v in self._values]
+
+    def sum(self):
+        """
+        Total of all values in the array.
+        """
+        values = self._values
+        if _numpy() and len(values) and _largest(values) * len(values) <= INT64_MAX:
+            total = values.sum()
+        else:
+            # Summing Python integers can not overflow.
+            total = sum(int(v) for v in values)
+        return Money._make(from_minor_units(int(total), self.places), self.currency)
+
+    # Math operators
+    def __neg__(self):
+        values = self._values
+        if _numpy():
+            _check_negatable(values)
+            return self._new(-values)
+        return self._result([-v for v in values])
+
+    def __pos__(self):
+        return self._new(self._values)
+
+    def __abs__(self):
+        values = self._values
+        if _numpy():
+            _check_negatable(values)
+            return self._new(abs(values))
+        return self._result([abs(v) for v in values])
+
+    def __add__(self, other):
+        return self._additive(operator.add, other)
+
+    def __sub__(self, other):
+        return self._additive(operator.sub, other)
+
+    def __rsub__(self, other):
+        return self._additive(_rsub, other)
+
+    def __mul__(self, other):
+        if isinstance(other, (Money, MoneyArray)):
+            raise TypeError('Can not multiply by a monetary quantity.')
+        return self._scale(*_ratio(other))
+
+    def __rmod__(self, other):
+        """
+        Re-purposed to calculate a percentage of every value.
+
+        >>> 10 % MoneyArray([50000, 100])
+        MoneyArray([50.0000, 0.1000])
+        """
+        if isinstance(other, (Money, MoneyArray)):
+            raise TypeError('Can not use a monetary quantity as a percentage.')
+        numerator, denominator = _ratio(other)
+        return self._scale(numerator, denominator * 100)
+
+    __radd__ = __add__
+    __rmul__ = __mul__
+
+    def _result(self, values):
+        if isinstance(values, list):
+            numpy = _numpy()
+            if numpy:
+                values = numpy.array(values, dtype=numpy.int64)
+            else:
+                values = array.array(ARRAY_TYPECODE, values)
+        return self._new(values)
+
+    def _scale(self, numerator, denominator):
+        """
+        Multiply all values by numerator / denominator rounding half even.
+        """
+        values = self._values
+        numpy = _numpy()
+        if numpy and len(values):
+            # Only use vector operations if the intermediate product can not overflow 64 bits.
+            largest = _largest(values)
+            if largest * abs(numerator) * 2 < INT64_MAX and denominator * 2 < INT64_MAX:
+                quotient, remainder = numpy.divmod(values * numerator, denominator)
+                remainder *= 2
+                quotient += (remainder > denominator) | ((remainder == denominator) & (quotient % 2 == 1))
+                return self._new(quotient)
+        if denominator == 1:
+            return self._result([int(v) * numerator for v in values])
+        return self._result([_divide_half_even(int(v) * numerator, denominator) for v in values])
+
+    # Comparison operators (applied to each value)
+    def __eq__(self, other):
+        return self._compare(operator.eq, other)
+
+    def __ne__(self, other):
+        return self._compare(operator.ne, other)
+
+    def __lt__(self, other):
+        return self._compare(operator.lt, other)
+
+    def __le__(self, other):
+        return self._compare(operator.le, other)
+
+    def __gt__(self, other):
+        return self._compare(operator.gt, other)
+
+    def __ge__(self, other):
+        return self._compare(operator.ge, other)
+
+    __hash__ = None
+
+    def format(self, **kwargs):
+        """
+        Format every value to a string, accepts the same arguments as :meth:`Money.format`.
+        """
+        places = self.places
+        return get_money_formatter(**kwargs).format_many(from_minor_units(int(v), places) for v in self._values)
 
 
 def to_dms(value, absolute=False):
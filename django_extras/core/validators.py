@@ -6,6 +6,7 @@ except ImportError:
     from django.utils import simplejson as json
 import six
 from django.utils.translation import ugettext_lazy as _
+from django_extras.utils import jsoncodec
 
 
 color_re = re.compile(
@@ -44,7 +45,11 @@ class JsonValidator(object):
         Validates that the input is valid JSON.
         """
         try:
-            json.loads(value, **self.load_options)
+            if self.load_options:
+                # Options are specific to the standard library
+                json.loads(value, **self.load_options)
+            else:
+                jsoncodec.validate(value)
         except ValueError:
             raise ValidationError(self.message, code=self.code)
 
@@ -1,4 +1,6 @@
 # Convenience imports
 from django.db.models import *  # noqa
+from django_extras.db.models.aggregates import *  # noqa
 from django_extras.db.models.choices import *  # noqa
 from django_extras.db.models.fields import *  # noqa
+from django_extras.db.models.functions import *  # noqa
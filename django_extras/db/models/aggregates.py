@@ -0,0 +1,93 @@
+# -*- coding: UTF-8 -*-
+"""
+Django Extras: db.models.aggregates
+
+Aggregates over a MoneyField that are calculated by the database and return
+:class:`Money` values (requires Django 1.8+).
+"""
+from django.db import models
+from django_extras.core.types import Currency, Money, NoCurrency, decimal_value, get_currency
+
+__all__ = ('MoneySum', 'MoneyAvg', 'MoneyMin', 'MoneyMax', 'aggregate_by_currency')
+
+
+class MoneyAggregate(object):
+    """
+    Mixin that converts the result of an aggregate into a :class:`Money` value.
+
+    The currency of the result is taken from the ``currency`` argument, use
+    :func:`aggregate_by_currency` to aggregate a :class:`MoneyField` that
+    stores a currency.
+
+    @raises ValueError if a currency is not provided for a field that stores a
+        currency and values are not grouped by the currency column.
+    """
+    def __init__(self, expression, currency=None, **extra):
+        super(MoneyAggregate, self).__init__(expression, **extra)
+        if currency is None:
+            currency = NoCurrency
+        elif not isinstance(currency, Currency):
+            currency = get_currency(currency)
+        self.currency = currency
+
+    def resolve_expression(self, query=None, allow_joins=True, reuse=None, summarize=False, for_save=False):
+        c = super(MoneyAggregate, self).resolve_expression(query, allow_joins, reuse, summarize, for_save)
+        if c.currency is NoCurrency:
+            field = c.get_source_fields()[0]
+            currency_field = getattr(field, 'currency_field', None)
+            # Values of different currencies are only separated by an annotation grouped by the currency column.
+            if currency_field is not None and (summarize or currency_field.name not in query.values_select):
+                raise ValueError('Aggregate of %r would combine currencies, provide a currency or use '
+                                 'aggregate_by_currency().' % field.name)
+        return c
+
+    def convert_value(self, value, expression, connection, context=None):
+        # The context argument is deprecated in Django 2.0 and not passed by 3.0+
+        if value is None or isinstance(value, Money):
+            return value
+        value = decimal_value(value)
+        field = self.get_source_fields()[0]
+        if getattr(field, 'storage', None) == 'integer':
+            value = value.scaleb(-field.decimal_places)
+        return Money._make(value, self.currency)
+
+
+class MoneySum(MoneyAggregate, models.Sum):
+    pass
+
+
+class MoneyAvg(MoneyAggregate, models.Avg):
+    pass
+
+
+class MoneyMin(MoneyAggregate, models.Min):
+    pass
+
+
+class MoneyMax(MoneyAggregate, models.Max):
+    pass
+
+
+def aggregate_by_currency(queryset, field_name, aggregate=MoneySum):
+    """
+    Aggregate a :class:`MoneyField` grouped by currency in a single query.
+
+    :param queryset: Queryset to aggregate.
+    :param field_name: Name of the money field.
+    :param aggregate: Aggregate class to apply, defaults to :class:`MoneySum`.
+    :return: dict of :class:`Currency` to :class:`Money` value.
+    """
+    field = queryset.model._meta.get_field(field_name)
+    currency_field = getattr(field, 'currency_field', None)
+    if currency_field is None:
+        value = queryset.aggregate(_money=aggregate(field_name))['_money']
+        return {} if value is None else {NoCurrency: value}
+
+    rows = queryset.order_by().values(currency_field.name).annotate(
+        _money=aggregate(field_name)).values_list(currency_field.name, '_money')
+    results = {}
+    for currency, value in rows:
+        if value is not None:
+            currency = currency_field.to_python(currency)
+            results[currency] = Money._make(value._amount, currency)
+    return results
@@ -137,3 +137,124 @@ class ChoiceEnum(object):
         Resolve a value to it's display version.
         """
         return self.__value_map[value]
+
+    @property
+    def choices(self):
+        """
+        Tuple of (value, display) pairs.
+        """
+        return tuple(self.__choices.values())
+
+    def key_for(self, value):
+        """
+        Resolve a value to it's key.
+        """
+        for key, choice in self.__choices.items():
+            if choice[0] == value:
+                return key
+        raise KeyError(value)
+
+    def index_of(self, value):
+        """
+        Resolve a value to it's position in the choice list.
+        """
+        for idx, choice in enumerate(self.__choices.values()):
+            if choice[0] == value:
+                return idx
+        raise KeyError(value)
+
+    def display_for(self, key):
+        """
+        Resolve a key to it's display version.
+        """
+        return self.__choices[key][1]
+
+    def freeze(self):
+        """
+        Compile this enum into a :class:`FrozenChoiceEnum`.
+        """
+        return FrozenChoiceEnum(*self._entries())
+
+    def _entries(self):
+        """
+        Entries in the form supplied to the constructor.
+        """
+        default = self.__default
+        return tuple(
+            (key, (value, display, True) if value == default else (value, display))
+            for key, (value, display) in self.__choices.items()
+        )
+
+
+class FrozenChoiceEnum(ChoiceEnum):
+    """
+    A ChoiceEnum with lookup tables that are compiled when the enum is created.
+
+    Choices are materialised into a tuple and values and display values are
+    generated as class attributes (of a class specific to each enum) so the
+    lookups are constant time and do not go through ``__getattr__``:
+
+        MY_CHOICES = FrozenChoiceEnum(
+            ('OPTION_ONE', ('value', 'Verbose value')),
+            ('OPTION_TWO', ('value2', 'Verbose value 2', True)),
+        )
+
+    or from an existing enum:
+
+        MY_CHOICES = ChoiceEnum(...).freeze()
+
+    Keys that collide with an existing attribute (eg ``default``) are not
+    generated and are only available via ``display_for`` and ``key_for``.
+    """
+    __slots__ = ('_choices', '_keys', '_displays', '_indexes')
+
+    def __new__(cls, *args, **entries):
+        # Each enum has it's own class to hold the generated attributes.
+        return super(FrozenChoiceEnum, cls).__new__(type(cls.__name__, (cls, ), {'__slots__': ()}))
+
+    def __init__(self, *args, **entries):
+        super(FrozenChoiceEnum, self).__init__(*args, **entries)
+
+        choices = self._ChoiceEnum__choices
+        self._choices = tuple(choices.values())
+        self._keys = {}
+        self._displays = {}
+        self._indexes = {}
+
+        klass = type(self)
+        for idx, (key, (value, display)) in enumerate(choices.items()):
+            self._keys.setdefault(value, key)
+            self._indexes.setdefault(value, idx)
+            self._displays[key] = display
+
+            display_key = key + '__display'
+            if not (hasattr(klass, key) or hasattr(klass, display_key)):
+                setattr(klass, key, value)
+                setattr(klass, display_key, display)
+
+    def __reduce__(self):
+        # The generated class can not be pickled by reference.
+        return _frozen_choice_enum, (self._entries(), )
+
+    def __iter__(self):
+        return iter(self._choices)
+
+    @property
+    def choices(self):
+        return self._choices
+
+    def key_for(self, value):
+        return self._keys[value]
+
+    def index_of(self, value):
+        return self._indexes[value]
+
+    def display_for(self, key):
+        return self._displays[key]
+
+    def freeze(self):
+        return self
+
+
+def _frozen_choice_enum(entries):
+    return FrozenChoiceEnum(*entries)
@@ -7,12 +7,18 @@ import six
 from django.core import exceptions
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
+from django.db.models.signals import pre_init
 from django.utils.translation import ugettext_lazy as _
 from django_extras import forms
 from django_extras.core import validators
-from django_extras.core.types import Money
+from django_extras.core.types import Currency, Money, NoCurrency, decimal_value, from_minor_units, get_currency, \
+    to_minor_units
 # Convenience Imports
-from django_extras.db.models.fields.jsonfield import JsonField  # noqa
+from django_extras.db.models.fields.choicefield import ChoiceField, ChoiceFlagsField  # noqa
+from django_extras.db.models.fields.jsonfield import JsonDirtyFieldsMixin, JsonField  # noqa
+
+STORAGE_DECIMAL = 'decimal'
+STORAGE_INTEGER = 'integer'
 
 
 class ColorField(models.CharField):
@@ -42,10 +48,108 @@ class ColorField(models.CharField):
         return super(ColorField, self).formfield(**defaults)
 
 
-# TODO: This field should really also store the currency.
+class CurrencyField(models.PositiveSmallIntegerField):
+    """
+    Database field that stores a currency as its ISO 4217 number.
+
+    Values are returned as the registered :class:`Currency` instance.
+    """
+    default_error_messages = {
+        'invalid': _(six.u('This value must be a known currency.')),
+    }
+    description = _("Currency")
+
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        # A currency field is added automatically by a MoneyField, avoid adding
+        # a duplicate field if one has already been defined (eg by a migration).
+        if any(f.name == name for f in cls._meta.local_fields):
+            return
+        super(CurrencyField, self).contribute_to_class(cls, name, *args, **kwargs)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, Currency):
+            return value
+        try:
+            if isinstance(value, six.string_types) and value.isdigit():
+                value = int(value)
+            return get_currency(value)
+        except (KeyError, AttributeError):
+            raise exceptions.ValidationError(self.error_messages['invalid'])
+
+    def from_db_value(self, value, expression, connection, context):
+        if value is None:
+            return value
+        return get_currency(value)
+
+    def get_prep_value(self, value):
+        value = self.to_python(value)
+        if value is None:
+            return value
+        return value.number
+
+
+class MoneyFieldDescriptor(object):
+    """
+    Descriptor that builds a :class:`Money` value from the raw amount (and
+    currency column) of a :class:`MoneyField` when the value is first accessed.
+    """
+    def __init__(self, field):
+        self.field = field
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        field = self.field
+        attname = field.attname
+        currency_field = field.currency_field
+        # Deferred columns (the currency is required to build the value)
+        deferred = [name for name in (attname, currency_field and currency_field.attname)
+                    if name and name not in instance.__dict__]
+        if deferred:
+            instance.refresh_from_db(fields=deferred)
+        value = instance.__dict__[attname]
+        if value is None:
+            return value
+
+        if currency_field is None:
+            if isinstance(value, Money):
+                return value
+            currency = NoCurrency
+        else:
+            currency = currency_field.to_python(instance.__dict__.get(currency_field.attname)) or NoCurrency
+            if isinstance(value, Money):
+                if value.currency is currency:
+                    return value
+                value = value._amount
+        value = instance.__dict__[attname] = Money(decimal_value(value), currency)
+        return value
+
+    def __set__(self, instance, value):
+        # Only Money values carry a currency, raw amounts (eg values loaded
+        # from the database) leave the currency column unchanged.
+        if isinstance(value, Money) and self.field.currency_field is not None:
+            instance.__dict__[self.field.currency_field.attname] = value.currency
+        instance.__dict__[self.field.attname] = value
+
+
 class MoneyField(models.DecimalField):
     """
     Database field that represents a Money amount.
+
+    Amounts can be stored either as a decimal (the default) or as a scaled
+    integer (``storage='integer'``) in a BIGINT column. Integer storage holds
+    the amount in units of ``decimal_places`` (eg 12.3456 is stored as 123456)
+    so sums, comparisons and sorting in the database are plain integer
+    operations.
+
+    If ``with_currency`` is set a :class:`CurrencyField` named
+    ``<name>_currency`` is added to the model to store the currency. Money
+    values are built by the model attribute, ``values()`` querysets return the
+    raw amount.
+
+    If ``lazy`` is set values loaded from the database are kept as the raw
+    amount and only converted into :class:`Money` when the attribute is first
+    accessed.
     """
     default_error_messages = {
         'invalid': _(six.u('This value must be a monetary amount.')),
@@ -53,10 +157,65 @@ class MoneyField(models.DecimalField):
     description = _("Monetary amount")
 
     def __init__(self, *args, **kwargs):
+        self.storage = kwargs.pop('storage', STORAGE_DECIMAL)
+        if self.storage not in (STORAGE_DECIMAL, STORAGE_INTEGER):
+            raise ValueError('Unknown storage type %r.' % self.storage)
+        self.with_currency = kwargs.pop('with_currency', False)
+        self.default_currency = kwargs.pop('default_currency', None)
+        self.currency_db_index = kwargs.pop('currency_db_index', False)
+        self.lazy = kwargs.pop('lazy', False)
+        self.currency_field = None
         kwargs.setdefault('max_digits', 20)
         kwargs.setdefault('decimal_places', 4)
         super(MoneyField, self).__init__(*args, **kwargs)
 
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        super(MoneyField, self).contribute_to_class(cls, name, *args, **kwargs)
+        if self.with_currency:
+            currency_name = '%s_currency' % name
+            existing = [f for f in cls._meta.local_fields if f.name == currency_name]
+            if existing:
+                self.currency_field = existing[0]
+            else:
+                default_currency = self.default_currency or NoCurrency
+                if not isinstance(default_currency, Currency):
+                    default_currency = get_currency(default_currency)
+                self.currency_field = CurrencyField(
+                    default=default_currency.number, null=self.null, blank=self.blank,
+                    db_index=self.currency_db_index, editable=False
+                )
+                cls.add_to_class(currency_name, self.currency_field)
+            # The currency field follows the amount, so the currency of a Money
+            # value passed to the model constructor would be replaced by the
+            # currency default.
+            pre_init.connect(self._pre_init, sender=cls)
+        if self.with_currency or self.lazy:
+            setattr(cls, self.attname, MoneyFieldDescriptor(self))
+
+    def _pre_init(self, sender, args, kwargs, **extra):
+        value = kwargs.get(self.name)
+        if isinstance(value, Money):
+            kwargs[self.currency_field.name] = value.currency
+
+    def deconstruct(self):
+        name, path, args, kwargs = super(MoneyField, self).deconstruct()
+        if self.storage != STORAGE_DECIMAL:
+            kwargs['storage'] = self.storage
+        if self.with_currency:
+            kwargs['with_currency'] = True
+            if self.default_currency:
+                kwargs['default_currency'] = getattr(self.default_currency, 'code', self.default_currency)
+            if self.currency_db_index:
+                kwargs['currency_db_index'] = True
+        if self.lazy:
+            kwargs['lazy'] = True
+        return name, path, args, kwargs
+
+    def get_internal_type(self):
+        if self.storage == STORAGE_INTEGER:
+            return 'BigIntegerField'
+        return super(MoneyField, self).get_internal_type()
+
     def to_python(self, value):
         if value is None:
             return value
@@ -67,10 +226,33 @@ class MoneyField(models.DecimalField):
         except ValueError:
             raise exceptions.ValidationError(self.error_messages['invalid'])
 
+    def from_db_value(self, value, expression, connection, context):
+        if value is None or isinstance(value, Money):
+            return value
+        if self.storage == STORAGE_INTEGER:
+            value = from_minor_units(value, self.decimal_places)
+        if self.with_currency or self.lazy:
+            # Money is built on access by MoneyFieldDescriptor
+            return value
+        return Money(value)
+
+    def get_prep_value(self, value):
+        value = self.to_python(value)
+        if value is None:
+            return value
+        if self.storage == STORAGE_INTEGER:
+            return to_minor_units(value._amount, self.decimal_places)
+        return value._amount
+
     def get_db_prep_save(self, value, connection):
+        if self.storage == STORAGE_INTEGER:
+            return self.get_prep_value(value)
         value = self.to_python(value)
         if value is not None:
             value = value._amount
+        if hasattr(connection.ops, 'adapt_decimalfield_value'):
+            return connection.ops.adapt_decimalfield_value(value, self.max_digits, self.decimal_places)
+        # Django < 1.9
         return connection.ops.value_to_db_decimal(value, self.max_digits, self.decimal_places)
 
 
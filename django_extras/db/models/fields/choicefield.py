@@ -0,0 +1,273 @@
+# -*- coding: UTF-8 -*-
+import six
+from django import forms
+from django.core import exceptions
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+from django_extras.db.models.choices import ChoiceEnum, FrozenChoiceEnum
+
+try:
+    from django.db.models import Lookup
+except ImportError:
+    # Custom lookups require Django 1.7+
+    Lookup = None
+
+# Largest value of a PositiveSmallIntegerField on all supported databases.
+MAX_CODE = 32767
+
+# Number of bits of a BIGINT that can be used without setting the sign bit.
+MAX_FLAGS = 63
+
+
+class ChoiceField(models.Field):
+    """
+    Field for values of a :class:`ChoiceEnum` that stores a small integer code
+    for each value in the database.
+
+    Values are exposed in Python (and used in queries) as the enum value, the
+    code is only used in the database, eg::
+
+        STATUS = ChoiceEnum(
+            ('ACTIVE', ('active', 'Active', True)),
+            ('CLOSED', ('closed', 'Closed')),
+        )
+
+        status = ChoiceField(STATUS)
+
+        Model.objects.filter(status__in=[STATUS.ACTIVE, STATUS.CLOSED])
+
+    By default the code of a value is its position in the enum (starting at
+    1), supply ``codes`` (a mapping of value to code) to keep codes stable if
+    the enum is reordered.
+    """
+    default_error_messages = {
+        'invalid_choice': _(six.u('Value %(value)r is not a valid choice.')),
+    }
+    description = _("Choice value stored as an integer code")
+
+    def __init__(self, enum, *args, **kwargs):
+        if not isinstance(enum, ChoiceEnum):
+            # Entries as produced by deconstruct()
+            enum = FrozenChoiceEnum(*enum)
+        self.enum = enum
+
+        codes = kwargs.pop('codes', None)
+        if codes is None:
+            codes = dict((value, idx) for idx, (value, _display) in enumerate(enum.choices, 1))
+        self.codes = codes = dict(codes)
+        self._values = dict((code, value) for value, code in codes.items())
+
+        for value, _display in enum.choices:
+            if value not in codes:
+                raise ValueError('No code defined for choice %r.' % value)
+        if len(self._values) != len(codes):
+            raise ValueError('Choice codes must be unique.')
+        for code in self._values:
+            if not isinstance(code, six.integer_types) or not 0 <= code <= MAX_CODE:
+                raise ValueError('Choice code %r is not in the range 0-%d.' % (code, MAX_CODE))
+
+        kwargs['choices'] = enum.choices
+        kwargs.setdefault('default', enum.default)
+        super(ChoiceField, self).__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super(ChoiceField, self).deconstruct()
+        kwargs.pop('choices', None)
+        kwargs['enum'] = [(self.enum.key_for(value), (value, display)) for value, display in self.enum.choices]
+        kwargs['codes'] = self.codes
+        return name, path, args, kwargs
+
+    def get_internal_type(self):
+        return 'PositiveSmallIntegerField'
+
+    def to_python(self, value):
+        if value is None or value in self.codes:
+            return value
+        raise exceptions.ValidationError(
+            self.error_messages['invalid_choice'], code='invalid_choice', params={'value': value})
+
+    def from_db_value(self, value, expression, connection, context):
+        if value is None:
+            return value
+        # Codes no longer in the enum are returned unchanged.
+        return self._values.get(value, value)
+
+    def get_prep_value(self, value):
+        if value is None:
+            return value
+        try:
+            return self.codes[value]
+        except (KeyError, TypeError):
+            raise ValueError('%r is not a valid choice.' % (value, ))
+
+
+class ChoiceFlagsField(models.Field):
+    """
+    Field for a set of values of a :class:`ChoiceEnum` that stores each value
+    as a bit in a BIGINT column.
+
+    Values are returned as a ``set`` of enum values, and can be filtered
+    with the ``has_any``, ``has_all`` and ``has_none`` lookups which are
+    evaluated as bitwise operations by the database, eg::
+
+        Model.objects.filter(flags__has_any=[FLAGS.FEATURED, FLAGS.PINNED])
+
+    By default the bit of a value is its position in the enum (starting at
+    0), supply ``bits`` (a mapping of value to bit) to keep bits stable if the
+    enum is reordered.
+    """
+    default_error_messages = {
+        'invalid_choice': _(six.u('Value %(value)r is not a valid choice.')),
+    }
+    description = _("Set of choice values stored as a bitmask")
+
+    def __init__(self, enum, *args, **kwargs):
+        if not isinstance(enum, ChoiceEnum):
+            # Entries as produced by deconstruct()
+            enum = FrozenChoiceEnum(*enum)
+        self.enum = enum
+
+        bits = kwargs.pop('bits', None)
+        if bits is None:
+            bits = dict((value, idx) for idx, (value, _display) in enumerate(enum.choices))
+        self.bits = bits = dict(bits)
+
+        for value, _display in enum.choices:
+            if value not in bits:
+                raise ValueError('No bit defined for choice %r.' % value)
+        if len(set(bits.values())) != len(bits):
+            raise ValueError('Choice bits must be unique.')
+        for bit in bits.values():
+            if not isinstance(bit, six.integer_types) or not 0 <= bit < MAX_FLAGS:
+                raise ValueError('Choice bit %r is not in the range 0-%d.' % (bit, MAX_FLAGS - 1))
+
+        self._masks = dict((value, 1 << bit) for value, bit in bits.items())
+        self._mask_values = sorted((mask, value) for value, mask in self._masks.items())
+
+        kwargs.setdefault('default', set)
+        super(ChoiceFlagsField, self).__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super(ChoiceFlagsField, self).deconstruct()
+        kwargs['enum'] = [(self.enum.key_for(value), (value, display)) for value, display in self.enum.choices]
+        kwargs['bits'] = self.bits
+        return name, path, args, kwargs
+
+    def get_internal_type(self):
+        return 'BigIntegerField'
+
+    def to_mask(self, value):
+        """
+        Convert a set (or single value) of choices into a bitmask.
+
+        @raises ValueError if a value is not a valid choice.
+        """
+        masks = self._masks
+        try:
+            if value in masks:
+                return masks[value]
+        except TypeError:
+            # Unhashable collection (eg a list)
+            pass
+        mask = 0
+        try:
+            for item in value:
+                mask |= masks[item]
+        except (KeyError, TypeError):
+            raise ValueError('%r is not a valid choice.' % (value, ))
+        return mask
+
+    def from_mask(self, mask):
+        """
+        Convert a bitmask into a set of choices, unknown bits are ignored.
+        """
+        return set(value for bit, value in self._mask_values if mask & bit)
+
+    def to_python(self, value):
+        if value is None:
+            return value
+        if isinstance(value, six.integer_types) and value not in self._masks:
+            return self.from_mask(value)
+        if isinstance(value, six.string_types) and value not in self._masks and value.isdigit():
+            # Serialised bitmask (see value_to_string)
+            return self.from_mask(int(value))
+        try:
+            return self.from_mask(self.to_mask(value))
+        except ValueError:
+            raise exceptions.ValidationError(
+                self.error_messages['invalid_choice'], code='invalid_choice', params={'value': value})
+
+    def from_db_value(self, value, expression, connection, context):
+        if value is None:
+            return value
+        return self.from_mask(value)
+
+    def get_prep_value(self, value):
+        if value is None:
+            return value
+        return self.to_mask(value)
+
+    def value_to_string(self, obj):
+        value = self.value_from_object(obj)
+        return '' if value is None else str(self.to_mask(value))
+
+    def formfield(self, **kwargs):
+        defaults = {
+            'form_class': forms.TypedMultipleChoiceField,
+            'choices': self.enum.choices,
+            'coerce': self._coerce_choice,
+        }
+        defaults.update(kwargs)
+        return super(ChoiceFlagsField, self).formfield(**defaults)
+
+    def _coerce_choice(self, value):
+        for choice in self._masks:
+            if six.text_type(choice) == value:
+                return choice
+        raise exceptions.ValidationError(
+            self.error_messages['invalid_choice'], code='invalid_choice', params={'value': value})
+
+
+if Lookup is not None:
+    class FlagsLookup(Lookup):
+        """
+        Bitwise comparison of a flags column with the mask of a set of choices.
+        """
+        template = None
+
+        def get_prep_lookup(self):
+            return self.lhs.output_field.get_prep_value(self.rhs)
+
+        def get_db_prep_lookup(self, value, connection):
+            return '%s', [value]
+
+        def as_sql(self, compiler, connection):
+            lhs, lhs_params = self.process_lhs(compiler, connection)
+            rhs, rhs_params = self.process_rhs(compiler, connection)
+            if connection.vendor == 'oracle':
+                masked = 'BITAND(%s, %s)' % (lhs, rhs)
+            else:
+                masked = '(%s & %s)' % (lhs, rhs)
+            return self.template % {'masked': masked, 'rhs': rhs}, self.get_params(lhs_params, rhs_params)
+
+        def get_params(self, lhs_params, rhs_params):
+            return list(lhs_params) + list(rhs_params)
+
+    class HasAny(FlagsLookup):
+        lookup_name = 'has_any'
+        template = '%(masked)s <> 0'
+
+    class HasAll(FlagsLookup):
+        lookup_name = 'has_all'
+        template = '%(masked)s = %(rhs)s'
+
+        def get_params(self, lhs_params, rhs_params):
+            return list(lhs_params) + list(rhs_params) + list(rhs_params)
+
+    class HasNone(FlagsLookup):
+        lookup_name = 'has_none'
+        template = '%(masked)s = 0'
+
+    ChoiceFlagsField.register_lookup(HasAny)
+    ChoiceFlagsField.register_lookup(HasAll)
+    ChoiceFlagsField.register_lookup(HasNone)
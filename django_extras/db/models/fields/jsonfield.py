@@ -1,49 +1,441 @@
 import six
-try:
-    import json
-except ImportError:
-    from django.utils import simplejson as json
-from django.core.serializers.json import DjangoJSONEncoder
-from django.conf import settings
-from django.db import models
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, models
 from django_extras import forms
+from django_extras.utils import jsoncodec
 
 
 def dumps(value):
-    return DjangoJSONEncoder().encode(value)
+    return jsoncodec.dumps(value)
 
 
 def loads(txt):
-    value = json.loads(txt, encoding=settings.DEFAULT_CHARSET)
+    return jsoncodec.loads(txt)
+
+
+# Compressed values start with a byte that can not start a JSON document
+# followed by a byte identifying the algorithm.
+COMPRESSION_MARKER = b'\x00'
+COMPRESSION_TAGS = {
+    'zlib': b'z',
+    'lzma': b'x',
+    'zstd': b's',
+}
+DEFAULT_COMPRESS_THRESHOLD = 1024
+
+
+def _compressor(algorithm):
+    """
+    Get compress and decompress functions for an algorithm.
+
+    @raises ImproperlyConfigured if the algorithm is not available.
+    """
+    try:
+        if algorithm == 'zlib':
+            import zlib
+            return (lambda data, level: zlib.compress(data, 6 if level is None else level)), zlib.decompress
+        if algorithm == 'lzma':
+            import lzma
+            return (lambda data, level: lzma.compress(data, preset=level)), lzma.decompress
+        if algorithm == 'zstd':
+            import zstandard
+            return ((lambda data, level: zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)),
+                    (lambda data: zstandard.ZstdDecompressor().decompress(data)))
+    except ImportError as ex:
+        raise ImproperlyConfigured('Compression algorithm %r is not available: %s' % (algorithm, ex))
+    raise ImproperlyConfigured('Unknown compression algorithm %r.' % algorithm)
+
+
+_compressors = {}
+
+
+def get_compressor(algorithm):
+    try:
+        return _compressors[algorithm]
+    except KeyError:
+        compressor = _compressors[algorithm] = _compressor(algorithm)
+        return compressor
+
+
+def compress(text, algorithm, level=None, threshold=DEFAULT_COMPRESS_THRESHOLD):
+    """
+    Compress JSON text, values smaller than ``threshold`` bytes are returned
+    UTF-8 encoded but not compressed.
+    """
+    data = text.encode('utf8')
+    if len(data) < threshold:
+        return data
+    return COMPRESSION_MARKER + COMPRESSION_TAGS[algorithm] + get_compressor(algorithm)[0](data, level)
+
+
+def decompress(data):
+    """
+    Decompress a value created by :func:`compress` into JSON text, text and
+    values that were not compressed are returned as text.
+    """
+    if isinstance(data, six.text_type):
+        return data
+    data = bytes(data)
+    if data[:1] == COMPRESSION_MARKER:
+        tag = data[1:2]
+        for algorithm, algorithm_tag in COMPRESSION_TAGS.items():
+            if tag == algorithm_tag:
+                data = get_compressor(algorithm)[1](data[2:])
+                break
+        else:
+            raise ValueError('Unknown compression format %r.' % tag)
+    return data.decode('utf8')
+
+
+class JsonContainer(object):
+    """
+    Mixin that tracks changes to a JSON container.
+
+    A change to a container (or any container nested within it) marks the
+    container and all of its parents as ``dirty``. Containers loaded from the
+    database start clean, any other container is considered dirty.
+    """
+    dirty = True
+    _parent = None
+    _owner = None
+
+    def _changed(self):
+        node = self
+        while node is not None:
+            node.dirty = True
+            node = node._parent
+
+    def _children(self):
+        raise NotImplementedError
+
+    def mark_clean(self):
+        """
+        Mark this container (and any nested containers) as unchanged.
+        """
+        self.dirty = False
+        for item in self._children():
+            if isinstance(item, JsonContainer) and item.dirty:
+                item.mark_clean()
+
+
+def _track(value, parent):
+    """
+    Convert a value into a tracked container that reports changes to parent.
+    """
+    if isinstance(value, dict):
+        if not isinstance(value, JsonDict):
+            value = JsonDict(value)
+    elif isinstance(value, list):
+        if not isinstance(value, JsonList):
+            value = JsonList(value)
+    else:
+        return value
+    value._parent = parent
     return value
 
 
-class JsonDict(dict):
+class JsonDict(JsonContainer, dict):
     """
     Hack so repr() called by dumpdata will output JSON instead of
     Python formatted data.  This way fixtures will work!
     """
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        for key, item in list(self.items()):
+            if isinstance(item, (dict, list)):
+                dict.__setitem__(self, key, _track(item, self))
+
     def __repr__(self):
         return dumps(self)
 
+    def __reduce__(self):
+        # Copies are not attached to a parent (or model instance)
+        return self.__class__, (dict(self), )
+
+    def _children(self):
+        return self.values()
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, _track(value, self))
+        self._changed()
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._changed()
+
+    def clear(self):
+        dict.clear(self)
+        self._changed()
+
+    def pop(self, *args):
+        value = dict.pop(self, *args)
+        self._changed()
+        return value
 
-class JsonList(list):
+    def popitem(self):
+        item = dict.popitem(self)
+        self._changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            dict.__setitem__(self, key, _track(value, self))
+        self._changed()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+
+class JsonList(JsonContainer, list):
     """
     As above
     """
+    def __init__(self, *args):
+        list.__init__(self, *args)
+        for idx, item in enumerate(self):
+            if isinstance(item, (dict, list)):
+                list.__setitem__(self, idx, _track(item, self))
+
     def __repr__(self):
         return dumps(self)
 
+    def __reduce__(self):
+        return self.__class__, (list(self), )
+
+    def _children(self):
+        return self
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = [_track(item, self) for item in value]
+        else:
+            value = _track(value, self)
+        list.__setitem__(self, index, value)
+        self._changed()
+
+    def __delitem__(self, index):
+        list.__delitem__(self, index)
+        self._changed()
+
+    def __setslice__(self, i, j, sequence):
+        # Python 2 only
+        self.__setitem__(slice(i, j), sequence)
+
+    def __delslice__(self, i, j):
+        # Python 2 only
+        self.__delitem__(slice(i, j))
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
 
-class JsonField(six.with_metaclass(models.SubfieldBase, models.TextField)):
+    def __imul__(self, other):
+        list.__imul__(self, other)
+        self._changed()
+        return self
+
+    def append(self, value):
+        list.append(self, _track(value, self))
+        self._changed()
+
+    def extend(self, values):
+        list.extend(self, [_track(item, self) for item in values])
+        self._changed()
+
+    def insert(self, index, value):
+        list.insert(self, index, _track(value, self))
+        self._changed()
+
+    def pop(self, *args):
+        value = list.pop(self, *args)
+        self._changed()
+        return value
+
+    def remove(self, value):
+        list.remove(self, value)
+        self._changed()
+
+    def reverse(self):
+        list.reverse(self)
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._changed()
+
+
+class JsonText(six.text_type):
+    """
+    Raw JSON text loaded from the database that has not been decoded.
+    """
+
+
+class JsonCompressed(six.binary_type):
+    """
+    Compressed JSON loaded from the database that has not been decompressed.
+    """
+
+
+class JsonFieldDescriptor(object):
+    """
+    Descriptor that converts values assigned to a :class:`JsonField` into Python
+    values (replacing ``SubfieldBase``).
+
+    Raw JSON text (or compressed data) loaded by a lazy field is only decoded
+    when the attribute is first accessed.
+    """
+    def __init__(self, field):
+        self.field = field
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        attname = self.field.attname
+        if attname not in instance.__dict__:
+            instance.refresh_from_db(fields=[attname])
+            self.field.mark_clean(instance)
+        value = instance.__dict__[attname]
+        if isinstance(value, JsonCompressed):
+            value = JsonText(decompress(value))
+        if isinstance(value, JsonText):
+            value = instance.__dict__[attname] = self.field.to_python(six.text_type(value))
+            value._owner = instance
+        return value
+
+    def __set__(self, instance, value):
+        if isinstance(value, JsonContainer):
+            if value._owner is not instance:
+                if value._owner is not None or value._parent is not None:
+                    # Value belongs to another instance (or is part of another value)
+                    value.dirty = True
+                value._owner = instance
+        elif not isinstance(value, (JsonText, JsonCompressed)):
+            value = self.field.to_python(value)
+            if isinstance(value, JsonContainer):
+                value.dirty = True
+                value._owner = instance
+        instance.__dict__[self.field.attname] = value
+
+
+class JsonField(models.TextField):
     """Field that serializes/de-serializes a python list/dictionary to the
-    database seamlessly."""
+    database seamlessly.
+
+    If ``lazy`` is set values loaded from the database are kept as the raw
+    JSON text (or compressed data) and only decoded when the attribute is first
+    accessed, values that are never decoded are saved without being encoded
+    again.
+
+    If ``native`` is set the value is stored in a native JSON column (jsonb on
+    PostgreSQL, JSON on MySQL and text queried with the JSON1 extension on
+    SQLite) and key, path, containment and key existence lookups are performed
+    by the database. ``path_indexes`` is a list of paths (eg 'a.b') that
+    expression indexes are created for by :class:`AddJsonPathIndex` migration
+    operations (or :func:`create_path_indexes` for apps without migrations).
+
+    If ``compress`` is set ('zlib', 'lzma' or 'zstd') values are stored
+    compressed in a binary column, values smaller than ``compress_threshold``
+    bytes are stored uncompressed. Uncompressed values (including text of an
+    existing column) are always read."""
 
     def __init__(self, *args, **kwargs):
         if 'default' not in kwargs:
             kwargs['default'] = '{}'
+        self.native = kwargs.pop('native', False)
+        self.path_indexes = tuple(kwargs.pop('path_indexes', ()))
+        if self.path_indexes and not self.native:
+            raise ValueError('Path indexes require a native JSON field.')
+        self.lazy = kwargs.pop('lazy', False)
+        self.compress = kwargs.pop('compress', None)
+        self.compress_level = kwargs.pop('compress_level', None)
+        self.compress_threshold = kwargs.pop('compress_threshold', DEFAULT_COMPRESS_THRESHOLD)
+        if self.compress:
+            if self.native:
+                raise ValueError('A native JSON field can not be compressed.')
+            if self.compress not in COMPRESSION_TAGS:
+                raise ValueError('Unknown compression algorithm %r.' % self.compress)
         models.TextField.__init__(self, *args, **kwargs)
 
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        super(JsonField, self).contribute_to_class(cls, name, *args, **kwargs)
+        setattr(cls, self.attname, JsonFieldDescriptor(self))
+
+    def deconstruct(self):
+        name, path, args, kwargs = super(JsonField, self).deconstruct()
+        if self.native:
+            kwargs['native'] = True
+        if self.path_indexes:
+            kwargs['path_indexes'] = list(self.path_indexes)
+        if self.lazy:
+            kwargs['lazy'] = True
+        if self.compress:
+            kwargs['compress'] = self.compress
+            if self.compress_level is not None:
+                kwargs['compress_level'] = self.compress_level
+            if self.compress_threshold != DEFAULT_COMPRESS_THRESHOLD:
+                kwargs['compress_threshold'] = self.compress_threshold
+        return name, path, args, kwargs
+
+    def get_internal_type(self):
+        if self.compress:
+            return 'BinaryField'
+        return super(JsonField, self).get_internal_type()
+
+    def db_type(self, connection):
+        if self.native:
+            if connection.vendor == 'postgresql':
+                return 'jsonb'
+            if connection.vendor == 'mysql':
+                return 'json'
+        return super(JsonField, self).db_type(connection)
+
+    def get_lookup(self, lookup_name):
+        if self.native:
+            from django_extras.db.models.fields import jsonlookups
+            lookup = jsonlookups.DOCUMENT_LOOKUPS.get(lookup_name)
+            if lookup is not None:
+                return lookup
+        return super(JsonField, self).get_lookup(lookup_name)
+
+    def get_transform(self, name):
+        transform = super(JsonField, self).get_transform(name)
+        if transform is None and self.native:
+            from django_extras.db.models.fields import jsonlookups
+            return jsonlookups.KeyTransformFactory(name)
+        return transform
+
+    def from_db_value(self, value, expression, connection, context):
+        # Native columns may already be decoded by the database driver
+        if isinstance(value, (dict, list)):
+            value = _track(value, None)
+            value.mark_clean()
+            return value
+        if self.compress and value is not None:
+            if self.lazy and not isinstance(value, six.text_type):
+                value = bytes(value)
+                if value[:1] == COMPRESSION_MARKER:
+                    # Decompressed and decoded on access by JsonFieldDescriptor
+                    return JsonCompressed(value)
+            value = decompress(value)
+        if self.lazy and isinstance(value, six.string_types) and value:
+            # Decoded on access by JsonFieldDescriptor
+            return JsonText(value)
+        return self.to_python(value)
+
+    def get_prep_value(self, value):
+        if isinstance(value, (list, dict)):
+            return dumps(value)
+        if value is None or isinstance(value, six.string_types):
+            # Already encoded, TextField.get_prep_value would decode it again
+            return value
+        return super(JsonField, self).get_prep_value(value)
+
     def to_python(self, value):
         """Convert our string value to JSON after we load it from the DB"""
         if value is None or value == '':
@@ -51,15 +443,61 @@ class JsonField(six.with_metaclass(models.SubfieldBase, models.TextField)):
         elif isinstance(value, six.string_types):
             res = loads(value)
             if isinstance(res, dict):
-                return JsonDict(**res)
+                res = JsonDict(res)
             else:
-                return JsonList(res)
+                res = JsonList(res)
+            # Decoded values start clean, JsonFieldDescriptor marks assigned values as changed.
+            res.mark_clean()
+            return res
+        elif isinstance(value, (dict, list)):
+            return _track(value, None)
         else:
             return value
 
+    def has_changed(self, instance):
+        """
+        Check if the value of this field on a model instance may have been
+        changed since it was loaded from (or saved to) the database.
+        """
+        value = instance.__dict__.get(self.attname)
+        if isinstance(value, JsonContainer):
+            return value.dirty
+        # Values that were never decoded (or deferred) can not have changed.
+        return value is not None and not isinstance(value, (JsonText, JsonCompressed))
+
+    def mark_clean(self, instance):
+        """
+        Mark the value of this field on a model instance as unchanged.
+        """
+        value = instance.__dict__.get(self.attname)
+        if isinstance(value, JsonContainer):
+            value.mark_clean()
+
+    def pre_save(self, model_instance, add):
+        # Avoid decoding a lazy value just to save it.
+        return model_instance.__dict__.get(self.attname)
+
     def get_db_prep_save(self, value, connection):
         """Convert our JSON object to a string before we save"""
+        if self.compress:
+            if isinstance(value, JsonCompressed):
+                # Never decompressed so can not have changed
+                return connection.Database.Binary(bytes(value))
+            if isinstance(value, JsonText):
+                text = six.text_type(value)
+            elif isinstance(value, (list, dict)):
+                text = dumps(value)
+            else:
+                text = ''
+            return connection.Database.Binary(compress(text, self.compress, self.compress_level,
+                                                       self.compress_threshold))
+        if isinstance(value, JsonText):
+            # Never decoded so can not have changed
+            return super(JsonField, self).get_db_prep_save(six.text_type(value), connection=connection)
         if not isinstance(value, (list, dict)):
+            if self.native:
+                # An empty string is not valid in a native JSON column.
+                return None if value in (None, '') else value
             return super(JsonField, self).get_db_prep_save("", connection=connection)
         else:
             return super(JsonField, self).get_db_prep_save(dumps(value), connection=connection)
@@ -70,6 +508,82 @@ class JsonField(six.with_metaclass(models.SubfieldBase, models.TextField)):
         return super(JsonField, self).formfield(**defaults)
 
 
+class JsonDirtyFieldsMixin(object):
+    """
+    Model mixin that leaves :class:`JsonField` columns that have not been
+    changed out of the UPDATE statement issued by ``save()``.
+
+    When ``update_fields`` is not supplied it is calculated from the loaded
+    fields of the instance, excluding unchanged JSON values. If no other fields
+    are loaded a normal save is performed (so the save and its signals are not
+    skipped). Values are marked as unchanged once they are saved.
+    """
+    def json_changed_fields(self):
+        """
+        Names of :class:`JsonField` fields that have been changed.
+        """
+        return [f.name for f in self._meta.concrete_fields
+                if isinstance(f, JsonField) and f.has_changed(self)]
+
+    def save(self, *args, **kwargs):
+        json_fields = [f for f in self._meta.concrete_fields if isinstance(f, JsonField)]
+        if (json_fields and not args and kwargs.get('update_fields') is None and not kwargs.get('force_insert')
+                and not self._state.adding):
+            unchanged = set(f.attname for f in json_fields if not f.has_changed(self))
+            if unchanged:
+                # Deferred fields are not in the instance dict.
+                update_fields = [
+                    f.name for f in self._meta.concrete_fields
+                    if not f.primary_key and f.attname not in unchanged and f.attname in self.__dict__
+                ]
+                # An empty list would skip the save (and signals) entirely, so
+                # perform a normal save instead.
+                if update_fields:
+                    kwargs['update_fields'] = update_fields
+
+        super(JsonDirtyFieldsMixin, self).save(*args, **kwargs)
+
+        update_fields = kwargs.get('update_fields', args[3] if len(args) > 3 else None)
+        for field in json_fields:
+            if update_fields is None or field.name in update_fields:
+                field.mark_clean(self)
+
+
+def create_path_indexes(using=None, app_label=None):
+    """
+    Create expression indexes for the ``path_indexes`` of native JSON fields
+    of installed models.
+
+    Indexes are created if they do not already exist (PostgreSQL 9.5+ and
+    SQLite, other databases are skipped). This is intended for apps without
+    migrations, use :class:`django_extras.db.operations.AddJsonPathIndex` in
+    the migrations of other apps so indexes are part of the migration history.
+    """
+    from django.apps import apps
+    from django_extras.db.models.fields.jsonlookups import path_index_sql
+    connection = connections[using or 'default']
+    if app_label is None:
+        model_classes = apps.get_models()
+    else:
+        model_classes = apps.get_app_config(app_label).get_models()
+    tables = None
+    for model in model_classes:
+        if model._meta.proxy or not model._meta.managed:
+            continue
+        for field in model._meta.local_fields:
+            if not isinstance(field, JsonField) or not field.path_indexes:
+                continue
+            if tables is None:
+                tables = set(connection.introspection.table_names())
+            if model._meta.db_table not in tables:
+                continue
+            with connection.cursor() as cursor:
+                for path in field.path_indexes:
+                    sql = path_index_sql(connection, model, field, path)
+                    if sql:
+                        cursor.execute(sql)
+
+
 # Register field with south.
 try:
     from south.modelsinspector import add_introspection_rules
@@ -0,0 +1,316 @@
+# -*- coding: UTF-8 -*-
+"""
+Database side lookups for native JSON columns (see ``JsonField(native=True)``).
+
+Key and path transforms, comparisons of extracted values, containment and key
+existence are compiled to SQL for PostgreSQL (jsonb operators), MySQL (JSON
+functions) and SQLite (JSON1 extension).
+"""
+import hashlib
+import json
+import six
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Lookup, Transform
+
+
+def path_keys(path):
+    """
+    Split a dotted path (eg 'a.b.0') into keys.
+    """
+    if isinstance(path, six.string_types):
+        return path.split('.')
+    return list(path)
+
+
+def _is_index(key):
+    return isinstance(key, six.integer_types) or (isinstance(key, six.string_types) and key.isdigit())
+
+
+def json_path(keys):
+    """
+    JSON path expression (as used by SQLite and MySQL) for a list of keys.
+    """
+    return '$' + ''.join('[%s]' % key if _is_index(key) else '."%s"' % key for key in keys)
+
+
+def sql_literal(value, escape=False):
+    value = "'%s'" % value.replace("'", "''")
+    if escape:
+        # Literal is interpolated into a query with parameters
+        value = value.replace('%', '%%')
+    return value
+
+
+def pg_path(keys):
+    """
+    PostgreSQL text array literal of a list of keys.
+    """
+    return '{%s}' % ','.join('"%s"' % six.text_type(key).replace('\\', '\\\\').replace('"', '\\"') for key in keys)
+
+
+def path_sql(connection, lhs, keys, escape=False):
+    """
+    SQL extracting a path from a JSON expression.
+
+    Paths are rendered as literals rather than parameters so the expression
+    matches expression indexes created for the path.
+    """
+    if connection.vendor == 'postgresql':
+        return '(%s #> %s)' % (lhs, sql_literal(pg_path(keys), escape))
+    if connection.vendor == 'sqlite':
+        return 'json_extract(%s, %s)' % (lhs, sql_literal(json_path(keys), escape))
+    if connection.vendor == 'mysql':
+        return 'JSON_EXTRACT(%s, %s)' % (lhs, sql_literal(json_path(keys), escape))
+    raise NotImplementedError('JSON lookups are not supported by %s.' % connection.vendor)
+
+
+def _dumps(value):
+    return json.dumps(value, cls=DjangoJSONEncoder, separators=(',', ':'))
+
+
+def json_value_sql(connection, value):
+    """
+    SQL and parameters for a Python value compared with an extracted JSON value.
+    """
+    if connection.vendor == 'postgresql':
+        return 'CAST(%s AS jsonb)', [_dumps(value)]
+    if connection.vendor == 'mysql':
+        return 'CAST(%s AS JSON)', [_dumps(value)]
+    if connection.vendor == 'sqlite':
+        # json_extract() returns SQL values for scalars and JSON text otherwise
+        if isinstance(value, (dict, list)):
+            return 'json(%s)', [_dumps(value)]
+        if isinstance(value, bool):
+            return '%s', [int(value)]
+        return '%s', [value]
+    raise NotImplementedError('JSON lookups are not supported by %s.' % connection.vendor)
+
+
+class JsonValueField(models.Field):
+    """
+    Output field of a value extracted from a JSON document.
+    """
+    def get_lookup(self, lookup_name):
+        lookup = VALUE_LOOKUPS.get(lookup_name)
+        if lookup is not None:
+            return lookup
+        return super(JsonValueField, self).get_lookup(lookup_name)
+
+    def get_transform(self, name):
+        transform = super(JsonValueField, self).get_transform(name)
+        if transform is not None:
+            return transform
+        return KeyTransformFactory(name)
+
+
+class KeyTransform(Transform):
+    """
+    Extract a key (or array index) from a JSON document, chained transforms
+    are combined into a single path.
+    """
+    output_field = JsonValueField()
+
+    def __init__(self, key, *args, **kwargs):
+        super(KeyTransform, self).__init__(*args, **kwargs)
+        self.key = key
+
+    def path(self):
+        keys = [self.key]
+        lhs = self.lhs
+        while isinstance(lhs, KeyTransform):
+            keys.insert(0, lhs.key)
+            lhs = lhs.lhs
+        return lhs, keys
+
+    def as_sql(self, compiler, connection):
+        lhs, keys = self.path()
+        lhs_sql, lhs_params = compiler.compile(lhs)
+        return path_sql(connection, lhs_sql, keys, escape=True), lhs_params
+
+
+class KeyTransformFactory(object):
+    def __init__(self, key):
+        self.key = key
+
+    def __call__(self, *args, **kwargs):
+        return KeyTransform(self.key, *args, **kwargs)
+
+
+class JsonLookup(Lookup):
+    """
+    Lookup that handles conversion of the (Python) right hand side itself.
+    """
+    def get_prep_lookup(self):
+        return self.rhs
+
+    def get_db_prep_lookup(self, value, connection):
+        return '%s', [value]
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        vendor_sql = getattr(self, 'sql_%s' % connection.vendor, None)
+        if vendor_sql is None:
+            raise NotImplementedError('JSON lookups are not supported by %s.' % connection.vendor)
+        return vendor_sql(lhs, list(lhs_params))
+
+
+class JsonValueComparison(JsonLookup):
+    """
+    Compare a value extracted from a JSON document.
+    """
+    operator = None
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = json_value_sql(connection, self.rhs)
+        return '%s %s %s' % (lhs, self.operator, rhs), list(lhs_params) + rhs_params
+
+
+class JsonExact(JsonValueComparison):
+    lookup_name = 'exact'
+    operator = '='
+
+
+class JsonGreaterThan(JsonValueComparison):
+    lookup_name = 'gt'
+    operator = '>'
+
+
+class JsonGreaterThanOrEqual(JsonValueComparison):
+    lookup_name = 'gte'
+    operator = '>='
+
+
+class JsonLessThan(JsonValueComparison):
+    lookup_name = 'lt'
+    operator = '<'
+
+
+class JsonLessThanOrEqual(JsonValueComparison):
+    lookup_name = 'lte'
+    operator = '<='
+
+
+class JsonHasKey(JsonLookup):
+    """
+    JSON object has a key.
+    """
+    lookup_name = 'has_key'
+
+    def sql_postgresql(self, lhs, params):
+        return '%s ? %%s' % lhs, params + [six.text_type(self.rhs)]
+
+    def sql_mysql(self, lhs, params):
+        return "JSON_CONTAINS_PATH(%s, 'one', %%s)" % lhs, params + [json_path([self.rhs])]
+
+    def sql_sqlite(self, lhs, params):
+        return 'json_type(%s, %%s) IS NOT NULL' % lhs, params + [json_path([self.rhs])]
+
+
+class JsonContains(JsonLookup):
+    """
+    JSON document contains another document, eg ``{"a": 1, "b": 2}`` contains
+    ``{"a": 1}`` and ``[1, 2, 3]`` contains ``[1, 3]``.
+    """
+    lookup_name = 'contains'
+
+    def sql_postgresql(self, lhs, params):
+        return '%s @> CAST(%%s AS jsonb)' % lhs, params + [_dumps(self.rhs)]
+
+    def sql_mysql(self, lhs, params):
+        return 'JSON_CONTAINS(%s, %%s)' % lhs, params + [_dumps(self.rhs)]
+
+    def sql_sqlite(self, lhs, params):
+        # JSON1 has no containment operator, expand the value into predicates
+        return sqlite_contains(lhs, params, self.rhs)
+
+
+def _sqlite_scalar(value):
+    return int(value) if isinstance(value, bool) else value
+
+
+def sqlite_contains(lhs, lhs_params, value, depth=0):
+    """
+    SQLite predicate for a JSON text expression containing a value.
+    """
+    if isinstance(value, dict):
+        parts = ["json_type(%s) = 'object'" % lhs]
+        params = list(lhs_params)
+        for key, item in value.items():
+            path = json_path([key])
+            if isinstance(item, (dict, list)):
+                sql, item_params = sqlite_contains('json_extract(%s, %%s)' % lhs, lhs_params + [path], item, depth)
+            elif item is None:
+                sql, item_params = "json_type(%s, %%s) = 'null'" % lhs, lhs_params + [path]
+            else:
+                sql, item_params = 'json_extract(%s, %%s) = %%s' % lhs, lhs_params + [path, _sqlite_scalar(item)]
+            parts.append(sql)
+            params.extend(item_params)
+        return '(%s)' % ' AND '.join(parts), params
+
+    if isinstance(value, list):
+        parts = ["json_type(%s) = 'array'" % lhs]
+        params = list(lhs_params)
+        alias = 'json_each_%d' % depth
+        for item in value:
+            if isinstance(item, (dict, list)):
+                condition, item_params = sqlite_contains('%s.value' % alias, [], item, depth + 1)
+            elif item is None:
+                condition, item_params = "%s.type = 'null'" % alias, []
+            else:
+                condition, item_params = '%s.value = %%s' % alias, [_sqlite_scalar(item)]
+            parts.append('EXISTS (SELECT 1 FROM json_each(%s) AS %s WHERE %s)' % (lhs, alias, condition))
+            params.extend(lhs_params + item_params)
+        return '(%s)' % ' AND '.join(parts), params
+
+    # A scalar is contained by an equal scalar or an array with the scalar as an element
+    alias = 'json_each_%d' % depth
+    return (
+        "(json_extract(%s, '$') = %%s OR (json_type(%s) = 'array' AND "
+        "EXISTS (SELECT 1 FROM json_each(%s) AS %s WHERE %s.value = %%s)))" % (lhs, lhs, lhs, alias, alias),
+        lhs_params + [_sqlite_scalar(value)] + lhs_params + lhs_params + [_sqlite_scalar(value)]
+    )
+
+
+DOCUMENT_LOOKUPS = dict((lookup.lookup_name, lookup) for lookup in (JsonContains, JsonHasKey))
+
+VALUE_LOOKUPS = dict((lookup.lookup_name, lookup) for lookup in (
+    JsonExact, JsonGreaterThan, JsonGreaterThanOrEqual, JsonLessThan, JsonLessThanOrEqual, JsonContains, JsonHasKey
+))
+
+
+def path_index_name(connection, model, field, path):
+    """
+    Name of the expression index on a JSON path.
+    """
+    table = model._meta.db_table
+    keys = path_keys(path)
+    digest = hashlib.md5('.'.join(six.text_type(k) for k in keys).encode('utf8')).hexdigest()[:8]
+    max_length = connection.ops.max_name_length() or 200
+    return '%s_%s_%s_json' % (table[:max_length - len(field.column) - 16], field.column, digest)
+
+
+def path_index_sql(connection, model, field, path):
+    """
+    SQL to create an expression index on a JSON path, or None if expression
+    indexes are not supported by the database.
+    """
+    if connection.vendor not in ('postgresql', 'sqlite'):
+        return None
+    expression = path_sql(connection, connection.ops.quote_name(field.column), path_keys(path))
+    if connection.vendor == 'postgresql':
+        expression = '(%s)' % expression
+    return 'CREATE INDEX IF NOT EXISTS %s ON %s (%s)' % (
+        connection.ops.quote_name(path_index_name(connection, model, field, path)),
+        connection.ops.quote_name(model._meta.db_table), expression)
+
+
+def drop_path_index_sql(connection, model, field, path):
+    """
+    SQL to drop an expression index on a JSON path, or None if expression
+    indexes are not supported by the database.
+    """
+    if connection.vendor not in ('postgresql', 'sqlite'):
+        return None
+    return 'DROP INDEX IF EXISTS %s' % connection.ops.quote_name(path_index_name(connection, model, field, path))
@@ -0,0 +1,69 @@
+# -*- coding: UTF-8 -*-
+"""
+Django Extras: db.models.functions
+
+Database functions that modify a JSON document stored in a :class:`JsonField`
+in place (requires Django 1.8+), eg::
+
+    Model.objects.filter(...).update(data=JsonSet('data', 'owner.name', 'alice'))
+
+Functions are supported by PostgreSQL (9.5+), MySQL (5.7+) and SQLite (with
+the JSON1 extension).
+"""
+from django.db.models import Func
+from django_extras.db.models.fields.jsonlookups import _dumps, json_path, path_keys, pg_path
+
+__all__ = ('JsonSet', 'JsonRemove')
+
+
+class JsonFunc(Func):
+    """
+    Function applied to a path of a JSON document.
+    """
+    def __init__(self, expression, path, **extra):
+        super(JsonFunc, self).__init__(expression, **extra)
+        self.keys = path_keys(path)
+
+    def as_sql(self, compiler, connection, *args, **kwargs):
+        vendor_sql = getattr(self, 'sql_%s' % connection.vendor, None)
+        if vendor_sql is None:
+            raise NotImplementedError('JSON functions are not supported by %s.' % connection.vendor)
+        lhs, lhs_params = compiler.compile(self.get_source_expressions()[0])
+        return vendor_sql(lhs, list(lhs_params))
+
+
+class JsonSet(JsonFunc):
+    """
+    Set the value at a path of a JSON document, eg ``JsonSet('data', 'a.b', 1)``.
+
+    Array elements are addressed by index (eg ``'tags.0'``). On PostgreSQL
+    only the last key of a path is created if it does not exist.
+    """
+    def __init__(self, expression, path, value, **extra):
+        super(JsonSet, self).__init__(expression, path, **extra)
+        self.value = value
+
+    def sql_postgresql(self, lhs, params):
+        return 'jsonb_set(CAST(%s AS jsonb), CAST(%%s AS text[]), CAST(%%s AS jsonb), true)' % lhs, \
+            params + [pg_path(self.keys), _dumps(self.value)]
+
+    def sql_mysql(self, lhs, params):
+        return 'JSON_SET(%s, %%s, CAST(%%s AS JSON))' % lhs, params + [json_path(self.keys), _dumps(self.value)]
+
+    def sql_sqlite(self, lhs, params):
+        # json() marks the value as JSON rather than a string
+        return 'json_set(%s, %%s, json(%%s))' % lhs, params + [json_path(self.keys), _dumps(self.value)]
+
+
+class JsonRemove(JsonFunc):
+    """
+    Remove the value at a path of a JSON document, eg ``JsonRemove('data', 'a.b')``.
+    """
+    def sql_postgresql(self, lhs, params):
+        return '(CAST(%s AS jsonb) #- CAST(%%s AS text[]))' % lhs, params + [pg_path(self.keys)]
+
+    def sql_mysql(self, lhs, params):
+        return 'JSON_REMOVE(%s, %%s)' % lhs, params + [json_path(self.keys)]
+
+    def sql_sqlite(self, lhs, params):
+        return 'json_remove(%s, %%s)' % lhs, params + [json_path(self.keys)]
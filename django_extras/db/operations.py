@@ -0,0 +1,51 @@
+# -*- coding: UTF-8 -*-
+"""
+Django Extras: db.operations
+
+Migration operations (requires Django 1.8+).
+"""
+from django.db.migrations.operations.base import Operation
+from django_extras.db.models.fields.jsonlookups import drop_path_index_sql, path_index_sql
+
+__all__ = ('AddJsonPathIndex', )
+
+
+class AddJsonPathIndex(Operation):
+    """
+    Create an expression index on a path of a native :class:`JsonField`, eg::
+
+        operations = [
+            AddJsonPathIndex('document', 'data', 'owner.name'),
+        ]
+
+    The index is dropped when the migration is reversed. Databases that do not
+    support expression indexes (PostgreSQL 9.5+ and SQLite do) are skipped.
+    """
+    reduces_to_sql = True
+    reversible = True
+
+    def __init__(self, model_name, name, path):
+        self.model_name = model_name
+        self.name = name
+        self.path = path
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def _execute(self, sql_func, app_label, schema_editor, state):
+        model = state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        field = model._meta.get_field(self.name)
+        sql = sql_func(schema_editor.connection, model, field, self.path)
+        if sql:
+            schema_editor.execute(sql)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self._execute(path_index_sql, app_label, schema_editor, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        self._execute(drop_path_index_sql, app_label, schema_editor, from_state)
+
+    def describe(self):
+        return 'Create index on JSON path %s of %s.%s' % (self.path, self.model_name, self.name)
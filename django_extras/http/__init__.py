@@ -1,7 +1,15 @@
+import hashlib
 import six
 import os.path
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.http import *  # noqa
-from email.utils import formatdate as format_http_date
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe
+from six.moves.urllib.parse import quote
+from django_extras.http import compression
+from django_extras.utils import jsoncodec
 
 
 class HttpResponseCreated(HttpResponse):
@@ -123,32 +131,272 @@ class HttpResponseInsufficientStorage(HttpResponse):
     status_code = 507
 
 
-class FileResponse(HttpResponse):
+def _etag_matches(header, etag):
+    """
+    Check if an If-None-Match header matches an ETag (using weak comparison).
+    """
+    for value in header.split(','):
+        value = value.strip()
+        if value == '*' or (value[2:] if value.startswith('W/') else value) == etag:
+            return True
+    return False
+
+
+def _parse_range(header, size):
+    """
+    Parse a Range header into an inclusive (start, end) byte range.
+
+    Returns None if the header should be ignored (it is malformed or requests
+    multiple ranges) and False if the range can not be satisfied.
+    """
+    unit, _, ranges = header.partition('=')
+    if unit.strip() != 'bytes' or ',' in ranges:
+        return None
+    start, _, end = ranges.strip().partition('-')
+    try:
+        if not start:
+            # Suffix range, the last N bytes
+            length = int(end)
+            if length <= 0 or size == 0:
+                return False
+            return max(size - length, 0), size - 1
+        start = int(start)
+        end = int(end) if end else None
+    except ValueError:
+        return None
+    if end is not None and end < start:
+        return None
+    if start >= size:
+        return False
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+def _read_chunks(f, chunk_size, length=None):
+    while length is None or length > 0:
+        data = f.read(chunk_size if length is None else min(chunk_size, length))
+        if not data:
+            break
+        if length is not None:
+            length -= len(data)
+        yield data
+
+
+class FileResponse(StreamingHttpResponse):
     """
     Response object that handles files
+
+    The file is streamed in chunks of ``chunk_size`` bytes (or passed to the
+    ``wsgi.file_wrapper`` of the server), as a streaming response there is no
+    ``content`` attribute. If the ``DJANGO_EXTRAS_SENDFILE``
+    setting is defined (``'x-sendfile'`` or ``'x-accel-redirect'``) files
+    within ``DJANGO_EXTRAS_SENDFILE_ROOT`` are sent by the web server.
+
+    If the ``request`` is supplied conditional requests are answered with a
+    304 response and byte range requests with a 206 partial content response.
+    If ``precompressed`` is also set a compressed copy of the file (eg
+    ``name.txt.gz``, see :mod:`django_extras.http.compression`) is sent to
+    clients that accept the encoding.
     """
-    def __init__(self, content, content_type, include_last_modified=True):
+    chunk_size = 64 * 1024
+
+    def __init__(self, content, content_type, include_last_modified=True, request=None, chunk_size=None,
+                 precompressed=False, **kwargs):
+        super(FileResponse, self).__init__(content_type=content_type, **kwargs)
+        if chunk_size is not None:
+            self.chunk_size = chunk_size
+        # Used by wsgi.file_wrapper
+        self.block_size = self.chunk_size
+
         if isinstance(content, six.string_types):
-            f = open(content, 'rb')
+            path, f = content, None
         else:
-            f = content
-        super(FileResponse, self).__init__(f, content_type=content_type)
+            path, f = getattr(content, 'name', None), content
+            self._closable_objects.append(f)
+        if not isinstance(path, six.string_types):
+            path = None
+
+        if precompressed and path is not None:
+            patch_vary_headers(self, ('Accept-Encoding', ))
+            if request is not None:
+                encoding = compression.negotiate(
+                    request.META.get('HTTP_ACCEPT_ENCODING'),
+                    [e for e in compression.ENCODINGS if e in compression.SUFFIXES and
+                     os.path.isfile(path + compression.SUFFIXES[e])])
+                if encoding is not None:
+                    path, f = path + compression.SUFFIXES[encoding], None
+                    self['Content-Encoding'] = encoding
 
-        if include_last_modified:
-            modified = os.path.getmtime(f.name)
-            self['Last-Modified'] = format_http_date(timeval=modified, localtime=True)
+        try:
+            stat = os.stat(path) if f is None else os.fstat(f.fileno())
+        except (AttributeError, EnvironmentError, ValueError):
+            # File like objects without a file descriptor (eg BytesIO)
+            stat = None
+        if stat is not None:
+            self['Accept-Ranges'] = 'bytes'
+            self['ETag'] = '"%x-%x"' % (int(stat.st_mtime), stat.st_size)
+            if include_last_modified:
+                self['Last-Modified'] = http_date(stat.st_mtime)
+
+        if path is not None and self._sendfile(path):
+            return
+
+        if request is not None and stat is not None:
+            if self._not_modified(request, stat):
+                self.status_code = 304
+                return
+            byte_range = self._byte_range(request, stat.st_size)
+            if byte_range is False:
+                self.status_code = 416
+                self['Content-Range'] = 'bytes */%d' % stat.st_size
+                return
+        else:
+            byte_range = None
+
+        if f is None:
+            f = open(path, 'rb')
+            self._closable_objects.append(f)
+        if byte_range is None:
+            if stat is not None:
+                self['Content-Length'] = str(stat.st_size)
+            self.file_to_stream = f
+            self.streaming_content = _read_chunks(f, self.chunk_size)
+        else:
+            start, end = byte_range
+            self.status_code = HttpResponsePartialContent.status_code
+            self['Content-Range'] = 'bytes %d-%d/%d' % (start, end, stat.st_size)
+            self['Content-Length'] = str(end - start + 1)
+            f.seek(start)
+            self.streaming_content = _read_chunks(f, self.chunk_size, end - start + 1)
+
+    def _sendfile(self, path):
+        """
+        Hand the file to the web server if a sendfile backend is configured.
+        """
+        backend = getattr(settings, 'DJANGO_EXTRAS_SENDFILE', None)
+        if not backend:
+            return False
+        path = os.path.abspath(path)
+        root = getattr(settings, 'DJANGO_EXTRAS_SENDFILE_ROOT', None)
+        if root:
+            root = os.path.join(os.path.abspath(root), '')
+            if not path.startswith(root):
+                return False
+        if backend == 'x-sendfile':
+            self['X-Sendfile'] = path
+        elif backend == 'x-accel-redirect':
+            if not root:
+                raise ImproperlyConfigured('DJANGO_EXTRAS_SENDFILE_ROOT is required by x-accel-redirect.')
+            url = getattr(settings, 'DJANGO_EXTRAS_SENDFILE_URL', '/')
+            relative = path[len(root):].replace(os.sep, '/')
+            self['X-Accel-Redirect'] = url.rstrip('/') + '/' + quote(relative.encode('utf8'))
+        else:
+            raise ImproperlyConfigured('Unknown sendfile backend %r.' % backend)
+        return True
+
+    def _not_modified(self, request, stat):
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            return _etag_matches(if_none_match, self['ETag'])
+        if_modified_since = request.META.get('HTTP_IF_MODIFIED_SINCE')
+        if if_modified_since is not None:
+            if_modified_since = parse_http_date_safe(if_modified_since.split(';')[0])
+            return if_modified_since is not None and int(stat.st_mtime) <= if_modified_since
+        return False
+
+    def _byte_range(self, request, size):
+        header = request.META.get('HTTP_RANGE')
+        if header is None:
+            return None
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if if_range is not None and if_range.strip() not in (self['ETag'], self.get('Last-Modified')):
+            # Resource has changed, send the whole file
+            return None
+        return _parse_range(header, size)
 
 
 class JsonResponse(HttpResponse):
     """
     Response object that handles JSON encoding and sets the correct content type.
-    """
-    def __init__(self, data, content_type='application/json', **kwargs):
-        try:
-            import json
-        except ImportError:
-            from django.utils import simplejson as json
-        from django.core.serializers.json import DjangoJSONEncoder
 
-        super(JsonResponse, self).__init__(json.dumps(data, cls=DjangoJSONEncoder),
-                                           content_type=content_type, **kwargs)
+    If ``etag`` is set an ETag is generated from a hash of the content, or
+    from ``version`` (eg a modification timestamp) if supplied. If the
+    ``request`` is supplied and its If-None-Match header matches a 304 response
+    is returned, when a ``version`` is supplied this happens before the data
+    is encoded (``data`` can be a callable to avoid building it).
+    """
+    def __init__(self, data, content_type='application/json', etag=False, version=None, request=None, **kwargs):
+        if_none_match = None if request is None else request.META.get('HTTP_IF_NONE_MATCH')
+
+        tag = None
+        content = b''
+        if version is not None:
+            tag = '"%s"' % hashlib.md5(six.text_type(version).encode('utf8')).hexdigest()
+        if tag is None or if_none_match is None or not _etag_matches(if_none_match, tag):
+            if callable(data):
+                data = data()
+            content = jsoncodec.dumps_bytes(data)
+            if tag is None and etag:
+                tag = '"%s"' % hashlib.md5(content).hexdigest()
+
+        super(JsonResponse, self).__init__(content, content_type=content_type, **kwargs)
+        if tag is not None:
+            self['ETag'] = tag
+            if if_none_match is not None and _etag_matches(if_none_match, tag):
+                self.status_code = 304
+                self.content = b''
+                del self['Content-Type']
+
+
+class StreamingJsonResponse(StreamingHttpResponse):
+    """
+    Response object that encodes an iterable (eg a generator or queryset) as a
+    JSON array, or newline delimited JSON if ``ndjson`` is set, while the
+    response is sent.
+
+    Querysets are read with ``iterator()`` so results are not cached, the
+    optional ``transform`` callable is applied to each item before it is
+    encoded. Encoded items are buffered into chunks of about ``chunk_size``
+    bytes.
+    """
+    chunk_size = 64 * 1024
+
+    def __init__(self, data, content_type=None, ndjson=False, transform=None, chunk_size=None, **kwargs):
+        if content_type is None:
+            content_type = 'application/x-ndjson' if ndjson else 'application/json'
+        if hasattr(data, 'iterator'):
+            data = data.iterator()
+        if chunk_size is not None:
+            self.chunk_size = chunk_size
+        super(StreamingJsonResponse, self).__init__(
+            self._encode(data, ndjson, transform), content_type=content_type, **kwargs)
+
+    def _encode(self, data, ndjson, transform):
+        dumps_bytes = jsoncodec.get_codec().dumps_bytes
+        chunk_size = self.chunk_size
+        if ndjson:
+            start, separator, end = b'', b'\n', b'\n'
+        else:
+            start, separator, end = b'[', b',', b']'
+
+        chunk = [start]
+        size = 0
+        first = True
+        for item in data:
+            if transform is not None:
+                item = transform(item)
+            item = dumps_bytes(item)
+            if first:
+                first = False
+            else:
+                chunk.append(separator)
+            chunk.append(item)
+            size += len(item) + 1
+            if size >= chunk_size:
+                yield b''.join(chunk)
+                chunk = []
+                size = 0
+        if ndjson and first:
+            # No items, an empty body
+            end = b''
+        chunk.append(end)
+        yield b''.join(chunk)
@@ -0,0 +1,253 @@
+# -*- coding: UTF-8 -*-
+"""
+Django Extras: http.compression
+
+Content-Encoding negotiation and compression of individual responses.
+
+gzip and deflate are always available, br (brotli) and zstd are available if
+the brotli_ or zstandard_ packages are installed. Use the
+:func:`compress_page` decorator (or :func:`compress_response`) on views that
+return compressible content::
+
+    @compress_page
+    def export(request):
+        return StreamingJsonResponse(Item.objects.values())
+
+.. _brotli: https://pypi.org/project/Brotli/
+.. _zstandard: https://pypi.org/project/zstandard/
+"""
+import re
+import zlib
+from functools import wraps
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+__all__ = ('available_encodings', 'negotiate', 'compress_response', 'compress_page')
+
+# Responses smaller than this are not compressed.
+MIN_SIZE = 1024
+
+# Content types that are compressed (a type ending in / matches any subtype).
+CONTENT_TYPES = (
+    'text/',
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'application/xml',
+    'application/xhtml+xml',
+    'image/svg+xml',
+)
+
+# Preferred encoding first.
+ENCODINGS = ('br', 'zstd', 'gzip', 'deflate')
+
+# File name suffix of precompressed files.
+SUFFIXES = {
+    'br': '.br',
+    'zstd': '.zst',
+    'gzip': '.gz',
+}
+
+# Headers of responses whose body is sent by the web server (see FileResponse).
+SENDFILE_HEADERS = ('X-Sendfile', 'X-Accel-Redirect')
+
+re_accept_encoding = re.compile(r'^\s*([^\s;]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*$')
+
+
+class ZlibCompressor(object):
+    """
+    Incremental gzip or deflate (zlib format) compressor.
+    """
+    def __init__(self, gzip=True, level=6):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS if gzip else zlib.MAX_WBITS)
+
+    def compress(self, data):
+        return self._obj.compress(data)
+
+    def flush(self):
+        # Emit everything compressed so far so streamed content is not delayed
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._obj.flush()
+
+
+class BrotliCompressor(object):
+    def __init__(self, quality=5):
+        self._obj = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._obj.process(data)
+
+    def flush(self):
+        return self._obj.flush()
+
+    def finish(self):
+        return self._obj.finish()
+
+
+class ZstdCompressor(object):
+    def __init__(self, level=3):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._obj.compress(data)
+
+    def flush(self):
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._obj.flush()
+
+
+def available_encodings():
+    """
+    Content encodings that are supported, preferred encoding first.
+    """
+    return tuple(e for e in ENCODINGS if (e != 'br' or brotli) and (e != 'zstd' or zstandard))
+
+
+def get_compressor(encoding):
+    if encoding == 'gzip':
+        return ZlibCompressor()
+    if encoding == 'deflate':
+        return ZlibCompressor(gzip=False)
+    if encoding == 'br':
+        return BrotliCompressor()
+    if encoding == 'zstd':
+        return ZstdCompressor()
+    raise ValueError('Unsupported content encoding %r.' % encoding)
+
+
+def negotiate(accept_encoding, encodings=None):
+    """
+    Select a content encoding from an Accept-Encoding header.
+
+    :param accept_encoding: Value of the Accept-Encoding header.
+    :param encodings: Encodings to select from in order of preference,
+        defaults to :func:`available_encodings`.
+    :return: Encoding or None if the content should not be encoded.
+    """
+    if not accept_encoding:
+        return None
+    if encodings is None:
+        encodings = available_encodings()
+
+    weights = {}
+    for value in accept_encoding.split(','):
+        match = re_accept_encoding.match(value)
+        if match is None:
+            continue
+        coding, q = match.groups()
+        try:
+            weights[coding.lower()] = float(q) if q else 1.0
+        except ValueError:
+            continue
+
+    best, best_weight = None, 0
+    for encoding in encodings:
+        weight = weights.get(encoding, weights.get('*', 0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def _compressible(content_type, content_types):
+    content_type = content_type.split(';')[0].strip().lower()
+    for allowed in content_types:
+        if content_type == allowed or (allowed.endswith('/') and content_type.startswith(allowed)):
+            return True
+    return False
+
+
+def _compress_stream(compressor, content):
+    for chunk in content:
+        data = compressor.compress(chunk)
+        if chunk:
+            data += compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def compress_response(request, response, min_size=MIN_SIZE, content_types=CONTENT_TYPES, encodings=None):
+    """
+    Compress a response with the best encoding accepted by the client.
+
+    Only successful responses with an allowed content type (and at least
+    ``min_size`` bytes if the size is known) that are not already encoded or
+    sent by the web server (``X-Sendfile`` or ``X-Accel-Redirect``) are
+    compressed. Streaming responses are compressed incrementally.
+
+    :return: The response.
+    """
+    if response.status_code != 200 or response.has_header('Content-Encoding'):
+        return response
+    if any(response.has_header(header) for header in SENDFILE_HEADERS):
+        # The file is sent by the web server, not the (empty) content
+        return response
+    if not _compressible(response.get('Content-Type', ''), content_types):
+        return response
+    # The content depends on the Accept-Encoding header even if not compressed.
+    patch_vary_headers(response, ('Accept-Encoding', ))
+    if 'no-transform' in response.get('Cache-Control', ''):
+        return response
+
+    streaming = getattr(response, 'streaming', False)
+    if streaming:
+        length = response.get('Content-Length')
+        if length is not None and length.isdigit() and int(length) < min_size:
+            return response
+    elif len(response.content) < min_size:
+        return response
+
+    encoding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''), encodings)
+    if encoding is None:
+        return response
+    compressor = get_compressor(encoding)
+
+    if streaming:
+        response.streaming_content = _compress_stream(compressor, response.streaming_content)
+        # The file can no longer be sent by the server directly.
+        response.file_to_stream = None
+        if response.has_header('Content-Length'):
+            del response['Content-Length']
+    else:
+        content = compressor.compress(response.content) + compressor.finish()
+        if len(content) >= len(response.content):
+            return response
+        response.content = content
+        response['Content-Length'] = str(len(content))
+
+    if response.has_header('ETag'):
+        # Content is no longer byte for byte identical
+        etag = response['ETag']
+        if not etag.startswith('W/'):
+            response['ETag'] = 'W/' + etag
+    response['Content-Encoding'] = encoding
+    return response
+
+
+def compress_page(view_func=None, **options):
+    """
+    View decorator that compresses the response (see :func:`compress_response`
+    for options), eg ``@compress_page`` or ``@compress_page(min_size=200)``.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(request, *args, **kwargs):
+            return compress_response(request, func(request, *args, **kwargs), **options)
+        return wrapper
+
+    if view_func is not None:
+        return decorator(view_func)
+    return decorator
@@ -0,0 +1,235 @@
+import hmac
+import itertools
+import os
+import random
+import re
+import sys
+import threading
+import time
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.encoding import force_bytes
+
+try:
+    import cProfile as profile
+except ImportError:
+    import profile
+
+try:
+    from django.utils.deprecation import MiddlewareMixin
+except ImportError:
+    # Django < 1.10
+    MiddlewareMixin = object
+
+__all__ = ('ProfilingMiddleware', 'StackSampler')
+
+PROFILE_EXTENSIONS = ('.prof', '.collapsed')
+
+_local = threading.local()
+_sequence = itertools.count()
+
+
+class CProfiler(object):
+    """
+    Deterministic profiler, results are written as a pstats dump.
+    """
+    extension = '.prof'
+
+    def __init__(self, interval=None):
+        self._profile = profile.Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+
+    def write(self, path):
+        self._profile.dump_stats(path)
+
+
+class StackSampler(object):
+    """
+    Statistical profiler that samples the stack of the current thread every
+    ``interval`` seconds from a background thread, results are written as
+    collapsed stacks (the input format of flamegraph.pl and speedscope).
+    """
+    extension = '.collapsed'
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = {}
+        self._thread_id = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread_id = threading.current_thread().ident
+        self._thread = threading.Thread(target=self._run, name='StackSampler')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        current_frames = sys._current_frames
+        stacks = self.stacks
+        while not self._stopped.wait(self.interval):
+            frame = current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append('%s (%s:%d)' % (code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                key = ';'.join(s.replace(';', ':') for s in reversed(stack))
+                stacks[key] = stacks.get(key, 0) + 1
+
+    def collapsed(self):
+        return ''.join('%s %d\n' % item for item in sorted(self.stacks.items()))
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            f.write(self.collapsed())
+
+
+PROFILERS = {
+    'cprofile': CProfiler,
+    'sampler': StackSampler,
+}
+
+
+class ProfilingMiddleware(MiddlewareMixin):
+    """
+    Profiles a sample of requests and writes the results to a directory.
+
+    Requests are profiled if they are randomly selected (at the rate defined by
+    ``DJANGO_EXTRAS_PROFILING_RATE``), include the profiling header or are made
+    by a user with the profiling flag. Unsampled requests only pay for the
+    sampling decision.
+
+    Profiling is disabled unless ``DJANGO_EXTRAS_PROFILING_DIR`` is defined.
+    The profiling header must contain ``DJANGO_EXTRAS_PROFILING_TOKEN``.
+    """
+    REQUEST_ATTR = '_profiler'
+
+    def _config(self):
+        config = getattr(self, '_profiling_config', None)
+        if config is None:
+            pattern = getattr(settings, 'DJANGO_EXTRAS_PROFILING_URL_PATTERN', None)
+            header = getattr(settings, 'DJANGO_EXTRAS_PROFILING_HEADER', None)
+            token = getattr(settings, 'DJANGO_EXTRAS_PROFILING_TOKEN', None)
+            if header and not token:
+                # Any client could otherwise force requests to be profiled
+                raise ImproperlyConfigured('DJANGO_EXTRAS_PROFILING_TOKEN is required to use '
+                                           'DJANGO_EXTRAS_PROFILING_HEADER.')
+            config = self._profiling_config = {
+                'directory': getattr(settings, 'DJANGO_EXTRAS_PROFILING_DIR', None),
+                'rate': getattr(settings, 'DJANGO_EXTRAS_PROFILING_RATE', 0),
+                'pattern': re.compile(pattern) if pattern else None,
+                'header': 'HTTP_' + header.upper().replace('-', '_') if header else None,
+                'token': force_bytes(token) if token else None,
+                'user_flag': getattr(settings, 'DJANGO_EXTRAS_PROFILING_USER_FLAG', None),
+                'profiler': PROFILERS[getattr(settings, 'DJANGO_EXTRAS_PROFILING_MODE', 'cprofile')],
+                'interval': getattr(settings, 'DJANGO_EXTRAS_PROFILING_INTERVAL', 0.005),
+                'max_bytes': getattr(settings, 'DJANGO_EXTRAS_PROFILING_MAX_BYTES', 100 * 1024 * 1024),
+            }
+        return config
+
+    def should_profile(self, request, config):
+        """
+        Decide if a request is profiled.
+        """
+        header = config['header']
+        if header is not None and header in request.META:
+            if hmac.compare_digest(force_bytes(request.META[header]), config['token']):
+                return True
+        if config['rate'] and random.random() < config['rate']:
+            pattern = config['pattern']
+            if pattern is None or pattern.search(request.path):
+                return True
+        user_flag = config['user_flag']
+        if user_flag is not None:
+            user = getattr(request, 'user', None)
+            if user is not None and getattr(user, user_flag, False):
+                return True
+        return False
+
+    def process_request(self, request):
+        config = self._config()
+        if not config['directory']:
+            return
+        previous = getattr(_local, 'profiler', None)
+        if previous is not None:
+            # A previous request did not complete processing
+            self._stop(previous)
+        if not self.should_profile(request, config):
+            return
+
+        profiler = config['profiler'](config['interval'])
+        try:
+            profiler.start()
+        except ValueError:
+            # Another profiler is active (Python 3.12+ allows a single profiler)
+            return
+        _local.profiler = profiler
+        setattr(request, self.REQUEST_ATTR, (profiler, time.time()))
+
+    def process_response(self, request, response):
+        value = getattr(request, self.REQUEST_ATTR, None)
+        if value is None:
+            return response
+        profiler, start = value
+        delattr(request, self.REQUEST_ATTR)
+        self._stop(profiler)
+
+        config = self._config()
+        path = os.path.join(config['directory'], self.file_name(request, start, time.time() - start) +
+                            profiler.extension)
+        if not os.path.isdir(config['directory']):
+            os.makedirs(config['directory'])
+        profiler.write(path)
+        rotate(config['directory'], config['max_bytes'])
+        return response
+
+    def _stop(self, profiler):
+        profiler.stop()
+        if getattr(_local, 'profiler', None) is profiler:
+            del _local.profiler
+
+    def file_name(self, request, start, duration):
+        """
+        Name (without extension) of the file a profile is written to.
+        """
+        path = re.sub(r'[^A-Za-z0-9]+', '_', request.path).strip('_')[:80] or 'root'
+        return '%s-%s-%s-%dms-%d-%d' % (
+            time.strftime('%Y%m%dT%H%M%S', time.localtime(start)), request.method, path, duration * 1000,
+            os.getpid(), next(_sequence))
+
+
+def rotate(directory, max_bytes):
+    """
+    Delete the oldest profiles in a directory until the total size is at most
+    ``max_bytes``.
+    """
+    files = []
+    for name in os.listdir(directory):
+        if name.endswith(PROFILE_EXTENSIONS):
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Removed by another process
+                continue
+            files.append((stat.st_mtime, name, stat.st_size, path))
+    total = sum(f[2] for f in files)
+    for _, _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
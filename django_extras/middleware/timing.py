@@ -1,21 +1,216 @@
+import threading
 import time
+from contextlib import contextmanager
+from importlib import import_module
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from django_extras.utils.histogram import LatencyRecorder, prometheus_text
 
+try:
+    from django.utils.deprecation import MiddlewareMixin
+except ImportError:
+    # Django < 1.10
+    MiddlewareMixin = object
 
-class TimingMiddleware(object):
+__all__ = ('TimingMiddleware', 'RequestTimer', 'current_timer', 'time_phase', 'latency', 'latency_metrics')
+
+if hasattr(time, 'perf_counter_ns'):
+    now_ns = time.perf_counter_ns
+elif hasattr(time, 'perf_counter'):
+    def now_ns():
+        return int(time.perf_counter() * 1000000000)
+else:
+    def now_ns():
+        return int(time.time() * 1000000000)
+
+_local = threading.local()
+
+# Request latency by URL name and method of requests timed by TimingMiddleware.
+latency = LatencyRecorder()
+
+METHODS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'))
+
+_exporters = {}
+
+
+def _get_exporter(path):
+    try:
+        return _exporters[path]
+    except KeyError:
+        module, _, name = path.rpartition('.')
+        exporter = _exporters[path] = getattr(import_module(module), name)
+        return exporter
+
+
+def latency_metrics(request):
+    """
+    View that returns request latency percentiles in the Prometheus text
+    format.
+    """
+    return HttpResponse(prometheus_text(latency.summaries()), content_type='text/plain; version=0.0.4')
+
+
+class RequestTimer(object):
+    """
+    Time spent in each phase of processing a request, in nanoseconds.
+    """
+    def __init__(self):
+        self.start = now_ns()
+        self.phases = {}
+        self.counts = {}
+        self.view_start = None
+
+    def add(self, phase, duration, count=1):
+        self.phases[phase] = self.phases.get(phase, 0) + duration
+        self.counts[phase] = self.counts.get(phase, 0) + count
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        """
+        Database execute wrapper (see ``connection.execute_wrapper()``) that
+        records query time.
+        """
+        start = now_ns()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.add('db', now_ns() - start)
+
+
+def current_timer():
+    """
+    Timer of the request being processed by the current thread (or None).
+    """
+    return getattr(_local, 'timer', None)
+
+
+@contextmanager
+def time_phase(phase):
+    """
+    Record the time spent in a block as a phase of the current request, eg::
+
+        with time_phase('cache'):
+            value = cache.get(key)
+
+    The phase is included in the Server-Timing header. Blocks outside of a
+    request timed by :class:`TimingMiddleware` are not recorded.
+    """
+    timer = current_timer()
+    if timer is None:
+        yield
+        return
+    start = now_ns()
+    try:
+        yield
+    finally:
+        timer.add(phase, now_ns() - start)
+
+
+class TimingMiddleware(MiddlewareMixin):
     """
     Appends the X-PROCESSING_TIME_MS header to all responses.
 
-    This value is the total time spent processing a user request in microseconds.
+    This value is the total time spent processing a user request in milliseconds.
+
+    A Server-Timing header is also added that breaks the total time down into
+    the view, template rendering (of a TemplateResponse), database queries
+    (Django 2.0+), other middleware and any phases recorded with
+    :func:`time_phase` (eg cache).
+
+    The latency of each request is recorded in the :data:`latency` histogram
+    by URL name and method, if the ``DJANGO_EXTRAS_LATENCY_EXPORTER`` setting
+    is defined the callable it names is called with latency summaries every
+    ``DJANGO_EXTRAS_LATENCY_EXPORT_INTERVAL`` seconds (default 60).
     """
-    REQUEST_ATTR = '_timing_start'
+    REQUEST_ATTR = '_timing'
     RESPONSE_HEADER = 'X-PROCESSING_TIME_MS'
+    SERVER_TIMING_HEADER = 'Server-Timing'
+    SERVER_TIMING = True
+    RECORDER = latency
 
     def process_request(self, request):
-        setattr(request, self.REQUEST_ATTR, time.clock())
+        previous = current_timer()
+        if previous is not None:
+            # A previous request did not complete processing
+            self._finish(previous)
+        timer = RequestTimer()
+        setattr(request, self.REQUEST_ATTR, timer)
+        _local.timer = timer
+        for connection in connections.all():
+            if hasattr(connection, 'execute_wrappers'):
+                connection.execute_wrappers.append(timer.db_wrapper)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timer = getattr(request, self.REQUEST_ATTR, None)
+        if timer is not None:
+            timer.view_start = now_ns()
+
+    def process_template_response(self, request, response):
+        timer = getattr(request, self.REQUEST_ATTR, None)
+        if timer is not None:
+            self._end_view(timer)
+            render_start = now_ns()
+
+            def rendered(response):
+                timer.add('render', now_ns() - render_start)
+            response.add_post_render_callback(rendered)
+        return response
 
     def process_response(self, request, response):
-        start = getattr(request, self.REQUEST_ATTR, None)
-        if start:
-            length = time.clock() - start
-            response[self.RESPONSE_HEADER] = "%i" % (length * 1000)
+        timer = getattr(request, self.REQUEST_ATTR, None)
+        if timer is None:
+            return response
+
+        total = now_ns() - timer.start
+        self._end_view(timer)
+        self._finish(timer)
+
+        response[self.RESPONSE_HEADER] = "%i" % (total // 1000000)
+        if self.SERVER_TIMING:
+            response[self.SERVER_TIMING_HEADER] = self.server_timing(timer, total)
+        if self.RECORDER is not None:
+            self.RECORDER.record(self.latency_key(request), total // 1000)
+            exporter = getattr(settings, 'DJANGO_EXTRAS_LATENCY_EXPORTER', None)
+            if exporter:
+                self.RECORDER.export(_get_exporter(exporter),
+                                     getattr(settings, 'DJANGO_EXTRAS_LATENCY_EXPORT_INTERVAL', 60))
         return response
+
+    def latency_key(self, request):
+        """
+        Key latency is recorded under, the URL name (or None if the URL was not
+        resolved) and method.
+        """
+        match = getattr(request, 'resolver_match', None)
+        url_name = None
+        if match is not None:
+            url_name = getattr(match, 'view_name', None) or match.url_name
+        method = request.method if request.method in METHODS else 'OTHER'
+        return url_name, method
+
+    def _end_view(self, timer):
+        if timer.view_start is not None:
+            timer.add('view', now_ns() - timer.view_start)
+            timer.view_start = None
+
+    def _finish(self, timer):
+        for connection in connections.all():
+            if timer.db_wrapper in getattr(connection, 'execute_wrappers', ()):
+                connection.execute_wrappers.remove(timer.db_wrapper)
+        if current_timer() is timer:
+            del _local.timer
+
+    def server_timing(self, timer, total):
+        """
+        Generate the value of the Server-Timing header (durations are in
+        milliseconds).
+        """
+        phases = timer.phases
+        middleware = total - phases.get('view', 0) - phases.get('render', 0)
+        metrics = ['total;dur=%.3f' % (total / 1000000.0), 'middleware;dur=%.3f' % (max(middleware, 0) / 1000000.0)]
+        for phase in sorted(phases):
+            metric = '%s;dur=%.3f' % (phase, phases[phase] / 1000000.0)
+            if phase == 'db':
+                metric += ';desc="%d queries"' % timer.counts[phase]
+            metrics.append(metric)
+        return ', '.join(metrics)
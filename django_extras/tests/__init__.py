@@ -1,9 +1,18 @@
 from django_extras.tests.contrib.auth import *
+from django_extras.tests.core.conversion import *
 from django_extras.tests.core.types import *
 from django_extras.tests.core.validators import *
+from django_extras.tests.db.aggregates import *
 from django_extras.tests.db.choices import *
+from django_extras.tests.db.fields import *
+from django_extras.tests.db.functions import *
+from django_extras.tests.db.operations import *
 from django_extras.tests.forms.fields import *
+from django_extras.tests.http.compression import *
 from django_extras.tests.http.responses import *
+from django_extras.tests.middleware.profiling import *
 from django_extras.tests.middleware.timing import *
 from django_extras.tests.utils.cache import *
+from django_extras.tests.utils.histogram import *
 from django_extras.tests.utils.humanize import *
+from django_extras.tests.utils.jsoncodec import *
@@ -109,7 +109,7 @@ class SingleOwner(SingleOwnerMixin, models.Model):
     description = models.TextField()
 
     class Meta:
-        app_label = 'auth'
+        app_label = 'django_extras'
 
 
 class MultiOwner(MultipleOwnerMixin, models.Model):
@@ -117,7 +117,7 @@ class MultiOwner(MultipleOwnerMixin, models.Model):
     description = models.TextField()
 
     class Meta:
-        app_label = 'auth'
+        app_label = 'django_extras'
 
 
 class OwnerMixinManagerTestCase(test.TransactionTestCase):
@@ -0,0 +1,124 @@
+import json
+import os
+import tempfile
+from decimal import Decimal
+from django import test
+from django_extras.core.conversion import CurrencyConverter, DictRateSource, JsonFileRateSource
+from django_extras.core.types import Money, MoneyArray, get_currency
+
+AUD = get_currency('AUD')
+USD = get_currency('USD')
+JPY = get_currency('JPY')
+
+RATES = {
+    'USD': '1',
+    'AUD': '1.5',
+    'JPY': '150',
+}
+
+
+class Timer(object):
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingRateSource(DictRateSource):
+    def __init__(self, rates, version=None):
+        super(CountingRateSource, self).__init__(rates)
+        self.loads = 0
+        self._version = version
+
+    def load(self):
+        self.loads += 1
+        return super(CountingRateSource, self).load()
+
+    def version(self):
+        return self._version
+
+
+class CurrencyConverterTestCase(test.TestCase):
+    def setUp(self):
+        self.target = CurrencyConverter(DictRateSource(RATES))
+
+    def test_convert(self):
+        self.assertEqual(Money('15', AUD), self.target.convert(Money('10', USD), AUD))
+        self.assertEqual(Money('1000', JPY), self.target.convert(Money('10', AUD), 'JPY'))
+
+    def test_convert_same_currency(self):
+        value = Money('10', USD)
+
+        self.assertIs(value, self.target.convert(value, USD))
+
+    def test_convert_unknown_rate(self):
+        self.assertRaises(ValueError, lambda: self.target.convert(Money('10', USD), 'NZD'))
+
+    def test_convert_many(self):
+        actual = self.target.convert_many([Money('10', USD), Money('3', AUD), Money('150', JPY)], AUD)
+
+        self.assertEqual([Money('15', AUD), Money('3', AUD), Money('1.5', AUD)], actual)
+
+    def test_convert_many_money_array(self):
+        actual = self.target.convert_many(MoneyArray([1000, 25], USD), JPY)
+
+        self.assertIs(JPY, actual.currency)
+        self.assertEqual([1500, 38], actual.units)
+
+    def test_sum(self):
+        actual = self.target.sum([Money('10', USD), Money('3', AUD), Money('150', JPY)], USD)
+
+        self.assertEqual(Money('13', USD), actual)
+
+    def test_cache_ttl(self):
+        source = CountingRateSource(RATES)
+        timer = Timer()
+        target = CurrencyConverter(source, ttl=60, timer=timer)
+
+        target.convert(Money('10', USD), AUD)
+        target.convert(Money('10', USD), AUD)
+        self.assertEqual(1, source.loads)
+
+        timer.now = 61
+        target.convert(Money('10', USD), AUD)
+        self.assertEqual(2, source.loads)
+
+    def test_cache_version_unchanged(self):
+        source = CountingRateSource(RATES, version=1)
+        timer = Timer()
+        target = CurrencyConverter(source, ttl=60, timer=timer)
+
+        target.get_table()
+        timer.now = 61
+        target.get_table()
+        self.assertEqual(1, source.loads)
+
+        source._version = 2
+        timer.now = 122
+        target.get_table()
+        self.assertEqual(2, source.loads)
+
+    def test_invalidate(self):
+        source = CountingRateSource(RATES)
+        target = CurrencyConverter(source)
+
+        target.get_table()
+        target.invalidate()
+        target.get_table()
+        self.assertEqual(2, source.loads)
+
+
+class JsonFileRateSourceTestCase(test.TestCase):
+    def test_load(self):
+        fd, path = tempfile.mkstemp(suffix='.json')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'base': 'USD', 'rates': RATES}, f)
+            target = JsonFileRateSource(path)
+
+            self.assertEqual(RATES, target.load())
+            self.assertIsNotNone(target.version())
+            self.assertEqual(Decimal('1.5'), CurrencyConverter(target).get_table().factor('USD', 'AUD'))
+        finally:
+            os.remove(path)
@@ -1,7 +1,9 @@
 #coding=UTF-8
+import pickle
 from decimal import Decimal
 from django import test
-from django_extras.core.types import Currency, Money, latitude, longitude, decimal_value
+from django_extras.core.types import Currency, NoCurrency, Money, MoneyAccumulator, MoneyArray, MoneyFormatter, \
+    get_currency, get_money_formatter, register_currency, latitude, longitude, decimal_value
 
 
 class ToDecimalTestCase(test.TestCase):
@@ -35,6 +37,45 @@ class ToDecimalTestCase(test.TestCase):
         self.assertIs(in_value, out_value)
 
 
+class CurrencyRegistryTestCase(test.TestCase):
+    def test_get_by_code(self):
+        target = get_currency('AUD')
+
+        self.assertEqual('AUD', target.code)
+        self.assertEqual(36, target.number)
+        self.assertEqual(2, target.decimal_digits)
+        self.assertIs(target, get_currency('aud'))
+
+    def test_get_by_number(self):
+        self.assertIs(get_currency('JPY'), get_currency(392))
+        self.assertEqual(0, get_currency(392).decimal_digits)
+
+    def test_no_currency(self):
+        self.assertIs(NoCurrency, get_currency('XXX'))
+        self.assertIs(NoCurrency, get_currency(999))
+
+    def test_unknown(self):
+        self.assertRaises(KeyError, lambda: get_currency('ABC'))
+        self.assertRaises(KeyError, lambda: get_currency(1))
+
+    def test_register_currency(self):
+        target = register_currency(Currency('XBT', 1001, 'Bitcoin', decimal_digits=8))
+
+        self.assertIs(target, get_currency('XBT'))
+        self.assertIs(target, register_currency(Currency('XBT', 1001, 'Bitcoin', decimal_digits=8)))
+        self.assertIs(get_currency('USD'), register_currency(Currency('USD', 840, 'US Dollar')))
+
+    def test_equality(self):
+        self.assertEqual(get_currency('AUD'), Currency('AUD', 36, "Australian Dollar", '$'))
+        self.assertNotEqual(get_currency('AUD'), get_currency('NZD'))
+        self.assertEqual(hash(get_currency('AUD')), hash(Currency('AUD', 36, "Australian Dollar", '$')))
+
+    def test_pickle_interned(self):
+        target = get_currency('EUR')
+
+        self.assertIs(target, pickle.loads(pickle.dumps(target)))
+
+
 #TODO: Add more tests to get complete coverage
 class MoneyTestCase(test.TestCase):
 
@@ -68,6 +109,10 @@ class MoneyTestCase(test.TestCase):
         self.assertEqual('p123,456.79', self.FORMAT_POSITIVE.format(positive_sign="p"))
         self.assertEqual('n12,345.68', self.FORMAT_NEGATIVE.format(negative_sign="n"))
 
+    def test_format_small_value(self):
+        self.assertEqual('0.05', Money('0.05').format())
+        self.assertEqual('-0.0050', Money('-0.005').format(places=4))
+
     def test_format_trailing_negative(self):
         self.assertEqual('123,456.79', self.FORMAT_POSITIVE.format(trailing_negative=" neg"))
         self.assertEqual('-12,345.68 neg', self.FORMAT_NEGATIVE.format(trailing_negative=" neg"))
@@ -89,6 +134,170 @@ class MoneyTestCase(test.TestCase):
         self.assertFalse(Money('123.4567') == Money('765.4321'))
         self.assertFalse(Money('123.4567', self.AUD) == Money('123.4567', self.NZD))
 
+    def test_arithmetic_keeps_currency(self):
+        a = Money('10.50', self.AUD)
+        b = Money('2.25', self.AUD)
+        self.assertIs(self.AUD, (a + b).currency)
+        self.assertIs(self.AUD, (a - 1).currency)
+        self.assertIs(self.AUD, (a * 2).currency)
+        self.assertIs(self.AUD, (10 % a).currency)
+        self.assertIs(self.AUD, (-a).currency)
+        self.assertIs(self.AUD, abs(a).currency)
+        self.assertEqual(Money('12.75', self.AUD), a + b)
+        self.assertEqual(Money('8.25', self.AUD), a - b)
+
+    def test_arithmetic_currencies_do_not_match(self):
+        self.assertRaises(ValueError, lambda: Money('1', self.AUD) + Money('1', self.NZD))
+        self.assertRaises(ValueError, lambda: Money('1', self.AUD) - Money('1', self.NZD))
+
+    def test_reverse_sub(self):
+        self.assertEqual(Money('-90'), 10 - Money('100'))
+
+    def test_div(self):
+        self.assertEqual(Money('25'), Money('100') / 4)
+        self.assertRaises(TypeError, lambda: Money('100') / Money('4'))
+
+    def test_sum(self):
+        self.assertEqual(Money('3.75', self.AUD), sum([Money('1.50', self.AUD), Money('2.25', self.AUD)]))
+
+    def test_hash(self):
+        self.assertEqual(hash(Decimal('100')), hash(self.SMALL))
+
+
+class MoneyAccumulatorTestCase(test.TestCase):
+    AUD = Currency('AUD', 36, 'Australian Dollar', '$')
+    NZD = Currency('NZD', 554, 'New Zealand Dollar', '$')
+
+    def test_empty(self):
+        target = MoneyAccumulator().total()
+        self.assertEqual(Money('0'), target)
+        self.assertIs(NoCurrency, target.currency)
+
+    def test_adopts_currency(self):
+        target = MoneyAccumulator()
+        target += Money('1.50', self.AUD)
+        target += 2
+        self.assertIs(self.AUD, target.currency)
+        self.assertEqual(Money('3.50', self.AUD), target.total())
+
+    def test_extend(self):
+        target = MoneyAccumulator(self.AUD, start=1).extend([Money('1.50', self.AUD), '2.25'])
+        self.assertEqual(Money('4.75', self.AUD), target.total())
+
+    def test_currencies_do_not_match(self):
+        target = MoneyAccumulator(self.AUD)
+        self.assertRaises(ValueError, target.add, Money('1', self.NZD))
+        target.extend([Money('1', self.AUD)])
+        self.assertRaises(ValueError, target.extend, [Money('2', self.AUD), Money('1', self.NZD)])
+        self.assertEqual(Money('3', self.AUD), target.total())
+
+
+class MoneyFormatterTestCase(test.TestCase):
+    def test_format_decimal(self):
+        target = MoneyFormatter(currency_symbol='$')
+
+        self.assertEqual('$1,234.50', target.format(Decimal('1234.5')))
+        self.assertEqual('-$0.01', target.format(Decimal('-0.005001')))
+
+    def test_format_no_places(self):
+        target = MoneyFormatter(places=0, separator='.', decimal_place=',')
+
+        self.assertEqual('1.234.568', target.format(Money('1234567.89')))
+
+    def test_format_many(self):
+        target = MoneyFormatter(separator=' ', trailing_negative=' CR')
+
+        self.assertEqual(['1 234.50', '-2.00 CR'], target.format_many([Money('1234.5'), Money(-2)]))
+
+    def test_get_money_formatter_cached(self):
+        self.assertIs(get_money_formatter(places=3), get_money_formatter(places=3))
+        self.assertIsNot(get_money_formatter(places=3), get_money_formatter(places=4))
+
+
+class MoneyArrayTestCase(test.TestCase):
+    AUD = Currency('AUD', 36, "Australian Dollar", '$')
+    NZD = Currency('NZD', 554, "New Zealand Dollar", '$')
+
+    def test_from_money(self):
+        target = MoneyArray.from_money([Money('1.50', self.AUD), Money('2.255', self.AUD)])
+
+        self.assertIs(self.AUD, target.currency)
+        self.assertEqual([150, 226], target.units)
+
+    def test_from_money_mixed_currencies(self):
+        self.assertRaises(ValueError, lambda: MoneyArray.from_money([Money('1', self.AUD), Money('1', self.NZD)]))
+
+    def test_to_money(self):
+        target = MoneyArray([150, -25], self.AUD)
+
+        self.assertEqual([Money('1.50', self.AUD), Money('-0.25', self.AUD)], target.to_money())
+
+    def test_sum(self):
+        target = MoneyArray([150, 225, -100], self.AUD)
+
+        self.assertEqual(Money('2.75', self.AUD), target.sum())
+
+    def test_add(self):
+        target = MoneyArray([150, 225], self.AUD)
+
+        self.assertEqual([300, 450], (target + target).units)
+        self.assertEqual([250, 325], (target + Money(1, self.AUD)).units)
+        self.assertRaises(ValueError, lambda: target + Money(1, self.NZD))
+
+    def test_sub(self):
+        target = MoneyArray([150, 225], self.AUD)
+
+        self.assertEqual([0, 0], (target - target).units)
+        self.assertEqual([50, 125], (target - 1).units)
+        self.assertEqual([-50, -125], (1 - target).units)
+
+    def test_mul(self):
+        target = MoneyArray([150, 225], self.AUD)
+
+        self.assertEqual([300, 450], (target * 2).units)
+        self.assertEqual([75, 112], (target * Decimal('0.5')).units)
+        self.assertRaises(TypeError, lambda: target * Money(1))
+
+    def test_percentage(self):
+        target = MoneyArray([50000, 105], self.AUD)
+
+        self.assertEqual([5000, 10], (10 % target).units)
+
+    def test_comparison(self):
+        target = MoneyArray([150, 225], self.AUD)
+
+        self.assertEqual([False, True], list(target > Money(2, self.AUD)))
+        self.assertEqual([True, False], list(target == Money('1.5', self.AUD)))
+
+    def test_comparison_exact(self):
+        target = MoneyArray.from_money([Money('1.00', self.AUD), Money('1.01', self.AUD)])
+
+        self.assertEqual([False, False], list(target == Money('1.005', self.AUD)))
+        self.assertEqual([True, True], list(target != Money('1.005', self.AUD)))
+        self.assertEqual([True, False], list(target < Money('1.005', self.AUD)))
+        self.assertEqual([True, False], list(target <= Money('1.005', self.AUD)))
+        self.assertEqual([False, True], list(target > Money('1.005', self.AUD)))
+        self.assertEqual([False, True], list(target >= Money('1.005', self.AUD)))
+        self.assertEqual([False, False], list(target < Money('-1.005', self.AUD)))
+
+    def test_add_not_representable(self):
+        target = MoneyArray([150, 225], self.AUD)
+
+        self.assertRaises(ValueError, lambda: target + Money('0.005', self.AUD))
+
+    def test_overflow(self):
+        target = MoneyArray([2 ** 62, 2 ** 62], self.AUD, places=0)
+
+        self.assertEqual(Money(2 ** 63, self.AUD), target.sum())
+        self.assertRaises(OverflowError, lambda: target + target)
+        self.assertRaises(OverflowError, lambda: -target - target - target)
+        self.assertRaises(OverflowError, lambda: (2 ** 62) - (-target))
+
+    def test_format(self):
+        target = MoneyArray([12345679, -5], self.AUD)
+
+        self.assertEqual(['$123,456.79', '-$0.05'], target.format(currency_symbol='$'))
+
 
 class LatitudeTestCase(test.TestCase):
     def testEmpty(self):
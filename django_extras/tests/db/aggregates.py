@@ -0,0 +1,113 @@
+from decimal import Decimal
+from django import test
+from django.db import connection, models
+from django_extras.core.types import Money, NoCurrency, get_currency
+from django_extras.db.models import MoneyField, MoneyAvg, MoneyMax, MoneySum, aggregate_by_currency
+
+
+class AggregateModel(models.Model):
+    amount = MoneyField()
+    units = MoneyField(storage='integer')
+
+    class Meta:
+        app_label = 'django_extras'
+
+
+class CurrencyAggregateModel(models.Model):
+    amount = MoneyField(with_currency=True, default_currency='AUD')
+    units = MoneyField(storage='integer', with_currency=True)
+
+    class Meta:
+        app_label = 'django_extras'
+
+
+class MoneyAggregateTestCase(test.TestCase):
+    def resolve(self, aggregate):
+        return aggregate.resolve_expression(AggregateModel.objects.all().query, summarize=True)
+
+    def test_currency(self):
+        self.assertIs(NoCurrency, MoneySum('amount').currency)
+        self.assertIs(get_currency('AUD'), MoneySum('amount', currency='AUD').currency)
+        self.assertIs(get_currency('AUD'), MoneySum('amount', currency=get_currency('AUD')).currency)
+
+    def test_convert_decimal_storage(self):
+        target = self.resolve(MoneySum('amount', currency='AUD'))
+        actual = target.convert_value(Decimal('12.5'), None, connection, None)
+
+        self.assertEqual(Money('12.5', get_currency('AUD')), actual)
+
+    def test_convert_integer_storage(self):
+        target = self.resolve(MoneySum('units'))
+
+        self.assertEqual(Money('12.5'), target.convert_value(125000, None, connection, None))
+
+    def test_convert_integer_storage_average(self):
+        target = self.resolve(MoneyAvg('units'))
+
+        self.assertEqual(Money('1.25'), target.convert_value(12500.0, None, connection, None))
+
+    def test_convert_none(self):
+        target = self.resolve(MoneySum('amount'))
+
+        self.assertIsNone(target.convert_value(None, None, connection, None))
+
+
+class MoneyAggregateQueryTestCase(test.TestCase):
+    def setUp(self):
+        AggregateModel.objects.create(amount=Money('1.25'), units=Money('10.5'))
+        AggregateModel.objects.create(amount=Money('2.5'), units=Money('0.25'))
+        for amount, currency in (('1.5', 'AUD'), ('2.25', 'AUD'), ('3', 'NZD')):
+            currency = get_currency(currency)
+            CurrencyAggregateModel.objects.create(amount=Money(amount, currency), units=Money(amount, currency))
+
+    def test_aggregate(self):
+        actual = AggregateModel.objects.aggregate(
+            amount=MoneySum('amount', currency='AUD'), units=MoneySum('units'), average=MoneyAvg('units'))
+
+        self.assertEqual(Money('3.75', get_currency('AUD')), actual['amount'])
+        self.assertIs(get_currency('AUD'), actual['amount'].currency)
+        self.assertEqual(Money('10.75'), actual['units'])
+        self.assertEqual(Money('5.375'), actual['average'])
+
+    def test_aggregate_empty(self):
+        actual = AggregateModel.objects.filter(pk=None).aggregate(amount=MoneySum('amount'))
+
+        self.assertIsNone(actual['amount'])
+
+    def test_annotate(self):
+        actual = dict(CurrencyAggregateModel.objects.order_by().values('units_currency').annotate(
+            total=MoneyMax('units')).values_list('units_currency', 'total'))
+
+        self.assertEqual({get_currency('AUD'): Money('2.25'), get_currency('NZD'): Money('3')}, actual)
+
+    def test_mixed_currencies(self):
+        queryset = CurrencyAggregateModel.objects.all()
+
+        self.assertRaises(ValueError, lambda: queryset.aggregate(total=MoneySum('amount')))
+        self.assertRaises(ValueError, lambda: queryset.values('units_currency').aggregate(total=MoneySum('amount')))
+        self.assertRaises(ValueError, lambda: queryset.values('units_currency').annotate(total=MoneySum('amount')))
+
+    def test_single_currency(self):
+        actual = CurrencyAggregateModel.objects.filter(amount_currency='AUD').aggregate(
+            total=MoneySum('amount', currency='AUD'))
+
+        self.assertEqual(Money('3.75', get_currency('AUD')), actual['total'])
+
+    def test_aggregate_by_currency(self):
+        actual = aggregate_by_currency(CurrencyAggregateModel.objects.all(), 'amount')
+
+        self.assertEqual({get_currency('AUD'): Money('3.75', get_currency('AUD')),
+                          get_currency('NZD'): Money('3', get_currency('NZD'))}, actual)
+        self.assertIs(get_currency('NZD'), actual[get_currency('NZD')].currency)
+
+    def test_aggregate_by_currency_integer_storage(self):
+        actual = aggregate_by_currency(CurrencyAggregateModel.objects.filter(units__gt=Money('2')), 'units', MoneyAvg)
+
+        self.assertEqual({get_currency('AUD'): Money('2.25', get_currency('AUD')),
+                          get_currency('NZD'): Money('3', get_currency('NZD'))}, actual)
+
+    def test_aggregate_by_currency_without_currency_field(self):
+        actual = aggregate_by_currency(AggregateModel.objects.all(), 'amount')
+
+        self.assertEqual({NoCurrency: Money('3.75')}, actual)
+        self.assertEqual({}, aggregate_by_currency(AggregateModel.objects.filter(pk=None), 'amount'))
@@ -1,6 +1,7 @@
+import pickle
 from django import test
 from django.db.models.fields import NOT_PROVIDED
-from django_extras.db.models.choices import ChoiceEnum
+from django_extras.db.models.choices import ChoiceEnum, FrozenChoiceEnum
 
 
 class ChoicesTestCase(test.TestCase):
@@ -131,3 +132,77 @@ class ChoicesTestCase(test.TestCase):
             OPTION_ONE=('value', 'Verbose value'),
             OPTION_TWO=('value2', 'Verbose value 2', True, 1)
         ))
+
+    def test_lookups(self):
+        target = ChoiceEnum(
+            ('OPTION_ONE', (1, 'Verbose value')),
+            ('OPTION_TWO', (2, 'Verbose value 2', True)),  # Default, the value can be anything ;)
+        )
+
+        self.assertEqual(((1, 'Verbose value'), (2, 'Verbose value 2')), target.choices)
+        self.assertEqual('OPTION_TWO', target.key_for(2))
+        self.assertEqual(1, target.index_of(2))
+        self.assertEqual('Verbose value', target.display_for('OPTION_ONE'))
+        self.assertRaises(KeyError, target.key_for, 3)
+        self.assertRaises(KeyError, target.index_of, 3)
+
+
+class FrozenChoicesTestCase(test.TestCase):
+    def get_target(self):
+        return FrozenChoiceEnum(
+            ('OPTION_ONE', (1, 'Verbose value')),
+            ('OPTION_TWO', (2, 'Verbose value 2', True)),  # Default, the value can be anything ;)
+            ('default', (3, 'Default')),
+        )
+
+    def test_attributes_generated(self):
+        target = self.get_target()
+
+        self.assertEqual(1, type(target).__dict__['OPTION_ONE'])
+        self.assertEqual('Verbose value 2', type(target).__dict__['OPTION_TWO__display'])
+        self.assertEqual(1, target.OPTION_ONE)
+        self.assertEqual('Verbose value 2', target.OPTION_TWO__display)
+
+    def test_attributes_not_shared(self):
+        target = self.get_target()
+        other = FrozenChoiceEnum(OPTION_ONE=(4, 'Other'))
+
+        self.assertEqual(1, target.OPTION_ONE)
+        self.assertEqual(4, other.OPTION_ONE)
+        self.assertFalse('OPTION_TWO__display' in type(other).__dict__)
+
+    def test_colliding_key(self):
+        target = self.get_target()
+
+        self.assertEqual(2, target.default)
+        self.assertEqual('default', target.key_for(3))
+        self.assertEqual('Default', target.display_for('default'))
+
+    def test_lookups(self):
+        target = self.get_target()
+
+        self.assertEqual(((1, 'Verbose value'), (2, 'Verbose value 2'), (3, 'Default')), target.choices)
+        self.assertEqual([(1, 'Verbose value'), (2, 'Verbose value 2'), (3, 'Default')], list(target))
+        self.assertEqual('OPTION_TWO', target.key_for(2))
+        self.assertEqual(2, target.index_of(3))
+        self.assertEqual('Verbose value', target % 1)
+        self.assertTrue(3 in target)
+        self.assertFalse(4 in target)
+
+    def test_freeze(self):
+        target = ChoiceEnum(
+            ('OPTION_ONE', ('value', 'Verbose value')),
+            ('OPTION_TWO', ('value2', 'Verbose value 2', True)),  # Default, the value can be anything ;)
+        ).freeze()
+
+        self.assertTrue(isinstance(target, FrozenChoiceEnum))
+        self.assertEqual('value2', target.OPTION_TWO)
+        self.assertEqual('value2', target.default)
+        self.assertEqual(6, target.max_length)
+        self.assertIs(target, target.freeze())
+
+    def test_pickle(self):
+        target = pickle.loads(pickle.dumps(self.get_target()))
+
+        self.assertEqual(1, target.OPTION_ONE)
+        self.assertEqual(2, target.default)
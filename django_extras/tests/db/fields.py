@@ -0,0 +1,710 @@
+import copy
+import json
+from decimal import Decimal
+from unittest import skipIf
+from django import test
+from django.core.exceptions import ValidationError
+from django.db import connection, models
+from django_extras.core.types import Money, NoCurrency, get_currency
+from django_extras.db.models import ChoiceEnum, ChoiceField, ChoiceFlagsField, CurrencyField, JsonField, MoneyField
+from django_extras.db.models.fields.jsonfield import JsonCompressed, JsonDict, JsonDirtyFieldsMixin, JsonList, \
+    JsonText, compress, create_path_indexes, decompress
+
+try:
+    import lzma
+except ImportError:
+    # Python 2
+    lzma = None
+
+STATUS = ChoiceEnum(
+    ('ACTIVE', ('active', 'Active', True)),
+    ('PENDING', ('pending', 'Pending')),
+    ('CLOSED', ('closed', 'Closed')),
+)
+
+FLAGS = ChoiceEnum(
+    ('FEATURED', ('featured', 'Featured')),
+    ('PINNED', ('pinned', 'Pinned')),
+    ('HIDDEN', ('hidden', 'Hidden')),
+)
+
+
+class PlainMoneyModel(models.Model):
+    amount = MoneyField()
+    units = MoneyField(storage='integer', null=True)
+
+    class Meta:
+        app_label = 'django_extras'
+
+
+class MoneyModel(models.Model):
+    name = models.CharField(max_length=20, blank=True)
+    amount = MoneyField(with_currency=True, default_currency='AUD')
+
+    class Meta:
+        app_label = 'django_extras'
+
+
+class LazyMoneyModel(models.Model):
+    amount = MoneyField(lazy=True, null=True)
+
+    class Meta:
+        app_label = 'django_extras'
+
+
+class ChoiceModel(models.Model):
+    status = ChoiceField(STATUS)
+
+    class Meta:
+        app_label = 'django_extras'
+
+
+class FlagsModel(models.Model):
+    flags = ChoiceFlagsField(FLAGS)
+
+    class Meta:
+        app_label = 'django_extras'
+
+
+class NativeJsonModel(models.Model):
+    data = JsonField(native=True, path_indexes=['tags', 'owner.name'])
+
+    class Meta:
+        app_label = 'django_extras'
+
+
+class LazyJsonModel(models.Model):
+    data = JsonField(lazy=True)
+
+    class Meta:
+        app_label = 'django_extras'
+
+
+class CompressedJsonModel(models.Model):
+    data = JsonField(compress='zlib', compress_threshold=100)
+
+    class Meta:
+        app_label = 'django_extras'
+
+
+class LazyCompressedJsonModel(models.Model):
+    data = JsonField(lazy=True, compress='zlib', compress_threshold=100)
+
+    class Meta:
+        app_label = 'django_extras'
+
+
+class TrackedJsonModel(JsonDirtyFieldsMixin, models.Model):
+    name = models.CharField(max_length=20)
+    data = JsonField()
+
+    class Meta:
+        app_label = 'django_extras'
+
+
+class MoneyFieldTestCase(test.TestCase):
+    def test_invalid_storage(self):
+        self.assertRaises(ValueError, lambda: MoneyField(storage='float'))
+
+    def test_decimal_storage(self):
+        target = MoneyField()
+
+        self.assertEqual('DecimalField', target.get_internal_type())
+        self.assertEqual(Decimal('12.3456'), target.get_prep_value(Money('12.3456')))
+        self.assertEqual(Money('12.3456'), target.from_db_value(Decimal('12.3456'), None, connection, None))
+
+    def test_integer_storage(self):
+        target = MoneyField(storage='integer')
+
+        self.assertEqual('BigIntegerField', target.get_internal_type())
+        self.assertEqual(123456, target.get_prep_value(Money('12.3456')))
+        self.assertEqual(-15000, target.get_db_prep_save('-1.5', connection))
+        self.assertEqual(Money('12.3456'), target.from_db_value(123456, None, connection, None))
+
+    def test_integer_storage_decimal_places(self):
+        target = MoneyField(storage='integer', decimal_places=2)
+
+        self.assertEqual(1235, target.get_prep_value(Money('12.3451')))
+        self.assertEqual(Money('12.34'), target.from_db_value(1234, None, connection, None))
+
+    def test_from_db_value_none(self):
+        self.assertIsNone(MoneyField(storage='integer').from_db_value(None, None, connection, None))
+
+    def test_save_and_load(self):
+        pk = PlainMoneyModel.objects.create(amount=Money('12.3456'), units='-1.5').pk
+        target = PlainMoneyModel.objects.get(pk=pk)
+
+        self.assertIsInstance(target.amount, Money)
+        self.assertEqual(Money('12.3456'), target.amount)
+        self.assertEqual(Money('-1.5'), target.units)
+
+    def test_save_changed(self):
+        target = PlainMoneyModel.objects.create(amount=Money('1'))
+        target.amount = Money('2.5')
+        target.units = None
+        target.save()
+
+        actual = PlainMoneyModel.objects.get(pk=target.pk)
+        self.assertEqual(Money('2.5'), actual.amount)
+        self.assertIsNone(actual.units)
+
+
+class CurrencyFieldTestCase(test.TestCase):
+    def test_to_python(self):
+        target = CurrencyField()
+
+        self.assertIs(get_currency('AUD'), target.to_python('AUD'))
+        self.assertIs(get_currency('AUD'), target.to_python(36))
+        self.assertIs(get_currency('AUD'), target.to_python('036'))
+        self.assertIsNone(target.to_python(None))
+        self.assertRaises(ValidationError, lambda: target.to_python('ABC'))
+
+    def test_get_prep_value(self):
+        target = CurrencyField()
+
+        self.assertEqual(36, target.get_prep_value(get_currency('AUD')))
+        self.assertEqual(999, target.get_prep_value(NoCurrency))
+
+    def test_from_db_value(self):
+        self.assertIs(get_currency('NZD'), CurrencyField().from_db_value(554, None, connection, None))
+
+
+class MoneyFieldWithCurrencyTestCase(test.TestCase):
+    def test_currency_field_added(self):
+        field_names = [f.name for f in MoneyModel._meta.fields]
+
+        self.assertEqual(['id', 'name', 'amount', 'amount_currency'], field_names)
+
+    def test_currency_field_distinct(self):
+        currency_field = MoneyModel._meta.get_field('amount_currency')
+
+        self.assertNotEqual(MoneyModel._meta.get_field('name'), currency_field)
+        self.assertNotEqual(MoneyModel._meta.get_field('amount'), currency_field)
+
+    def test_default_currency(self):
+        target = MoneyModel(amount='12.50')
+
+        self.assertEqual(Money('12.50', get_currency('AUD')), target.amount)
+        self.assertIs(get_currency('AUD'), target.amount.currency)
+
+    def test_assign_money(self):
+        target = MoneyModel(amount=Money('12.50', get_currency('NZD')))
+
+        self.assertIs(get_currency('NZD'), target.amount_currency)
+        self.assertIs(get_currency('NZD'), target.amount.currency)
+
+    def test_change_currency(self):
+        target = MoneyModel(amount=Money('12.50', get_currency('NZD')))
+        target.amount_currency = get_currency('USD')
+
+        self.assertEqual(Money('12.50', get_currency('USD')), target.amount)
+
+    def test_from_db_value_returns_amount(self):
+        target = MoneyModel._meta.get_field('amount')
+
+        self.assertEqual(Decimal('1.5'), target.from_db_value(Decimal('1.5'), None, connection, None))
+
+    def test_save_and_load(self):
+        pk = MoneyModel.objects.create(amount=Money('12.50', get_currency('NZD'))).pk
+        target = MoneyModel.objects.get(pk=pk)
+
+        self.assertEqual(Money('12.50', get_currency('NZD')), target.amount)
+        self.assertIs(get_currency('NZD'), target.amount.currency)
+
+    def test_save_changed_currency(self):
+        target = MoneyModel.objects.create(amount='12.50')
+        target.amount = Money('3', get_currency('USD'))
+        target.save()
+
+        actual = MoneyModel.objects.get(pk=target.pk)
+        self.assertEqual(Money('3', get_currency('USD')), actual.amount)
+
+    def test_defer_other_field(self):
+        pk = MoneyModel.objects.create(name='a', amount=Money('12.50', get_currency('NZD'))).pk
+        target = MoneyModel.objects.defer('name').get(pk=pk)
+
+        self.assertIn('amount_currency', target.__dict__)
+        self.assertEqual(Money('12.50', get_currency('NZD')), target.amount)
+
+    def test_only_amount(self):
+        pk = MoneyModel.objects.create(amount=Money('12.50', get_currency('NZD'))).pk
+        target = MoneyModel.objects.only('amount').get(pk=pk)
+
+        self.assertIs(get_currency('NZD'), target.amount.currency)
+        target.amount = Money('3', get_currency('NZD'))
+        target.save()
+        self.assertEqual(Money('3', get_currency('NZD')), MoneyModel.objects.get(pk=pk).amount)
+
+    def test_defer_currency(self):
+        pk = MoneyModel.objects.create(amount=Money('12.50', get_currency('NZD'))).pk
+        target = MoneyModel.objects.defer('amount_currency').get(pk=pk)
+
+        self.assertEqual(Money('12.50', get_currency('NZD')), target.amount)
+        self.assertIs(get_currency('NZD'), target.amount.currency)
+
+    def test_defer_amount(self):
+        pk = MoneyModel.objects.create(amount=Money('12.50', get_currency('NZD'))).pk
+        target = MoneyModel.objects.defer('amount', 'amount_currency').get(pk=pk)
+
+        self.assertEqual(Money('12.50', get_currency('NZD')), target.amount)
+
+    def test_values_return_amount(self):
+        MoneyModel.objects.create(amount=Money('12.50', get_currency('NZD')))
+
+        amount, currency = MoneyModel.objects.values_list('amount', 'amount_currency').get()
+        self.assertNotIsInstance(amount, Money)
+        self.assertEqual(Decimal('12.50'), amount)
+        self.assertIs(get_currency('NZD'), currency)
+
+
+class LazyMoneyFieldTestCase(test.TestCase):
+    def test_from_db_value_returns_amount(self):
+        target = LazyMoneyModel._meta.get_field('amount')
+
+        self.assertEqual(Decimal('1.5'), target.from_db_value(Decimal('1.5'), None, connection, None))
+
+    def test_hydrated_on_access(self):
+        target = LazyMoneyModel(amount=Decimal('1.5'))
+        self.assertEqual(Decimal('1.5'), target.__dict__['amount'])
+
+        actual = target.amount
+        self.assertIsInstance(actual, Money)
+        self.assertEqual(Money('1.5'), actual)
+        self.assertIs(actual, target.amount)
+
+    def test_assign_money(self):
+        value = Money('1.5', get_currency('AUD'))
+        target = LazyMoneyModel(amount=value)
+
+        self.assertIs(value, target.amount)
+
+    def test_none(self):
+        self.assertIsNone(LazyMoneyModel(amount=None).amount)
+
+    def test_save_and_load(self):
+        pk = LazyMoneyModel.objects.create(amount=Money('1.5')).pk
+        target = LazyMoneyModel.objects.get(pk=pk)
+        self.assertNotIsInstance(target.__dict__['amount'], Money)
+
+        actual = target.amount
+        self.assertIsInstance(actual, Money)
+        self.assertEqual(Money('1.5'), actual)
+
+        target.amount = Money('2.25')
+        target.save()
+        self.assertEqual(Money('2.25'), LazyMoneyModel.objects.get(pk=pk).amount)
+
+    def test_deferred(self):
+        pk = LazyMoneyModel.objects.create(amount=Money('1.5')).pk
+        target = LazyMoneyModel.objects.defer('amount').get(pk=pk)
+
+        self.assertEqual(Money('1.5'), target.amount)
+
+    def test_values_return_amount(self):
+        LazyMoneyModel.objects.create(amount=Money('1.5'))
+
+        actual = LazyMoneyModel.objects.values_list('amount', flat=True).get()
+        self.assertNotIsInstance(actual, Money)
+        self.assertEqual(Decimal('1.5'), actual)
+
+
+class ChoiceFieldTestCase(test.TestCase):
+    def test_codes(self):
+        target = ChoiceField(STATUS)
+
+        self.assertEqual('PositiveSmallIntegerField', target.get_internal_type())
+        self.assertEqual(1, target.get_prep_value('active'))
+        self.assertEqual(3, target.get_prep_value('closed'))
+        self.assertEqual('pending', target.from_db_value(2, None, connection, None))
+        self.assertEqual(4, target.from_db_value(4, None, connection, None))
+        self.assertEqual('active', target.get_default())
+
+    def test_explicit_codes(self):
+        target = ChoiceField(STATUS, codes={'active': 10, 'pending': 20, 'closed': 0})
+
+        self.assertEqual(0, target.get_prep_value('closed'))
+        self.assertEqual('pending', target.from_db_value(20, None, connection, None))
+
+    def test_invalid_codes(self):
+        self.assertRaises(ValueError, lambda: ChoiceField(STATUS, codes={'active': 1, 'pending': 2}))
+        self.assertRaises(ValueError, lambda: ChoiceField(STATUS, codes={'active': 1, 'pending': 1, 'closed': 2}))
+        self.assertRaises(ValueError, lambda: ChoiceField(STATUS, codes={'active': 1, 'pending': 2, 'closed': -1}))
+
+    def test_invalid_value(self):
+        target = ChoiceField(STATUS)
+
+        self.assertRaises(ValueError, lambda: target.get_prep_value('unknown'))
+        self.assertRaises(ValidationError, lambda: target.to_python('unknown'))
+        self.assertEqual('closed', target.to_python('closed'))
+
+    def test_deconstruct(self):
+        name, path, args, kwargs = ChoiceField(STATUS).deconstruct()
+        target = ChoiceField(*args, **kwargs)
+
+        self.assertEqual({'active': 1, 'pending': 2, 'closed': 3}, kwargs['codes'])
+        self.assertNotIn('choices', kwargs)
+        self.assertEqual(list(STATUS), list(target.enum))
+        self.assertEqual('active', target.get_default())
+
+    def test_lookups(self):
+        ChoiceModel.objects.create(status=STATUS.ACTIVE)
+        ChoiceModel.objects.create(status=STATUS.CLOSED)
+        ChoiceModel.objects.create(status=STATUS.CLOSED)
+
+        self.assertEqual(2, ChoiceModel.objects.filter(status='closed').count())
+        self.assertEqual(3, ChoiceModel.objects.filter(status__in=['active', 'closed']).count())
+        self.assertEqual(['active', 'closed', 'closed'],
+                         list(ChoiceModel.objects.order_by('pk').values_list('status', flat=True)))
+        self.assertEqual('Closed', ChoiceModel.objects.filter(status='closed')[0].get_status_display())
+
+        cursor = connection.cursor()
+        cursor.execute('SELECT status FROM %s ORDER BY id' % ChoiceModel._meta.db_table)
+        self.assertEqual([1, 3, 3], [row[0] for row in cursor.fetchall()])
+
+
+class ChoiceFlagsFieldTestCase(test.TestCase):
+    def test_masks(self):
+        target = ChoiceFlagsField(FLAGS)
+
+        self.assertEqual('BigIntegerField', target.get_internal_type())
+        self.assertEqual(5, target.get_prep_value({'featured', 'hidden'}))
+        self.assertEqual(2, target.get_prep_value(['pinned']))
+        self.assertEqual(2, target.get_prep_value('pinned'))
+        self.assertEqual(0, target.get_prep_value(set()))
+        self.assertEqual({'featured', 'hidden'}, target.from_db_value(5, None, connection, None))
+        self.assertEqual({'pinned'}, target.from_db_value(2 | 64, None, connection, None))
+        self.assertEqual(set(), target.get_default())
+
+    def test_explicit_bits(self):
+        target = ChoiceFlagsField(FLAGS, bits={'featured': 62, 'pinned': 0, 'hidden': 1})
+
+        self.assertEqual(1 << 62, target.get_prep_value({'featured'}))
+        self.assertRaises(ValueError, lambda: ChoiceFlagsField(FLAGS, bits={'featured': 63, 'pinned': 0, 'hidden': 1}))
+        self.assertRaises(ValueError, lambda: ChoiceFlagsField(FLAGS, bits={'featured': 1, 'pinned': 1, 'hidden': 2}))
+
+    def test_to_python(self):
+        target = ChoiceFlagsField(FLAGS)
+
+        self.assertEqual({'featured', 'pinned'}, target.to_python(['featured', 'pinned']))
+        self.assertEqual({'featured', 'pinned'}, target.to_python('3'))
+        self.assertRaises(ValidationError, lambda: target.to_python(['unknown']))
+        self.assertRaises(ValueError, lambda: target.get_prep_value(['unknown']))
+
+    def test_deconstruct(self):
+        name, path, args, kwargs = ChoiceFlagsField(FLAGS).deconstruct()
+        target = ChoiceFlagsField(*args, **kwargs)
+
+        self.assertEqual({'featured': 0, 'pinned': 1, 'hidden': 2}, kwargs['bits'])
+        self.assertEqual(4, target.get_prep_value({'hidden'}))
+
+    def test_lookups(self):
+        FlagsModel.objects.create(flags={'featured'})
+        FlagsModel.objects.create(flags={'featured', 'pinned'})
+        FlagsModel.objects.create(flags={'hidden'})
+        FlagsModel.objects.create()
+
+        def filtered(**kwargs):
+            return [f.flags for f in FlagsModel.objects.filter(**kwargs).order_by('pk')]
+
+        self.assertEqual([{'featured'}, {'featured', 'pinned'}, {'hidden'}],
+                         filtered(flags__has_any=['featured', 'hidden']))
+        self.assertEqual([{'featured', 'pinned'}], filtered(flags__has_all=['featured', 'pinned']))
+        self.assertEqual([{'hidden'}, set()], filtered(flags__has_none='featured'))
+        self.assertEqual([{'featured', 'pinned'}], filtered(flags={'pinned', 'featured'}))
+
+
+class NativeJsonFieldTestCase(test.TestCase):
+    def setUp(self):
+        NativeJsonModel.objects.create(
+            data={'owner': {'name': 'alice', 'age': 30}, 'tags': ['a', 'b'], 'active': True})
+        NativeJsonModel.objects.create(data={'owner': {'name': 'bob', 'age': 25}, 'tags': ['b', 'c'], 'active': False})
+        NativeJsonModel.objects.create(data={'owner': None, 'tags': []})
+
+    def names(self, **kwargs):
+        return sorted((o.data['owner'] or {}).get('name') for o in NativeJsonModel.objects.filter(**kwargs))
+
+    def test_load(self):
+        target = NativeJsonModel.objects.filter(data__owner__name='alice')[0]
+
+        self.assertEqual(['a', 'b'], target.data['tags'])
+
+    def test_key_lookup(self):
+        self.assertEqual(['alice'], self.names(data__active=True))
+        self.assertEqual(['bob'], self.names(data__active=False))
+        self.assertEqual(['alice'], self.names(data__owner={'name': 'alice', 'age': 30}))
+
+    def test_path_lookup(self):
+        self.assertEqual(['bob'], self.names(data__owner__name='bob'))
+        self.assertEqual(['alice'], self.names(data__owner__age__gt=25))
+        self.assertEqual(['alice', 'bob'], self.names(data__owner__age__gte=25))
+        self.assertEqual(['bob'], self.names(data__tags__0='b'))
+
+    def test_has_key(self):
+        self.assertEqual(['alice', 'bob'], self.names(data__has_key='active'))
+        self.assertEqual(['alice', 'bob'], self.names(data__owner__has_key='age'))
+
+    def test_contains(self):
+        self.assertEqual(['alice', 'bob'], self.names(data__contains={'tags': ['b']}))
+        self.assertEqual(['bob'], self.names(data__contains={'tags': ['c'], 'owner': {'name': 'bob'}}))
+        self.assertEqual([None], self.names(data__contains={'owner': None}))
+        self.assertEqual(['alice'], self.names(data__tags__contains='a'))
+        self.assertEqual([], self.names(data__contains={'tags': ['d']}))
+
+    def test_deconstruct(self):
+        name, path, args, kwargs = NativeJsonModel._meta.get_field('data').deconstruct()
+
+        self.assertTrue(kwargs['native'])
+        self.assertEqual(['tags', 'owner.name'], kwargs['path_indexes'])
+
+    def test_path_indexes(self):
+        self.assertRaises(ValueError, lambda: JsonField(path_indexes=['a']))
+        create_path_indexes()
+        create_path_indexes()
+
+        if connection.vendor == 'sqlite':
+            sql, params = NativeJsonModel.objects.filter(data__owner__name='x').query.sql_with_params()
+            cursor = connection.cursor()
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            self.assertIn('USING INDEX', ' '.join(str(r) for r in cursor.fetchall()))
+
+
+class LazyJsonFieldTestCase(test.TestCase):
+    def setUp(self):
+        self.pk = LazyJsonModel.objects.create(data={'a': 1}).pk
+        # Formatting that would be changed if the value was encoded again
+        cursor = connection.cursor()
+        cursor.execute('UPDATE %s SET data = %%s WHERE id = %%s' % LazyJsonModel._meta.db_table,
+                       ['{"b":  2,  "a": 1}', self.pk])
+
+    def raw_value(self):
+        cursor = connection.cursor()
+        cursor.execute('SELECT data FROM %s WHERE id = %%s' % LazyJsonModel._meta.db_table, [self.pk])
+        return cursor.fetchone()[0]
+
+    def test_not_decoded_on_load(self):
+        target = LazyJsonModel.objects.get(pk=self.pk)
+
+        self.assertTrue(isinstance(target.__dict__['data'], JsonText))
+
+    def test_decoded_on_access(self):
+        target = LazyJsonModel.objects.get(pk=self.pk)
+
+        self.assertEqual({'a': 1, 'b': 2}, target.data)
+        self.assertTrue(isinstance(target.__dict__['data'], JsonDict))
+
+    def test_save_not_decoded(self):
+        target = LazyJsonModel.objects.get(pk=self.pk)
+        target.save()
+
+        self.assertEqual('{"b":  2,  "a": 1}', self.raw_value())
+        self.assertTrue(isinstance(target.__dict__['data'], JsonText))
+
+    def test_save_modified(self):
+        target = LazyJsonModel.objects.get(pk=self.pk)
+        target.data['c'] = 3
+        target.save()
+
+        self.assertEqual({'a': 1, 'b': 2, 'c': 3}, LazyJsonModel.objects.get(pk=self.pk).data)
+
+    def test_assignment(self):
+        target = LazyJsonModel(data='[1, 2]')
+
+        self.assertEqual([1, 2], target.__dict__['data'])
+        self.assertEqual({}, LazyJsonModel().data)
+
+    def test_deferred(self):
+        target = LazyJsonModel.objects.defer('data').get(pk=self.pk)
+
+        self.assertEqual({'a': 1, 'b': 2}, target.data)
+
+
+class JsonDirtyTrackingTestCase(test.TestCase):
+    def setUp(self):
+        self.pk = TrackedJsonModel.objects.create(name='a', data={'a': {'b': [1, {'c': 2}]}}).pk
+
+    def set_raw_value(self, value):
+        cursor = connection.cursor()
+        cursor.execute('UPDATE %s SET data = %%s WHERE id = %%s' % TrackedJsonModel._meta.db_table, [value, self.pk])
+
+    def raw_value(self):
+        cursor = connection.cursor()
+        cursor.execute('SELECT data FROM %s WHERE id = %%s' % TrackedJsonModel._meta.db_table, [self.pk])
+        return cursor.fetchone()[0]
+
+    def test_loaded_clean(self):
+        target = TrackedJsonModel.objects.get(pk=self.pk)
+
+        self.assertFalse(target.data.dirty)
+        self.assertEqual([], target.json_changed_fields())
+
+    def test_nested_change(self):
+        target = TrackedJsonModel.objects.get(pk=self.pk)
+        target.data['a']['b'][1]['c'] = 3
+
+        self.assertTrue(target.data.dirty)
+        self.assertTrue(target.data['a'].dirty)
+        self.assertEqual(['data'], target.json_changed_fields())
+
+    def test_added_value_tracked(self):
+        target = TrackedJsonModel.objects.get(pk=self.pk)
+        target.data['d'] = {'e': []}
+        target.data.mark_clean()
+        target.data['d']['e'].append(1)
+
+        self.assertTrue(isinstance(target.data['d'], JsonDict))
+        self.assertTrue(target.data.dirty)
+
+    def test_list_changes(self):
+        target = JsonList([1, 2, 3])
+        for operation in (lambda v: v.append(4), lambda v: v.extend([5]), lambda v: v.insert(0, 0),
+                          lambda v: v.pop(), lambda v: v.remove(0), lambda v: v.reverse(), lambda v: v.sort(),
+                          lambda v: v.__setitem__(slice(0, 1), [{}]), lambda v: v.__delitem__(0)):
+            target.mark_clean()
+            operation(target)
+            self.assertTrue(target.dirty)
+
+    def test_dict_changes(self):
+        target = JsonDict({'a': 1})
+        for operation in (lambda v: v.update(b=2), lambda v: v.setdefault('c', 3), lambda v: v.pop('a'),
+                          lambda v: v.popitem(), lambda v: v.__delitem__('b' if 'b' in v else 'c'),
+                          lambda v: v.clear()):
+            target.mark_clean()
+            operation(target)
+            self.assertTrue(target.dirty)
+
+    def test_assignment_changed(self):
+        source = TrackedJsonModel.objects.get(pk=self.pk)
+        target = TrackedJsonModel.objects.get(pk=self.pk)
+        target.data = source.data
+
+        self.assertEqual(['data'], target.json_changed_fields())
+        target.data = '{"x": 1}'
+        self.assertTrue(target.data.dirty)
+
+    def test_save_unchanged(self):
+        target = TrackedJsonModel.objects.get(pk=self.pk)
+        self.set_raw_value('{"a":  {"b": [1, {"c": 2}]}}')
+        target.name = 'b'
+        target.save()
+
+        self.assertEqual('{"a":  {"b": [1, {"c": 2}]}}', self.raw_value())
+        self.assertEqual('b', TrackedJsonModel.objects.get(pk=self.pk).name)
+
+    def test_save_only_unchanged_json_loaded(self):
+        saved = []
+
+        def receiver(sender, instance, **kwargs):
+            saved.append(instance)
+        models.signals.post_save.connect(receiver, sender=TrackedJsonModel)
+        try:
+            target = TrackedJsonModel.objects.only('data').get(pk=self.pk)
+            target.save()
+        finally:
+            models.signals.post_save.disconnect(receiver, sender=TrackedJsonModel)
+
+        self.assertEqual([target], saved)
+        self.assertFalse(target.data.dirty)
+        self.assertEqual({'a': {'b': [1, {'c': 2}]}}, TrackedJsonModel.objects.get(pk=self.pk).data)
+
+    def test_save_changed(self):
+        target = TrackedJsonModel.objects.get(pk=self.pk)
+        target.data['a']['b'].append(3)
+        target.save()
+
+        self.assertFalse(target.data.dirty)
+        self.assertEqual({'a': {'b': [1, {'c': 2}, 3]}}, TrackedJsonModel.objects.get(pk=self.pk).data)
+
+    def test_copy_changed(self):
+        target = TrackedJsonModel.objects.get(pk=self.pk)
+        value = copy.deepcopy(target.data)
+
+        self.assertTrue(value.dirty)
+        self.assertTrue(value['a']['b'][1]._parent is value['a']['b'])
+        self.assertFalse(target.data.dirty)
+
+
+class CompressedJsonFieldTestCase(test.TestCase):
+    def raw_value(self, pk):
+        cursor = connection.cursor()
+        cursor.execute('SELECT data FROM %s WHERE id = %%s' % CompressedJsonModel._meta.db_table, [pk])
+        return bytes(cursor.fetchone()[0])
+
+    def test_small_value_not_compressed(self):
+        pk = CompressedJsonModel.objects.create(data={'a': 1}).pk
+
+        self.assertEqual(b'{"a": 1}', self.raw_value(pk))
+        self.assertEqual({'a': 1}, CompressedJsonModel.objects.get(pk=pk).data)
+
+    def test_large_value_compressed(self):
+        value = {'items': [{'id': i, 'name': 'Item %d' % i} for i in range(100)]}
+        pk = CompressedJsonModel.objects.create(data=value).pk
+
+        raw = self.raw_value(pk)
+        self.assertEqual(b'\x00z', raw[:2])
+        self.assertTrue(len(raw) < len(json.dumps(value)))
+        self.assertEqual(value, CompressedJsonModel.objects.get(pk=pk).data)
+
+    def test_text_value(self):
+        pk = CompressedJsonModel.objects.create().pk
+        cursor = connection.cursor()
+        cursor.execute('UPDATE %s SET data = %%s WHERE id = %%s' % CompressedJsonModel._meta.db_table,
+                       ['{"b": 2}', pk])
+
+        self.assertEqual({'b': 2}, CompressedJsonModel.objects.get(pk=pk).data)
+
+    def test_compress_round_trip(self):
+        text = json.dumps(list(range(1000)))
+        self.assertEqual(text, decompress(compress(text, 'zlib', threshold=0)))
+        self.assertEqual(text, decompress(text))
+        self.assertRaises(ValueError, decompress, b'\x00?abc')
+
+    @skipIf(lzma is None, 'lzma requires Python 3.3+')
+    def test_compress_round_trip_lzma(self):
+        text = json.dumps(list(range(1000)))
+        self.assertEqual(text, decompress(compress(text, 'lzma', threshold=0)))
+
+    def test_options(self):
+        self.assertEqual('BinaryField', CompressedJsonModel._meta.get_field('data').get_internal_type())
+        name, path, args, kwargs = CompressedJsonModel._meta.get_field('data').deconstruct()
+        self.assertEqual('zlib', kwargs['compress'])
+        self.assertEqual(100, kwargs['compress_threshold'])
+        self.assertRaises(ValueError, lambda: JsonField(compress='rar'))
+        self.assertRaises(ValueError, lambda: JsonField(compress='zlib', native=True))
+
+
+class LazyCompressedJsonFieldTestCase(test.TestCase):
+    value = {'items': list(range(100))}
+
+    def setUp(self):
+        self.pk = LazyCompressedJsonModel.objects.create(data=self.value).pk
+
+    def raw_value(self):
+        cursor = connection.cursor()
+        cursor.execute('SELECT data FROM %s WHERE id = %%s' % LazyCompressedJsonModel._meta.db_table, [self.pk])
+        return bytes(cursor.fetchone()[0])
+
+    def test_not_decompressed_on_load(self):
+        target = LazyCompressedJsonModel.objects.get(pk=self.pk)
+
+        self.assertTrue(isinstance(target.__dict__['data'], JsonCompressed))
+
+    def test_decoded_on_access(self):
+        target = LazyCompressedJsonModel.objects.get(pk=self.pk)
+
+        self.assertEqual(self.value, target.data)
+        self.assertTrue(isinstance(target.__dict__['data'], JsonDict))
+
+    def test_save_not_decompressed(self):
+        raw = self.raw_value()
+        target = LazyCompressedJsonModel.objects.get(pk=self.pk)
+        target.save()
+
+        self.assertEqual(raw, self.raw_value())
+        self.assertTrue(isinstance(target.__dict__['data'], JsonCompressed))
+
+    def test_small_value(self):
+        pk = LazyCompressedJsonModel.objects.create(data={'a': 1}).pk
+        target = LazyCompressedJsonModel.objects.get(pk=pk)
+
+        self.assertTrue(isinstance(target.__dict__['data'], JsonText))
+        self.assertEqual({'a': 1}, target.data)
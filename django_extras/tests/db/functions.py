@@ -0,0 +1,78 @@
+from django import test
+from django.db import models
+from django_extras.db.models import JsonField, JsonRemove, JsonSet
+
+
+class JsonFunctionModel(models.Model):
+    data = JsonField()
+
+    class Meta:
+        app_label = 'django_extras'
+
+
+class NativeJsonFunctionModel(models.Model):
+    data = JsonField(native=True)
+
+    class Meta:
+        app_label = 'django_extras'
+
+
+class JsonFunctionTestCase(test.TestCase):
+    model = JsonFunctionModel
+
+    def setUp(self):
+        self.pk = self.model.objects.create(data={'owner': {'name': 'alice'}, 'tags': ['a', 'b']}).pk
+
+    def update(self, expression):
+        self.model.objects.filter(pk=self.pk).update(data=expression)
+        return self.model.objects.get(pk=self.pk).data
+
+    def test_set(self):
+        actual = self.update(JsonSet('data', 'owner.name', 'bob'))
+
+        self.assertEqual({'owner': {'name': 'bob'}, 'tags': ['a', 'b']}, actual)
+
+    def test_set_new_key(self):
+        actual = self.update(JsonSet('data', 'owner.roles', ['admin', {'level': 1}]))
+
+        self.assertEqual(['admin', {'level': 1}], actual['owner']['roles'])
+
+    def test_set_scalars(self):
+        actual = self.update(JsonSet(JsonSet(JsonSet('data', 'a', True), 'b', None), 'c', 1.5))
+
+        self.assertEqual((True, None, 1.5), (actual['a'], actual['b'], actual['c']))
+
+    def test_set_index(self):
+        actual = self.update(JsonSet('data', 'tags.1', 'c'))
+
+        self.assertEqual(['a', 'c'], actual['tags'])
+
+    def test_remove(self):
+        actual = self.update(JsonRemove('data', 'owner.name'))
+
+        self.assertEqual({'owner': {}, 'tags': ['a', 'b']}, actual)
+
+    def test_remove_index(self):
+        actual = self.update(JsonRemove('data', ['tags', 0]))
+
+        self.assertEqual(['b'], actual['tags'])
+
+
+class NativeJsonFunctionTestCase(JsonFunctionTestCase):
+    model = NativeJsonFunctionModel
+
+
+class JsonFunctionSqlTestCase(test.TestCase):
+    def test_postgresql(self):
+        self.assertEqual(
+            ('jsonb_set(CAST("data" AS jsonb), CAST(%s AS text[]), CAST(%s AS jsonb), true)', ['{"a","0"}', '{"b":1}']),
+            JsonSet('data', 'a.0', {'b': 1}).sql_postgresql('"data"', []))
+        self.assertEqual(
+            ('(CAST("data" AS jsonb) #- CAST(%s AS text[]))', ['{"a"}']),
+            JsonRemove('data', 'a').sql_postgresql('"data"', []))
+
+    def test_mysql(self):
+        self.assertEqual(
+            ('JSON_SET(`data`, %s, CAST(%s AS JSON))', ['$."a"[0]', '"x"']),
+            JsonSet('data', 'a.0', 'x').sql_mysql('`data`', []))
+        self.assertEqual(('JSON_REMOVE(`data`, %s)', ['$."a"']), JsonRemove('data', 'a').sql_mysql('`data`', []))
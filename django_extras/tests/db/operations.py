@@ -0,0 +1,40 @@
+from django import test
+from django.apps import apps
+from django.db import connection
+from django.db.migrations.state import ProjectState
+from django_extras.db.operations import AddJsonPathIndex
+from django_extras.tests.db.fields import NativeJsonModel
+
+
+class AddJsonPathIndexTestCase(test.TransactionTestCase):
+    def uses_index(self):
+        sql, params = NativeJsonModel.objects.filter(data__owner__name='x').query.sql_with_params()
+        cursor = connection.cursor()
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        return 'USING INDEX' in ' '.join(str(r) for r in cursor.fetchall())
+
+    def test_describe(self):
+        target = AddJsonPathIndex('nativejsonmodel', 'data', 'owner.name')
+
+        self.assertEqual('Create index on JSON path owner.name of nativejsonmodel.data', target.describe())
+
+    def test_deconstruct(self):
+        name, args, kwargs = AddJsonPathIndex('nativejsonmodel', 'data', 'owner.name').deconstruct()
+
+        self.assertEqual('AddJsonPathIndex', name)
+        self.assertEqual(['nativejsonmodel', 'data', 'owner.name'], list(args))
+        self.assertEqual({}, kwargs)
+
+    def test_forwards_backwards(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Index usage is checked with SQLite')
+        state = ProjectState.from_apps(apps)
+        target = AddJsonPathIndex('nativejsonmodel', 'data', 'owner.name')
+
+        with connection.schema_editor() as editor:
+            target.database_forwards('django_extras', editor, state, state)
+        self.assertTrue(self.uses_index())
+
+        with connection.schema_editor() as editor:
+            target.database_backwards('django_extras', editor, state, state)
+        self.assertFalse(self.uses_index())
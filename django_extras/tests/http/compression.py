@@ -0,0 +1,128 @@
+import gzip
+import io
+import json
+import os.path
+import zlib
+from django import test
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test.utils import override_settings
+from django_extras.http import FileResponse, JsonResponse, StreamingJsonResponse
+from django_extras.http.compression import available_encodings, compress_page, compress_response, negotiate
+
+
+class NegotiateTestCase(test.TestCase):
+    def test_preference(self):
+        self.assertEqual('gzip', negotiate('gzip, deflate', ('br', 'gzip', 'deflate')))
+        self.assertEqual('br', negotiate('gzip, deflate, br', ('br', 'gzip', 'deflate')))
+
+    def test_quality(self):
+        self.assertEqual('deflate', negotiate('gzip;q=0.5, deflate', ('gzip', 'deflate')))
+        self.assertEqual('deflate', negotiate('gzip;q=0, *', ('gzip', 'deflate')))
+        self.assertEqual(None, negotiate('gzip;q=0', ('gzip', 'deflate')))
+
+    def test_not_accepted(self):
+        self.assertEqual(None, negotiate('', ('gzip', )))
+        self.assertEqual(None, negotiate(None, ('gzip', )))
+        self.assertEqual(None, negotiate('identity', ('gzip', )))
+
+    def test_available(self):
+        self.assertEqual(('gzip', 'deflate'), available_encodings()[-2:])
+
+
+class CompressResponseTestCase(test.TestCase):
+    data = {'items': ['item %d' % i for i in range(500)]}
+
+    def setUp(self):
+        self.request = test.RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+
+    def test_gzip(self):
+        target = compress_response(self.request, JsonResponse(self.data, etag=True))
+
+        self.assertEqual('gzip', target['Content-Encoding'])
+        self.assertEqual('Accept-Encoding', target['Vary'])
+        self.assertEqual(str(len(target.content)), target['Content-Length'])
+        self.assertTrue(target['ETag'].startswith('W/"'))
+        self.assertEqual(self.data, json.loads(gzip.GzipFile(fileobj=io.BytesIO(target.content)).read().decode('utf8')))
+
+    def test_deflate(self):
+        request = test.RequestFactory().get('/', HTTP_ACCEPT_ENCODING='deflate')
+        target = compress_response(request, JsonResponse(self.data))
+
+        self.assertEqual('deflate', target['Content-Encoding'])
+        self.assertEqual(self.data, json.loads(zlib.decompress(target.content).decode('utf8')))
+
+    def test_small(self):
+        target = compress_response(self.request, JsonResponse({'a': 1}))
+
+        self.assertFalse(target.has_header('Content-Encoding'))
+        self.assertEqual('Accept-Encoding', target['Vary'])
+
+    def test_content_type(self):
+        target = compress_response(self.request, HttpResponse(b'x' * 5000, content_type='image/png'))
+
+        self.assertFalse(target.has_header('Content-Encoding'))
+        self.assertFalse(target.has_header('Vary'))
+
+    def test_not_accepted(self):
+        request = test.RequestFactory().get('/')
+        target = compress_response(request, JsonResponse(self.data))
+
+        self.assertFalse(target.has_header('Content-Encoding'))
+
+    def test_streaming(self):
+        target = compress_response(self.request, StreamingJsonResponse(iter(self.data['items']), chunk_size=100))
+        chunks = list(target.streaming_content)
+
+        self.assertEqual('gzip', target['Content-Encoding'])
+        self.assertTrue(len(chunks) > 2)
+        content = zlib.decompress(b''.join(chunks), 16 + zlib.MAX_WBITS)
+        self.assertEqual(self.data['items'], json.loads(content.decode('utf8')))
+
+    def test_streaming_first_chunk(self):
+        # Content is emitted as it is produced rather than at the end
+        target = compress_response(self.request, StreamingHttpResponse(iter([b'a' * 10, b'b' * 10])))
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+        self.assertEqual(b'a' * 10, decompressor.decompress(next(iter(target.streaming_content))))
+
+    def test_decorator(self):
+        @compress_page(min_size=0)
+        def view(request):
+            return JsonResponse(self.data)
+
+        self.assertEqual('gzip', view(self.request)['Content-Encoding'])
+
+
+class PrecompressedFileResponseTestCase(test.TestCase):
+    path = os.path.join(os.path.dirname(__file__), 'data/example.txt')
+
+    def test_precompressed(self):
+        request = test.RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        target = FileResponse(self.path, 'text/plain', request=request, precompressed=True)
+
+        self.assertEqual('gzip', target['Content-Encoding'])
+        self.assertEqual('Accept-Encoding', target['Vary'])
+        with open(self.path + '.gz', 'rb') as f:
+            self.assertEqual(f.read(), b''.join(target.streaming_content))
+        target.close()
+
+        # Not compressed again
+        self.assertEqual('gzip', compress_response(request, target)['Content-Encoding'])
+
+    def test_sendfile(self):
+        request = test.RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        with override_settings(DJANGO_EXTRAS_SENDFILE='x-sendfile'):
+            target = compress_response(request, FileResponse(self.path, 'text/plain'), min_size=0)
+
+        self.assertTrue(target.has_header('X-Sendfile'))
+        self.assertFalse(target.has_header('Content-Encoding'))
+        self.assertEqual(b'', b''.join(target.streaming_content))
+        target.close()
+
+    def test_not_accepted(self):
+        request = test.RequestFactory().get('/', HTTP_ACCEPT_ENCODING='br')
+        target = FileResponse(self.path, 'text/plain', request=request, precompressed=True)
+
+        self.assertFalse(target.has_header('Content-Encoding'))
+        self.assertEqual('42', target['Content-Length'])
+        target.close()
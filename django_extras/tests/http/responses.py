@@ -1,18 +1,129 @@
 import os.path
 import datetime
 import json
+import tempfile
 from django import test
+from django.test.utils import override_settings
 import six
-from django_extras.http import FileResponse, JsonResponse
+from django_extras.http import FileResponse, JsonResponse, StreamingJsonResponse
 
 
 class FileResponseTestCase(test.TestCase):
+    path = os.path.join(os.path.dirname(__file__), 'data/example.txt')
+
+    def setUp(self):
+        self.factory = test.RequestFactory()
+
+    def content(self, response):
+        return b''.join(response.streaming_content)
+
     def test_with_file_handle(self):
         path = os.path.dirname(__file__)
         f = open(os.path.join(path, 'data/example.txt'))
         target = FileResponse(f, 'test/plain')
 
         self.assertEqual(target['Content-Type'], 'test/plain')
+        target.close()
+
+    def test_with_file_name(self):
+        target = FileResponse(self.path, 'text/plain', chunk_size=10)
+        chunks = list(target.streaming_content)
+        target.close()
+
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), b''.join(chunks))
+        self.assertEqual(5, len(chunks))
+        self.assertEqual('42', target['Content-Length'])
+        self.assertEqual('bytes', target['Accept-Ranges'])
+        self.assertTrue(target.has_header('ETag'))
+        self.assertTrue(target['Last-Modified'].endswith('GMT'))
+
+    def test_without_file_descriptor(self):
+        target = FileResponse(six.BytesIO(b'abc'), 'text/plain')
+
+        self.assertEqual(b'abc', self.content(target))
+        self.assertFalse(target.has_header('ETag'))
+
+    def test_if_none_match(self):
+        etag = FileResponse(self.path, 'text/plain')['ETag']
+        target = FileResponse(self.path, 'text/plain', request=self.factory.get('/', HTTP_IF_NONE_MATCH=etag))
+
+        self.assertEqual(304, target.status_code)
+        self.assertEqual(b'', self.content(target))
+
+        target = FileResponse(self.path, 'text/plain', request=self.factory.get('/', HTTP_IF_NONE_MATCH='"x"'))
+        self.assertEqual(200, target.status_code)
+        target.close()
+
+    def test_if_modified_since(self):
+        modified = FileResponse(self.path, 'text/plain')['Last-Modified']
+        target = FileResponse(self.path, 'text/plain', request=self.factory.get('/', HTTP_IF_MODIFIED_SINCE=modified))
+
+        self.assertEqual(304, target.status_code)
+
+    def test_range(self):
+        for header, expected, content_range in (
+                ('bytes=0-3', b'This', 'bytes 0-3/42'),
+                ('bytes=38-', b'ses.', 'bytes 38-41/42'),
+                ('bytes=-4', b'ses.', 'bytes 38-41/42'),
+                ('bytes=40-100', b's.', 'bytes 40-41/42')):
+            target = FileResponse(self.path, 'text/plain', request=self.factory.get('/', HTTP_RANGE=header))
+
+            self.assertEqual(206, target.status_code)
+            self.assertEqual(expected, self.content(target))
+            self.assertEqual(content_range, target['Content-Range'])
+            self.assertEqual(str(len(expected)), target['Content-Length'])
+            target.close()
+
+    def test_range_ignored(self):
+        for header in ('bytes=0-1,4-5', 'lines=1-2', 'bytes=a-b'):
+            target = FileResponse(self.path, 'text/plain', request=self.factory.get('/', HTTP_RANGE=header))
+
+            self.assertEqual(200, target.status_code)
+            target.close()
+
+        target = FileResponse(self.path, 'text/plain', request=self.factory.get(
+            '/', HTTP_RANGE='bytes=0-3', HTTP_IF_RANGE='"changed"'))
+        self.assertEqual(200, target.status_code)
+        target.close()
+
+    def test_range_not_satisfiable(self):
+        target = FileResponse(self.path, 'text/plain', request=self.factory.get('/', HTTP_RANGE='bytes=50-'))
+
+        self.assertEqual(416, target.status_code)
+        self.assertEqual('bytes */42', target['Content-Range'])
+
+    def test_range_empty_file(self):
+        with tempfile.NamedTemporaryFile() as f:
+            for header in ('bytes=-4', 'bytes=0-'):
+                target = FileResponse(f.name, 'text/plain', request=self.factory.get('/', HTTP_RANGE=header))
+
+                self.assertEqual(416, target.status_code)
+                self.assertEqual('bytes */0', target['Content-Range'])
+                target.close()
+
+    def test_x_sendfile(self):
+        with override_settings(DJANGO_EXTRAS_SENDFILE='x-sendfile'):
+            target = FileResponse(self.path, 'text/plain')
+
+        self.assertEqual(os.path.abspath(self.path), target['X-Sendfile'])
+        self.assertEqual(b'', self.content(target))
+
+    def test_x_accel_redirect(self):
+        with override_settings(DJANGO_EXTRAS_SENDFILE='x-accel-redirect',
+                               DJANGO_EXTRAS_SENDFILE_ROOT=os.path.dirname(__file__),
+                               DJANGO_EXTRAS_SENDFILE_URL='/protected/'):
+            target = FileResponse(self.path, 'text/plain')
+
+        self.assertEqual('/protected/data/example.txt', target['X-Accel-Redirect'])
+
+    def test_sendfile_outside_root(self):
+        with override_settings(DJANGO_EXTRAS_SENDFILE='x-sendfile',
+                               DJANGO_EXTRAS_SENDFILE_ROOT=os.path.join(os.path.dirname(__file__), 'other')):
+            target = FileResponse(self.path, 'text/plain')
+
+        self.assertFalse(target.has_header('X-Sendfile'))
+        target.close()
 
 
 class JsonResponseTestCase(test.TestCase):
@@ -53,3 +164,86 @@ class JsonResponseTestCase(test.TestCase):
             actual = ''.join(target)
         self.assertJSONEqual(actual, {"foo": "bar", "eek": "2012-06-25T11:09:48"})
         self.assertEqual('application/json', target['Content-Type'])
+
+    def test_etag(self):
+        target = JsonResponse({'foo': 'bar'}, etag=True)
+
+        self.assertTrue(target.has_header('ETag'))
+        self.assertEqual(target['ETag'], JsonResponse({'foo': 'bar'}, etag=True)['ETag'])
+        self.assertNotEqual(target['ETag'], JsonResponse({'foo': 'eek'}, etag=True)['ETag'])
+        self.assertFalse(JsonResponse({'foo': 'bar'}).has_header('ETag'))
+
+    def test_etag_not_modified(self):
+        etag = JsonResponse({'foo': 'bar'}, etag=True)['ETag']
+        request = test.RequestFactory().get('/', HTTP_IF_NONE_MATCH=etag)
+        target = JsonResponse({'foo': 'bar'}, etag=True, request=request)
+
+        self.assertEqual(304, target.status_code)
+        self.assertEqual(b'', target.content)
+        self.assertEqual(etag, target['ETag'])
+        self.assertEqual(200, JsonResponse({'foo': 'eek'}, etag=True, request=request).status_code)
+
+    def test_version_not_modified(self):
+        etag = JsonResponse({'foo': 'bar'}, version=3)['ETag']
+        request = test.RequestFactory().get('/', HTTP_IF_NONE_MATCH=etag)
+
+        def data():
+            self.fail('Data should not be built.')
+        target = JsonResponse(data, version=3, request=request)
+
+        self.assertEqual(304, target.status_code)
+        self.assertEqual(etag, target['ETag'])
+
+    def test_version_modified(self):
+        request = test.RequestFactory().get('/', HTTP_IF_NONE_MATCH='"other"')
+        target = JsonResponse(lambda: {'foo': 'bar'}, version=4, request=request)
+
+        self.assertEqual(200, target.status_code)
+        self.assertEqual({'foo': 'bar'}, json.loads(target.content.decode('utf8')))
+
+
+class IteratorOnly(object):
+    """
+    Stand in for a queryset that must be read with iterator().
+    """
+    def __init__(self, items):
+        self.items = items
+
+    def __iter__(self):
+        raise AssertionError('Results should not be cached.')
+
+    def iterator(self):
+        return iter(self.items)
+
+
+class StreamingJsonResponseTestCase(test.TestCase):
+    def content(self, response):
+        return b''.join(response.streaming_content).decode('utf8')
+
+    def test_array(self):
+        target = StreamingJsonResponse(({'id': i} for i in range(3)))
+
+        self.assertEqual('[{"id": 0},{"id": 1},{"id": 2}]', self.content(target))
+        self.assertEqual('application/json', target['Content-Type'])
+
+    def test_empty(self):
+        self.assertEqual('[]', self.content(StreamingJsonResponse([])))
+        self.assertEqual('', self.content(StreamingJsonResponse([], ndjson=True)))
+
+    def test_ndjson(self):
+        target = StreamingJsonResponse([1, {'a': datetime.date(2012, 6, 25)}], ndjson=True)
+
+        self.assertEqual('1\n{"a": "2012-06-25"}\n', self.content(target))
+        self.assertEqual('application/x-ndjson', target['Content-Type'])
+
+    def test_queryset_iterator(self):
+        target = StreamingJsonResponse(IteratorOnly([1, 2]), transform=lambda v: v * 10)
+
+        self.assertEqual([10, 20], json.loads(self.content(target)))
+
+    def test_chunks(self):
+        target = StreamingJsonResponse(list(range(100)), chunk_size=20)
+        chunks = list(target.streaming_content)
+
+        self.assertTrue(len(chunks) > 5)
+        self.assertEqual(list(range(100)), json.loads(b''.join(chunks).decode('utf8')))
@@ -0,0 +1,103 @@
+import os
+import pstats
+import shutil
+import tempfile
+import time
+from django import test
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.test.utils import override_settings
+from django_extras.middleware.profiling import ProfilingMiddleware, rotate
+
+
+def busy(seconds):
+    end = time.time() + seconds
+    while time.time() < end:
+        sum(range(100))
+
+
+class ProfilingMiddlewareTestCase(test.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.factory = test.RequestFactory()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def process(self, request, duration=0):
+        target = ProfilingMiddleware()
+        target.process_request(request)
+        busy(duration)
+        target.process_response(request, HttpResponse())
+        return sorted(os.listdir(self.directory))
+
+    def test_disabled(self):
+        with override_settings(DJANGO_EXTRAS_PROFILING_RATE=1):
+            target = ProfilingMiddleware()
+            request = self.factory.get('/')
+            target.process_request(request)
+
+        self.assertFalse(hasattr(request, ProfilingMiddleware.REQUEST_ATTR))
+
+    def test_cprofile(self):
+        with override_settings(DJANGO_EXTRAS_PROFILING_DIR=self.directory, DJANGO_EXTRAS_PROFILING_RATE=1):
+            files = self.process(self.factory.get('/items/list'))
+
+        self.assertEqual(1, len(files))
+        self.assertTrue(files[0].endswith('.prof'))
+        self.assertIn('-GET-items_list-', files[0])
+        stats = pstats.Stats(os.path.join(self.directory, files[0]))
+        self.assertTrue(any(func[2] == 'busy' for func in stats.stats))
+
+    def test_sampler(self):
+        with override_settings(DJANGO_EXTRAS_PROFILING_DIR=self.directory, DJANGO_EXTRAS_PROFILING_RATE=1,
+                               DJANGO_EXTRAS_PROFILING_MODE='sampler', DJANGO_EXTRAS_PROFILING_INTERVAL=0.001):
+            files = self.process(self.factory.get('/'), 0.05)
+
+        self.assertEqual(1, len(files))
+        self.assertTrue(files[0].endswith('.collapsed'))
+        with open(os.path.join(self.directory, files[0])) as f:
+            content = f.read()
+        self.assertIn('busy (', content)
+        self.assertTrue(content.splitlines()[0].rsplit(' ', 1)[1].isdigit())
+
+    def test_not_sampled(self):
+        with override_settings(DJANGO_EXTRAS_PROFILING_DIR=self.directory, DJANGO_EXTRAS_PROFILING_RATE=0):
+            self.assertEqual([], self.process(self.factory.get('/')))
+
+    def test_url_pattern(self):
+        with override_settings(DJANGO_EXTRAS_PROFILING_DIR=self.directory, DJANGO_EXTRAS_PROFILING_RATE=1,
+                               DJANGO_EXTRAS_PROFILING_URL_PATTERN=r'^/api/'):
+            self.assertEqual([], self.process(self.factory.get('/admin/')))
+            self.assertEqual(1, len(self.process(self.factory.get('/api/items'))))
+
+    def test_header(self):
+        with override_settings(DJANGO_EXTRAS_PROFILING_DIR=self.directory, DJANGO_EXTRAS_PROFILING_HEADER='X-Profile',
+                               DJANGO_EXTRAS_PROFILING_TOKEN='secret'):
+            self.assertEqual([], self.process(self.factory.get('/', HTTP_X_PROFILE='wrong')))
+            self.assertEqual(1, len(self.process(self.factory.get('/', HTTP_X_PROFILE='secret'))))
+
+    def test_header_requires_token(self):
+        with override_settings(DJANGO_EXTRAS_PROFILING_DIR=self.directory, DJANGO_EXTRAS_PROFILING_HEADER='X-Profile'):
+            self.assertRaises(ImproperlyConfigured, lambda: self.process(self.factory.get('/', HTTP_X_PROFILE='1')))
+        self.assertEqual([], os.listdir(self.directory))
+
+    def test_user_flag(self):
+        request = self.factory.get('/')
+        request.user = type('User', (object, ), {'is_superuser': True})()
+        with override_settings(DJANGO_EXTRAS_PROFILING_DIR=self.directory,
+                               DJANGO_EXTRAS_PROFILING_USER_FLAG='is_superuser'):
+            self.assertEqual(1, len(self.process(request)))
+
+    def test_rotate(self):
+        for idx in range(5):
+            path = os.path.join(self.directory, '%d.prof' % idx)
+            with open(path, 'w') as f:
+                f.write('x' * 100)
+            os.utime(path, (idx, idx))
+        with open(os.path.join(self.directory, 'other.txt'), 'w') as f:
+            f.write('x' * 1000)
+
+        rotate(self.directory, 250)
+
+        self.assertEqual(['3.prof', '4.prof', 'other.txt'], sorted(os.listdir(self.directory)))
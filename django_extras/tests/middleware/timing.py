@@ -1,6 +1,22 @@
+from unittest import skipIf, skipUnless
 from django import test
+from django.db import connection
 from django.http import HttpRequest, HttpResponse
-from django_extras.middleware.timing import TimingMiddleware
+from django.template.response import SimpleTemplateResponse
+try:
+    from django.urls import ResolverMatch
+except ImportError:
+    from django.core.urlresolvers import ResolverMatch
+from django_extras.middleware.timing import TimingMiddleware, current_timer, latency, latency_metrics, time_phase
+
+# Database execute wrappers were added in Django 2.0
+HAS_EXECUTE_WRAPPERS = hasattr(connection, 'execute_wrappers')
+
+
+class StaticTemplateResponse(SimpleTemplateResponse):
+    @property
+    def rendered_content(self):
+        return 'content'
 
 
 class TimingMiddlewareTestCase(test.TestCase):
@@ -22,3 +38,73 @@ class TimingMiddlewareTestCase(test.TestCase):
 
         target.process_response(request, response)
         self.assertRaises(KeyError, lambda: response[TimingMiddleware.RESPONSE_HEADER])
+
+    def server_timing(self):
+        request = HttpRequest()
+        target = TimingMiddleware()
+
+        target.process_request(request)
+        target.process_view(request, None, (), {})
+        with time_phase('cache'):
+            pass
+        connection.cursor().execute('SELECT 1')
+        response = target.process_response(request, HttpResponse())
+
+        self.assertIsNone(current_timer())
+        return dict(m.split(';', 1) for m in response[TimingMiddleware.SERVER_TIMING_HEADER].split(', '))
+
+    @skipUnless(HAS_EXECUTE_WRAPPERS, 'Database execute wrappers require Django 2.0+')
+    def test_server_timing(self):
+        metrics = self.server_timing()
+
+        self.assertEqual(['cache', 'db', 'middleware', 'total', 'view'], sorted(metrics))
+        self.assertIn('desc="1 queries"', metrics['db'])
+
+    @skipIf(HAS_EXECUTE_WRAPPERS, 'Database execute wrappers are supported')
+    def test_server_timing_without_db(self):
+        metrics = self.server_timing()
+
+        self.assertEqual(['cache', 'middleware', 'total', 'view'], sorted(metrics))
+
+    @skipUnless(HAS_EXECUTE_WRAPPERS, 'Database execute wrappers require Django 2.0+')
+    def test_wrappers_removed(self):
+        request = HttpRequest()
+        target = TimingMiddleware()
+
+        target.process_request(request)
+        target.process_response(request, HttpResponse())
+        connection.cursor().execute('SELECT 1')
+
+        self.assertEqual([], connection.execute_wrappers)
+
+    def test_template_response(self):
+        request = HttpRequest()
+        target = TimingMiddleware()
+        response = StaticTemplateResponse(None)
+
+        target.process_request(request)
+        target.process_view(request, None, (), {})
+        response = target.process_template_response(request, response)
+        response.render()
+        response = target.process_response(request, response)
+
+        self.assertIn('render;dur=', response[TimingMiddleware.SERVER_TIMING_HEADER])
+
+    def test_time_phase_outside_request(self):
+        with time_phase('cache'):
+            pass
+
+        self.assertIsNone(current_timer())
+
+    def test_latency_recorded(self):
+        request = test.RequestFactory().get('/')
+        request.resolver_match = ResolverMatch(lambda r: None, (), {}, url_name='detail', namespaces=['app'])
+        target = TimingMiddleware()
+        latency.reset()
+
+        target.process_request(request)
+        target.process_response(request, HttpResponse())
+
+        self.assertEqual(1, latency.summaries()[('app:detail', 'GET')]['count'])
+        content = latency_metrics(request).content.decode('utf8')
+        self.assertIn('url_name="app:detail",method="GET"', content)
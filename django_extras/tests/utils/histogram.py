@@ -0,0 +1,95 @@
+import threading
+from django import test
+from django_extras.utils.histogram import BUCKET_COUNT, LatencyHistogram, LatencyRecorder, MAX_VALUE, \
+    bucket_index, bucket_upper_bound, prometheus_text
+
+
+class LatencyHistogramTestCase(test.TestCase):
+    def test_buckets(self):
+        previous = -1
+        for value in list(range(0, 5000)) + [10 ** 6, 10 ** 9, MAX_VALUE]:
+            idx = bucket_index(value)
+            self.assertTrue(value <= bucket_upper_bound(idx))
+            self.assertTrue(idx >= previous)
+            previous = idx
+        self.assertEqual(BUCKET_COUNT - 1, bucket_index(MAX_VALUE))
+
+    def test_percentiles(self):
+        target = LatencyHistogram()
+        for value in range(1, 10001):
+            target.record(value)
+
+        for percent in (50, 95, 99):
+            expected = 100 * percent
+            self.assertTrue(abs(target.percentile(percent) - expected) <= expected * 0.04)
+        self.assertEqual(10000, target.percentile(100))
+        self.assertEqual(10000, target.max)
+
+    def test_empty(self):
+        self.assertEqual({'count': 0, 'sum': 0, 'p50': 0, 'p95': 0, 'p99': 0, 'max': 0},
+                         LatencyHistogram().summary())
+
+    def test_clamped(self):
+        target = LatencyHistogram()
+        target.record(MAX_VALUE * 2)
+        target.record(-1)
+
+        self.assertEqual(MAX_VALUE, target.max)
+        self.assertEqual(2, target.count)
+
+    def test_merge(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.record(10)
+        b.record(1000)
+        a.merge(b)
+
+        self.assertEqual(2, a.count)
+        self.assertEqual(1000, a.max)
+        self.assertEqual(10, a.percentile(50))
+
+
+class LatencyRecorderTestCase(test.TestCase):
+    def test_threads(self):
+        target = LatencyRecorder()
+
+        def record():
+            for value in range(100):
+                target.record(('view', 'GET'), value)
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        target.record(('view', 'POST'), 5)
+
+        snapshot = target.snapshot()
+        self.assertEqual(400, snapshot[('view', 'GET')].count)
+        self.assertEqual(1, snapshot[('view', 'POST')].count)
+        # Histograms of finished threads are merged
+        self.assertEqual(1, len(target._threads))
+        self.assertEqual(400, target.snapshot()[('view', 'GET')].count)
+
+    def test_reset(self):
+        target = LatencyRecorder()
+        target.record('a', 1)
+        target.reset()
+
+        self.assertEqual({}, dict((k, v) for k, v in target.snapshot().items() if v.count))
+
+    def test_export(self):
+        target = LatencyRecorder()
+        target.record('a', 1)
+        calls = []
+
+        self.assertTrue(target.export(calls.append, 60))
+        self.assertFalse(target.export(calls.append, 60))
+        self.assertEqual(1, calls[0]['a']['count'])
+
+    def test_prometheus_text(self):
+        target = LatencyRecorder()
+        target.record(('app:detail', 'GET'), 1500)
+
+        actual = prometheus_text(target.summaries())
+        self.assertIn('django_request_latency_seconds{url_name="app:detail",method="GET",quantile="0.99"} 0.0015',
+                      actual)
+        self.assertIn('django_request_latency_seconds_count{url_name="app:detail",method="GET"} 1', actual)
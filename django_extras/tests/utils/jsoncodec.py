@@ -0,0 +1,63 @@
+import datetime
+import decimal
+import json
+from django import test
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test.utils import override_settings
+from django_extras.utils import jsoncodec
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+SAMPLE = {
+    'name': 'Example',
+    'amount': decimal.Decimal('12.50'),
+    'created': datetime.datetime(2014, 3, 1, 12, 30, 15, 123456),
+    'date': datetime.date(2014, 3, 1),
+    'items': [1, 2.5, None, True],
+}
+
+
+class JsonCodecTestCase(test.TestCase):
+    def test_stdlib_matches_django_encoder(self):
+        target = jsoncodec.get_codec('json')
+
+        self.assertEqual(json.dumps(SAMPLE, cls=DjangoJSONEncoder), target.dumps(SAMPLE))
+        self.assertEqual(json.dumps(SAMPLE, cls=DjangoJSONEncoder).encode('utf8'), target.dumps_bytes(SAMPLE))
+
+    def test_codec_shared(self):
+        self.assertIs(jsoncodec.get_codec('json'), jsoncodec.get_codec('json'))
+
+    def test_default_codec(self):
+        self.assertEqual('json', jsoncodec.get_codec().name)
+
+    def test_loads(self):
+        self.assertEqual({'a': [1, 2]}, jsoncodec.loads('{"a": [1, 2]}'))
+
+    def test_validate(self):
+        jsoncodec.validate('{"a": [1, 2]}')
+        self.assertRaises(ValueError, jsoncodec.validate, '{"a": [1, 2}')
+
+    def test_unknown_codec(self):
+        self.assertRaises(ImproperlyConfigured, jsoncodec.get_codec, 'xml')
+
+    @override_settings(DJANGO_EXTRAS_JSON_CODEC='orjson')
+    def test_setting(self):
+        if orjson is None:
+            self.assertRaises(ImproperlyConfigured, jsoncodec.get_codec)
+        else:
+            self.assertEqual('orjson', jsoncodec.get_codec().name)
+
+    def test_orjson_compatible(self):
+        if orjson is None:
+            return
+        target = jsoncodec.get_codec('orjson')
+
+        self.assertEqual(json.loads(json.dumps(SAMPLE, cls=DjangoJSONEncoder)), json.loads(target.dumps(SAMPLE)))
+        self.assertEqual({'1': 'a'}, json.loads(target.dumps({1: 'a'})))
+        self.assertEqual({'a': [1, 2]}, target.loads('{"a": [1, 2]}'))
+        self.assertRaises(ValueError, target.validate, '{"a": [1, 2}')
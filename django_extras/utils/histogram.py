@@ -0,0 +1,223 @@
+# -*- coding: UTF-8 -*-
+"""
+Latency histograms with constant memory and bounded relative error.
+
+Values (in microseconds) are counted in log-linear buckets in the style of an
+HDR histogram, each power of two range is split into linear sub-buckets so
+percentiles are accurate to within ~3%.
+"""
+import threading
+import time
+import weakref
+
+__all__ = ('LatencyHistogram', 'LatencyRecorder', 'prometheus_text')
+
+# 2 ** SUB_BUCKET_BITS sub-buckets per power of two (relative error ~ 2 / 2 ** SUB_BUCKET_BITS).
+SUB_BUCKET_BITS = 6
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+HALF_SUB_BUCKETS = SUB_BUCKETS >> 1
+
+# Largest value that can be recorded (~19 hours in microseconds), larger values are clamped.
+MAX_VALUE = (1 << 36) - 1
+
+
+def bucket_index(value):
+    if value < SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return shift * HALF_SUB_BUCKETS + (value >> shift)
+
+
+def bucket_upper_bound(index):
+    """
+    Largest value counted in a bucket.
+    """
+    if index < SUB_BUCKETS:
+        return index
+    shift = (index - HALF_SUB_BUCKETS) // HALF_SUB_BUCKETS
+    top = index - shift * HALF_SUB_BUCKETS
+    return ((top + 1) << shift) - 1
+
+
+BUCKET_COUNT = bucket_index(MAX_VALUE) + 1
+
+
+class LatencyHistogram(object):
+    """
+    Histogram of latencies in microseconds.
+
+    Recording is not synchronised, each histogram should only be updated by a
+    single thread (see :class:`LatencyRecorder`).
+    """
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value):
+        value = min(max(int(value), 0), MAX_VALUE)
+        self.counts[bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """
+        Add the values of another histogram to this histogram.
+        """
+        counts = self.counts
+        for idx, count in enumerate(other.counts):
+            if count:
+                counts[idx] += count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, percent):
+        """
+        Value (in microseconds) that ``percent`` of recorded values are less
+        than or equal to, or 0 if no values have been recorded.
+        """
+        if not self.count:
+            return 0
+        target = max(1, int(round(self.count * percent / 100.0)))
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(bucket_upper_bound(idx), self.max)
+        return self.max
+
+    def summary(self):
+        """
+        Count, sum and p50, p95, p99 and maximum latencies (in seconds).
+        """
+        return {
+            'count': self.count,
+            'sum': self.total / 1000000.0,
+            'p50': self.percentile(50) / 1000000.0,
+            'p95': self.percentile(95) / 1000000.0,
+            'p99': self.percentile(99) / 1000000.0,
+            'max': self.max / 1000000.0,
+        }
+
+
+class LatencyRecorder(object):
+    """
+    Records latencies into a histogram for each key (eg URL name and method).
+
+    Each thread records into its own histograms so recording does not take a
+    lock. Histograms of threads that have finished are merged so memory use
+    is constant for each key and running thread.
+    """
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._retired = {}
+        self._export_lock = threading.Lock()
+        self._next_export = 0
+
+    def _histograms(self):
+        try:
+            return self._local.histograms
+        except AttributeError:
+            histograms = self._local.histograms = {}
+            with self._lock:
+                self._threads.append((weakref.ref(threading.current_thread()), histograms))
+            return histograms
+
+    def record(self, key, value):
+        """
+        Record a latency (in microseconds).
+        """
+        histograms = self._histograms()
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = LatencyHistogram()
+        histogram.record(value)
+
+    def snapshot(self):
+        """
+        Merged histograms of all threads.
+
+        :return: dict of key to :class:`LatencyHistogram`.
+        """
+        with self._lock:
+            running = []
+            for thread_ref, histograms in self._threads:
+                thread = thread_ref()
+                if thread is None or not thread.is_alive():
+                    self._merge(self._retired, histograms)
+                else:
+                    running.append((thread_ref, histograms))
+            self._threads = running
+            result = self._merge({}, self._retired)
+            for _, histograms in running:
+                self._merge(result, histograms)
+        return result
+
+    def _merge(self, target, histograms):
+        for key, histogram in list(histograms.items()):
+            if key not in target:
+                target[key] = LatencyHistogram()
+            target[key].merge(histogram)
+        return target
+
+    def summaries(self):
+        """
+        Summary (see :meth:`LatencyHistogram.summary`) of each key.
+        """
+        return dict((key, histogram.summary()) for key, histogram in self.snapshot().items())
+
+    def export(self, callback, interval=60):
+        """
+        Call ``callback`` with :meth:`summaries` if ``interval`` seconds have
+        passed since the last export, only one thread performs the export.
+
+        :return: True if the callback was called.
+        """
+        now = time.time()
+        if now < self._next_export or not self._export_lock.acquire(False):
+            return False
+        try:
+            if now < self._next_export:
+                return False
+            self._next_export = now + interval
+            callback(self.summaries())
+            return True
+        finally:
+            self._export_lock.release()
+
+    def reset(self):
+        with self._lock:
+            for _, histograms in self._threads:
+                histograms.clear()
+            self._retired = {}
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text(summaries, name='django_request_latency_seconds'):
+    """
+    Format latency summaries keyed by (url name, method) in the Prometheus
+    text exposition format.
+    """
+    lines = [
+        '# HELP %s Request latency by URL name and method.' % name,
+        '# TYPE %s summary' % name,
+    ]
+    for (url_name, method), summary in sorted(summaries.items(), key=lambda i: (str(i[0][0]), i[0][1])):
+        labels = 'url_name="%s",method="%s"' % (_label(url_name), _label(method))
+        for quantile, value in (('0.5', 'p50'), ('0.95', 'p95'), ('0.99', 'p99'), ('1', 'max')):
+            lines.append('%s{%s,quantile="%s"} %.6f' % (name, labels, quantile, summary[value]))
+        lines.append('%s_sum{%s} %.6f' % (name, labels, summary['sum']))
+        lines.append('%s_count{%s} %d' % (name, labels, summary['count']))
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,176 @@
+# -*- coding: UTF-8 -*-
+"""
+JSON encoding and decoding used by django_extras.
+
+The codec is selected with the ``DJANGO_EXTRAS_JSON_CODEC`` setting:
+
+* ``'json'`` - the standard library (the default).
+* ``'orjson'`` - orjson is used to encode and decode.
+* ``'ujson'`` - ujson is used to decode.
+* ``'simdjson'`` - pysimdjson is used to decode and validate.
+
+Values are always encoded with the semantics of :class:`DjangoJSONEncoder`
+(eg dates, times, decimals and UUIDs are encoded as strings).
+"""
+import threading
+try:
+    import json
+except ImportError:
+    from django.utils import simplejson as json
+import six
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+
+__all__ = ('JsonCodec', 'get_codec', 'dumps', 'dumps_bytes', 'loads', 'validate')
+
+CODEC_SETTING = 'DJANGO_EXTRAS_JSON_CODEC'
+DEFAULT_CODEC = 'json'
+
+
+class JsonCodec(object):
+    """
+    Standard library JSON codec, also the base for other codecs.
+
+    A single encoder instance is shared by all calls.
+    """
+    name = 'json'
+
+    def __init__(self):
+        self.encoder = DjangoJSONEncoder()
+
+    def dumps(self, value):
+        """
+        Encode a value into JSON text.
+        """
+        return self.encoder.encode(value)
+
+    def dumps_bytes(self, value):
+        """
+        Encode a value into UTF-8 encoded JSON.
+        """
+        return self.dumps(value).encode('utf8')
+
+    def loads(self, text):
+        """
+        Decode JSON text.
+
+        @raises ValueError if the text is not valid JSON.
+        """
+        if six.PY2:
+            return json.loads(text, encoding=settings.DEFAULT_CHARSET)
+        return json.loads(text)
+
+    def validate(self, text):
+        """
+        Check that text is valid JSON.
+
+        @raises ValueError if the text is not valid JSON.
+        """
+        self.loads(text)
+
+
+class OrjsonCodec(JsonCodec):
+    name = 'orjson'
+
+    def __init__(self):
+        super(OrjsonCodec, self).__init__()
+        import orjson
+        self._dumps = orjson.dumps
+        self.loads = orjson.loads
+        # Pass datetimes to the Django encoder so the output format matches the standard codec.
+        self._options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        self._default = self.encoder.default
+
+    def dumps_bytes(self, value):
+        return self._dumps(value, default=self._default, option=self._options)
+
+    def dumps(self, value):
+        return self.dumps_bytes(value).decode('utf8')
+
+
+class UjsonCodec(JsonCodec):
+    name = 'ujson'
+
+    def __init__(self):
+        super(UjsonCodec, self).__init__()
+        import ujson
+        # ujson encodes decimals as floats, so only decoding is replaced.
+        self.loads = ujson.loads
+
+
+class SimdjsonCodec(JsonCodec):
+    name = 'simdjson'
+
+    def __init__(self):
+        super(SimdjsonCodec, self).__init__()
+        import simdjson
+        self._simdjson = simdjson
+        self._local = threading.local()
+
+    def _parser(self):
+        # Parsers are not thread safe and are reused between calls.
+        try:
+            return self._local.parser
+        except AttributeError:
+            parser = self._local.parser = self._simdjson.Parser()
+            return parser
+
+    def loads(self, text):
+        return self._simdjson.loads(text)
+
+    def validate(self, text):
+        # Parsing builds a lazy document so no Python objects are created.
+        self._parser().parse(text.encode('utf8') if isinstance(text, six.text_type) else text)
+
+
+CODECS = {
+    'json': JsonCodec,
+    'orjson': OrjsonCodec,
+    'ujson': UjsonCodec,
+    'simdjson': SimdjsonCodec,
+}
+
+_codecs = {}
+
+
+def get_codec(name=None):
+    """
+    Get a (shared) codec instance, by default the codec defined by the
+    ``DJANGO_EXTRAS_JSON_CODEC`` setting.
+
+    @raises ImproperlyConfigured if the codec is unknown or not installed.
+    """
+    if name is None:
+        name = getattr(settings, CODEC_SETTING, DEFAULT_CODEC)
+    try:
+        return _codecs[name]
+    except KeyError:
+        pass
+    try:
+        codec_class = CODECS[name]
+    except KeyError:
+        raise ImproperlyConfigured('Unknown JSON codec %r, expected one of: %s.' % (
+            name, ', '.join(sorted(CODECS))))
+    try:
+        codec = codec_class()
+    except ImportError as ex:
+        raise ImproperlyConfigured('JSON codec %r is not available: %s' % (name, ex))
+    _codecs[name] = codec
+    return codec
+
+
+def dumps(value):
+    return get_codec().dumps(value)
+
+
+def dumps_bytes(value):
+    return get_codec().dumps_bytes(value)
+
+
+def loads(text):
+    return get_codec().loads(text)
+
+
+def validate(text):
+    get_codec().validate(text)